@@ -0,0 +1,83 @@
+"""
+Compares the JSON codecs of zerto_codec on real-shaped payloads: examples/vpgObject.json scaled to thousands of VMs
+(a vpgSettings body), and a list of such settings as returned by vpgSettings.getSettingsForVpgs. Also times
+response.json() through a zertoSession against a local stub ZVM with and without a codec.
+
+Usage:
+    python benchmarks/bench_codec.py [--vms N] [--vpgs N] [--rounds N]
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(here, '..'))
+
+from stub_zvm import stubZvm
+from zertoapl.zerto_codec import orjson, orjsonCodec, stdlibCodec
+from zertoapl.zerto_session import zertoSession
+from zertoapl.vpg import vpgSettings
+
+
+def vpgSettingsBody(vms):
+    with open(os.path.join(here, '..', 'examples', 'vpgObject.json')) as fh:
+        template = json.load(fh)
+    vm = template['Vms'][0]
+    body = copy.deepcopy(template)
+    body['Vms'] = []
+    for n in range(vms):
+        entry = copy.deepcopy(vm)
+        entry['VmIdentifier'] = f'vm-{n:06d}'
+        body['Vms'].append(entry)
+    return body
+
+
+def best(function, rounds):
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--vms', type=int, default=5000)
+    parser.add_argument('--vpgs', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    single = vpgSettingsBody(args.vms)
+    many = [vpgSettingsBody(args.vms // args.vpgs or 1) for _ in range(args.vpgs)]
+    codecs = [stdlibCodec()] + ([orjsonCodec()] if orjson is not None else [])
+    if orjson is None:
+        print("orjson is not installed (pip install zertoapl[fast]); only the standard library is measured")
+
+    for label, payload in ((f"vpgSettings with {args.vms} VMs", single),
+                           (f"getSettingsForVpgs, {args.vpgs} VPGs", many)):
+        encoded = json.dumps(payload).encode()
+        print(f"{label} ({len(encoded) / 2 ** 20:.1f} MiB)")
+        for codec in codecs:
+            dumps = best(lambda: codec.encode(payload), args.rounds)
+            loads = best(lambda: codec.loads(encoded), args.rounds)
+            print(f"  {codec.name:8} encode {dumps * 1000:8.1f} ms   decode {loads * 1000:8.1f} ms")
+
+    headers = {'Accept': 'application/json', 'Content-Type': 'application/json',
+               'x-zerto-session': 'stub-session-token'}
+    with stubZvm({'/v1/vpgSettings': json.dumps(many).encode()}) as stub:
+        print("response.json() of getSettingsForVpgs through zertoSession")
+        for codec in [None] + codecs:
+            s = vpgSettings('127.0.0.1', headers, httpsession=zertoSession(codec=codec, coalesce=False))
+            s.zvmip = stub.url + '/v1'
+            response = s.getSettingsForVpgs()
+            decode = best(lambda: response.json(), args.rounds)
+            print(f"  {codec.name if codec else 'requests':8} decode {decode * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Measures the startup cost of importing zertoapl entry points, as reported by python -X importtime. Every import runs in
+a fresh interpreter so nothing is already cached in sys.modules; the median cumulative time of the entry point's own
+import is reported, together with whether requests and vpg.py were loaded along the way.
+
+Usage:
+    python benchmarks/bench_import.py [--rounds N]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+ENTRY_POINTS = ['zertoapl', 'zertoapl.zerto_alerts', 'zertoapl.zerto_events', 'zertoapl.zvm', 'zertoapl.vpg',
+                'zertoapl.zertoapl']
+
+_line = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def importOnce(module):
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"], cwd=root,
+                            capture_output=True, text=True, check=True)
+    cumulative, loaded = None, set()
+    for line in result.stderr.splitlines():
+        match = _line.match(line)
+        if match is None:
+            continue
+        loaded.add(match.group(4))
+        if match.group(4) == module:
+            cumulative = int(match.group(2))
+    return cumulative, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=15)
+    args = parser.parse_args()
+
+    print(f"{'entry point':<24} {'median':>10}  requests  vpg.py")
+    for module in ENTRY_POINTS:
+        timings = []
+        for _ in range(args.rounds):
+            cumulative, loaded = importOnce(module)
+            timings.append(cumulative)
+        print(f"{module:<24} {statistics.median(timings) / 1000:8.2f}ms  "
+              f"{'yes' if 'requests' in loaded else 'no':>8}  {'yes' if 'zertoapl.vpg' in loaded else 'no':>6}")
+
+
+if __name__ == '__main__':
+    main()
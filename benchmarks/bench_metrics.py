@@ -0,0 +1,84 @@
+"""
+Compares the memory retained by per-VPG metric samples kept as lists of dicts and in zerto_metrics.rpoCollector ring
+buffers, and times the window aggregation. The figures are extrapolated to 1,000 VPGs sampled every minute for 30 days.
+
+Usage:
+    python benchmarks/bench_metrics.py [--vpgs N] [--samples N]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_models import vpg
+from zertoapl import zerto_metrics
+from zertoapl.zerto_metrics import METRICS, metricValue, rpoCollector
+
+MONTH = 30 * 24 * 60
+
+
+def retained(load):
+    gc.collect()
+    tracemalloc.start()
+    kept = load()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return kept, current
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--vpgs', type=int, default=100)
+    parser.add_argument('--samples', type=int, default=1440)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    snapshots = []
+    for _ in range(args.samples):
+        snapshot = [vpg(n) for n in range(args.vpgs)]
+        for item in snapshot:
+            item['ActualRPO'] = rng.randint(3, 30)
+            item['ThroughputInMB'] = rng.random() * 10
+            item['IOPs'] = rng.randint(0, 500)
+        snapshots.append(snapshot)
+    start = 1614556800.0
+
+    def dicts():
+        series = {}
+        for minute, snapshot in enumerate(snapshots):
+            for item in snapshot:
+                sample = {metric: metricValue(item, metric) for metric in METRICS}
+                sample['time'] = start + 60 * minute
+                series.setdefault(item['VpgIdentifier'], []).append(sample)
+        return series
+
+    def rings():
+        collector = rpoCollector(None, capacity=args.samples)
+        for minute, snapshot in enumerate(snapshots):
+            collector.record(snapshot, when=start + 60 * minute)
+        return collector
+
+    _, before = retained(dicts)
+    collector, after = retained(rings)
+    scale = 1000 * MONTH / (args.vpgs * args.samples)
+
+    began = time.perf_counter()
+    summary = collector.summary('ActualRPO', window=6 * 3600)
+    elapsed = time.perf_counter() - began
+
+    print(f"{args.vpgs} VPGs x {args.samples} samples of {len(METRICS)} metrics")
+    for label, size in (('lists of dicts:', before), ('rpoCollector:', after)):
+        print(f"{label:18} retained {size / 2 ** 20:8.1f} MiB   1,000 VPGs x 30 days ~ {size * scale / 2 ** 30:6.2f} GiB")
+    print(f"6 h summary of ActualRPO for {len(summary)} VPGs: {elapsed * 1000:.1f} ms "
+          f"({'numpy' if zerto_metrics.numpy is not None else 'stdlib'})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Compares the memory retained by a snapshot of VPGs and volumes held as the dicts returned by Response.json() and as
+zerto_models records built from the streamed responses, against a local stub ZVM.
+
+Usage:
+    python benchmarks/bench_models.py [--vpgs N] [--volumes N]
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from stub_zvm import stubZvm
+from zertoapl.zerto_models import volumeRecord, vpgRecord
+from zertoapl.zerto_session import zertoSession
+from zertoapl.vpg import vpgs
+from zertoapl.zvm import zvm
+from bench_stream import volume
+
+
+def vpg(n):
+    site = {'href': 'https://127.0.0.1:9669/v1/localsite', 'identifier': 'site-1', 'rel': None, 'type': 'SiteApi'}
+    return {'VpgName': f'VPG {n}', 'VpgIdentifier': f'vpg-{n:06d}', 'Status': 1, 'SubStatus': 0, 'Priority': 1,
+            'ActualRPO': 7, 'ConfiguredRpoSeconds': 300, 'VmsCount': 8, 'ProgressPercentage': 0, 'IOPs': 12,
+            'ThroughputInMB': 0.4, 'UsedStorageInMB': 40960, 'ProvisionedStorageInMB': 81920,
+            'OrganizationName': None, 'ServiceProfileName': None, 'ServiceProfileIdentifier': None,
+            'ZorgIdentifier': None, 'LastTest': None, 'BackupEnabled': False,
+            'Entities': {'Protected': 0, 'Recovery': 0, 'Source': 0, 'Target': 0},
+            'HistoryStatusApi': {'ActualHistoryInMinutes': 60, 'ConfiguredHistoryInMinutes': 60,
+                                 'EarliestCheckpoint': {'CheckpointIdentifier': f'{n}-1', 'Tag': None,
+                                                        'TimeStamp': '2021-03-01T10:00:00Z'}},
+            'ProtectedSite': dict(site), 'RecoverySite': dict(site, identifier='site-2'),
+            'SourceSite': dict(site), 'TargetSite': dict(site, identifier='site-2'),
+            'Link': dict(site, href=f'https://127.0.0.1:9669/v1/vpgs/vpg-{n:06d}', type='VpgApi')}
+
+
+def retained(load):
+    gc.collect()
+    tracemalloc.start()
+    snapshot = load()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del snapshot
+    return current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--vpgs', type=int, default=2500)
+    parser.add_argument('--volumes', type=int, default=20000)
+    args = parser.parse_args()
+
+    payloads = {'/v1/vpgs': json.dumps([vpg(n) for n in range(args.vpgs)]).encode(),
+                '/v1/volumes': json.dumps([volume(n) for n in range(args.volumes)]).encode()}
+    headers = {'Accept': 'application/json', 'Content-Type': 'application/json',
+               'x-zerto-session': 'stub-session-token'}
+    with stubZvm(payloads) as stub:
+        httpsession = zertoSession(coalesce=False)
+        z = zvm('127.0.0.1', headers, httpsession=httpsession)
+        v = vpgs('127.0.0.1', headers, httpsession=httpsession)
+        z.zvmurl = stub.url + '/v1'
+        v.zvmip = stub.url + '/v1'
+
+        def dicts():
+            return v.getInfoAllVpgs().json(), z.getAllVolumes().json()
+
+        def records():
+            return (vpgRecord.fromList(v.getInfoAllVpgs()),
+                    volumeRecord.fromList(z.getAllVolumes(stream=True)))
+
+        before = retained(dicts)
+        after = retained(records)
+
+    print(f"{args.vpgs} VPGs and {args.volumes} volumes")
+    print(f"dicts (Response.json()): retained {before[0] / 2 ** 20:7.1f} MiB   peak {before[1] / 2 ** 20:7.1f} MiB")
+    print(f"zerto_models records:    retained {after[0] / 2 ** 20:7.1f} MiB   peak {after[1] / 2 ** 20:7.1f} MiB")
+    print(f"retained memory saved:   {1 - after[0] / before[0]:7.1%}")
+
+
+if __name__ == '__main__':
+    main()
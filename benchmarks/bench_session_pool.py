@@ -0,0 +1,74 @@
+"""
+Compares requests per second against a local stub ZVM with and without the shared, pooled zertoSession.
+
+The "before" run passes the requests module itself as the HTTP session, which reproduces the old behaviour of calling
+requests.get per method (a new connection for every call). The "after" run shares one zertoSession between the zvm,
+vpgs, vpgSettings and vra classes.
+
+Usage:
+    python benchmarks/bench_session_pool.py [--calls N] [--threads N] [--certfile server.pem]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import urllib3
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from stub_zvm import stubZvm
+from zertoapl.zerto_session import zertoSession
+from zertoapl.zvm import zvm
+from zertoapl.vpg import vpgs, vpgSettings
+from zertoapl.vra import vra
+
+
+def buildClients(baseurl, httpsession):
+    headers = {'Accept': 'application/json', 'Content-Type': 'application/json',
+               'x-zerto-session': 'stub-session-token'}
+    z = zvm('127.0.0.1', headers, httpsession=httpsession)
+    v = vpgs('127.0.0.1', headers, httpsession=httpsession)
+    s = vpgSettings('127.0.0.1', headers, httpsession=httpsession)
+    r = vra('127.0.0.1', headers, httpsession=httpsession)
+    z.zvmurl = r.zvmurl = v.zvmip = s.zvmip = baseurl + '/v1'
+    return [z.getLocalSiteInfo, v.getInfoAllVpgs, s.getSettingsForVpgs, r.infoAllVRAs]
+
+
+def run(calls, threads, methods):
+    def one(i):
+        return methods[i % len(methods)]().status_code
+
+    start = time.perf_counter()
+    if threads > 1:
+        with ThreadPoolExecutor(threads) as pool:
+            list(pool.map(one, range(calls)))
+    else:
+        for i in range(calls):
+            one(i)
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--certfile', default=None)
+    args = parser.parse_args()
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    with stubZvm(certfile=args.certfile) as stub:
+        before = run(args.calls, args.threads, buildClients(stub.url, requests))
+        pooled = zertoSession(pool_size=max(args.threads, 10))
+        after = run(args.calls, args.threads, buildClients(stub.url, pooled))
+
+    print(f"unpooled (requests.get per call): {before:10.1f} req/s")
+    print(f"pooled zertoSession:              {after:10.1f} req/s")
+    print(f"speedup:                          {after / before:10.2f}x")
+
+
+if __name__ == '__main__':
+    main()
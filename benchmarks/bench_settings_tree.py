@@ -0,0 +1,72 @@
+"""
+Compares fetching the full settings tree of many VPGs one call after another (every section getter, then NICs and
+volumes per VM) with vpgSettings.getSettingsTrees against a local stub ZVM that adds a fixed latency to every GET.
+
+Usage:
+    python benchmarks/bench_settings_tree.py [--vpgs N] [--vms N] [--delay SECONDS] [--concurrency N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from stub_zvm import stubZvm
+from zertoapl.zerto_session import zertoSession
+from zertoapl.vpg import vpgSettings
+
+
+def sequential(settings, vpgids):
+    trees = {}
+    for vpgid in vpgids:
+        tree = {'Basic': settings.getBasicVpgSettings(vpgid).json(),
+                'BootGroups': settings.getBootVpgSettings(vpgid).json(),
+                'Journal': settings.getJournalVpgSettings(vpgid).json(),
+                'LongTermRetention': settings.getLtrVpgSettings(vpgid).json(),
+                'Networks': settings.getNetworkVpgSettings(vpgid).json(),
+                'Recovery': settings.getVpgRecoverySettings(vpgid).json(),
+                'Scripting': settings.getVpgScriptSettings(vpgid).json(),
+                'Vms': settings.getAllVmSettingsForAVpg(vpgid).json()}
+        for vm in tree['Vms']:
+            vm['Nics'] = settings.getNICSettingsForSingleVmInVpg(vpgid, vm['VmIdentifier']).json()
+            vm['Volumes'] = settings.getVolumeSettingsForSingleVmInVpg(vpgid, vm['VmIdentifier']).json()
+        trees[vpgid] = tree
+    return trees
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--vpgs', type=int, default=20)
+    parser.add_argument('--vms', type=int, default=4)
+    parser.add_argument('--delay', type=float, default=0.02)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+
+    vpgids = [f'vpg-{n}' for n in range(args.vpgs)]
+    payloads = {f'/v1/vpgSettings/{vpgid}/vms': [{'VmIdentifier': f'{vpgid}-vm-{n}'} for n in range(args.vms)]
+                for vpgid in vpgids}
+    headers = {'Accept': 'application/json', 'Content-Type': 'application/json',
+               'x-zerto-session': 'stub-session-token'}
+    requests = args.vpgs * (8 + 2 * args.vms)
+
+    with stubZvm(payloads, delay=args.delay) as stub:
+        settings = vpgSettings('127.0.0.1', headers, httpsession=zertoSession(pool_size=args.concurrency))
+        settings.zvmip = stub.url + '/v1'
+        start = time.perf_counter()
+        before = sequential(settings, vpgids)
+        one = time.perf_counter() - start
+        start = time.perf_counter()
+        after = settings.getSettingsTrees(vpgids, max_concurrent=args.concurrency)
+        many = time.perf_counter() - start
+
+    assert before == after
+    print(f"{args.vpgs} VPGs x {args.vms} VMs, {requests} GETs, {args.delay * 1000:.0f} ms latency each")
+    print(f"one after another:  {one:8.2f} s")
+    print(f"getSettingsTrees:   {many:8.2f} s")
+    print(f"speedup:            {one / many:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Compares peak memory and time to the first element when reading a large list endpoint (zvm.getAllVolumes) with
+Response.json() and with stream=True against a local stub ZVM.
+
+Usage:
+    python benchmarks/bench_stream.py [--volumes N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from stub_zvm import stubZvm
+from zertoapl.zerto_session import zertoSession
+from zertoapl.zvm import zvm
+
+
+def volume(n):
+    return {'VolumeIdentifier': f'volume-{n:08d}', 'VolumeType': 'Journal', 'Path': {'Full': f'[ds{n % 40}] vm{n}/'},
+            'Size': {'ProvisionedInBytes': 10737418240, 'UsedInBytes': 5368709120 + n},
+            'Vpg': {'Identifier': f'vpg-{n % 500}', 'Name': f'VPG {n % 500}'},
+            'Vm': {'Identifier': f'vm-{n}', 'Name': f'vm{n}'}, 'Datastore': {'Identifier': f'ds-{n % 40}'}}
+
+
+def measure(read):
+    tracemalloc.start()
+    start = time.perf_counter()
+    first, count, used = read()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return first - start, elapsed, count, used, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--volumes', type=int, default=100000)
+    args = parser.parse_args()
+
+    body = json.dumps([volume(n) for n in range(args.volumes)]).encode()
+    headers = {'Accept': 'application/json', 'Content-Type': 'application/json',
+               'x-zerto-session': 'stub-session-token'}
+    with stubZvm({'/v1/volumes': body}) as stub:
+        z = zvm('127.0.0.1', headers, httpsession=zertoSession())
+        z.zvmurl = stub.url + '/v1'
+
+        def whole():
+            volumes = z.getAllVolumes().json()
+            first = time.perf_counter()
+            return first, len(volumes), sum(v['Size']['UsedInBytes'] for v in volumes)
+
+        def streamed():
+            first, count, used = None, 0, 0
+            for v in z.getAllVolumes(stream=True):
+                if first is None:
+                    first = time.perf_counter()
+                count += 1
+                used += v['Size']['UsedInBytes']
+            return first, count, used
+
+        results = [('Response.json()', measure(whole)), ('stream=True', measure(streamed))]
+
+    print(f"{len(body) / 2 ** 20:.1f} MiB body, {args.volumes} volumes")
+    for name, (first, elapsed, count, used, peak) in results:
+        print(f"{name:16} first element {first * 1000:8.1f} ms   total {elapsed:6.2f} s   "
+              f"peak {peak / 2 ** 20:8.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+The stub_zvm.py module runs a minimal local stand-in for the ZVM REST API so the benchmarks in this directory can be
+run without a Zerto installation. Every GET returns a canned JSON payload, every other verb returns a task identifier,
+and /v1/session/add hands out an x-zerto-session token. The tests in tests/ also use it to script error responses and
+to inspect the requests that were made.
+"""
+
+import json
+import ssl
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class inFlightGauge:
+    """
+    Counts the requests the stub is answering and the most it answered at once.
+    """
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class stubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    payloads = {}
+    statuses = {}
+    log = []
+    gauge = inFlightGauge()
+    delay = 0.0
+
+    def _reply(self, status, body, headers=None):
+        data = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _drain(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _scripted(self, body=b''):
+        """
+        Logs the request and answers it with the next status code scripted for its path, if any. Returns True when the
+        request has been answered.
+        """
+
+        self.log.append((self.command, self.path, self.headers.get('x-zerto-session'), body))
+        queue = self.statuses.get(self.path.split('?')[0])
+        if not queue:
+            return False
+        status = queue.pop(0)
+        self._reply(status, {"Message": f"stub {status}"}, {'Retry-After': '0'} if status in (429, 503) else None)
+        return True
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        with self.gauge.measure():
+            if self._scripted():
+                return
+            if self.delay:
+                time.sleep(self.delay)
+            self._reply(200, self.payloads.get(path, [{"Identifier": "stub"}]))
+
+    def do_POST(self):
+        body = self._drain()
+        with self.gauge.measure():
+            if self._scripted(body):
+                return
+            if self.path.startswith('/v1/session/add'):
+                self._reply(200, {}, {'x-zerto-session': 'stub-session-token'})
+            else:
+                self._reply(200, "stub-task-identifier")
+
+    do_PUT = do_POST
+    do_DELETE = do_POST
+
+    def log_message(self, format, *args):
+        pass
+
+
+class stubZvm:
+    """
+    Runs stubHandler on a background thread.
+
+    Parameters
+    ----------
+    payloads : dict, optional
+        Maps request paths (for example '/v1/vpgs') to the JSON-serializable object returned for them, or to bytes
+        sent as they are. Kept as the payloads attribute, which can be changed while the stub runs.
+    delay : float, optional
+        Seconds every GET waits before answering, to simulate the latency of a real ZVM (default: 0).
+    statuses : dict, optional
+        Maps request paths to lists of status codes. Requests to the path are answered with these, one per request,
+        before it is answered normally. Kept as the statuses attribute.
+    certfile : str, optional
+        PEM file containing a certificate and key. When given, the stub serves HTTPS so TLS handshake cost is
+        included in the measurements.
+
+    Every request is appended to the log attribute as (method, path with query string, x-zerto-session, body), and the
+    gauge attribute (an inFlightGauge) counts the requests being answered.
+    """
+
+    def __init__(self, payloads=None, certfile=None, delay=0.0, statuses=None):
+        self.payloads = payloads if payloads is not None else {}
+        self.statuses = statuses if statuses is not None else {}
+        self.log = []
+        self.gauge = inFlightGauge()
+        handler = type('handler', (stubHandler,), {'payloads': self.payloads, 'statuses': self.statuses,
+                                                    'log': self.log, 'gauge': self.gauge, 'delay': delay})
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.server.daemon_threads = True
+        scheme = 'http'
+        if certfile:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile)
+            self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+            scheme = 'https'
+        self.url = scheme + '://127.0.0.1:' + str(self.server.server_address[1])
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
@@ -2,7 +2,7 @@ import json
 import vmware.vapi.vsphere.client
 import requests
 import urllib3
-import zerto_auth, zvm, vpg, vra
+from zertoapl import zerto_auth, zvm, vpg, vra
 import time
 from secrets import zvm_ip, zvm_u, zvm_p, zca_u, zerto_license, zerto_tag
 
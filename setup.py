@@ -26,6 +26,11 @@ setup(
     install_requires=[
       'requests>=2.25.0'
     ],
+    extras_require={
+      'async': ['aiohttp>=3.7'],
+      'fast': ['orjson>=3'],
+      'metrics': ['numpy>=1.17']
+    },
     classifiers=[
       "Programming Language :: Python :: 3",
       "License :: OSI Approved :: Apache Software License",
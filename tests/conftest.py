@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+from stub_zvm import stubZvm  # noqa: E402
+
+
+@pytest.fixture
+def stub():
+    """
+    A stub ZVM whose GET payloads (stub.payloads) and scripted status codes (stub.statuses) can be changed while it
+    runs, and which logs every request in stub.log.
+    """
+
+    with stubZvm() as server:
+        yield server
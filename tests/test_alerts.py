@@ -0,0 +1,90 @@
+import requests
+
+from zertoapl.zerto_alerts import alertWatcher
+from zertoapl.zerto_session import zertoSession
+from zertoapl.zvm import zvm
+
+HEADERS = {'Accept': 'application/json', 'Content-Type': 'application/json', 'x-zerto-session': 'token'}
+
+
+class flakyZvm(zvm):
+    """
+    A zvm whose connection drops when an alert in unreachable is dismissed or undismissed.
+    """
+
+    unreachable = ()
+
+    def _reach(self, alertid):
+        if alertid in self.unreachable:
+            raise requests.ConnectionError('connection reset')
+
+    def dismissAlert(self, alertid):
+        self._reach(alertid)
+        return super().dismissAlert(alertid)
+
+    def undismissAlert(self, alertid):
+        self._reach(alertid)
+        return super().undismissAlert(alertid)
+
+
+def client(stub, unreachable=()):
+    z = flakyZvm('127.0.0.1', HEADERS, httpsession=zertoSession())
+    z.zvmurl = stub.url + '/v1'
+    z.unreachable = unreachable
+    return z
+
+
+def alert(alertid, level='Warning', dismissed=False, link=False):
+    alert = {'Level': level, 'IsDismissed': dismissed, 'HelpIdentifier': 'VPG0009'}
+    if link:
+        alert['Link'] = {'identifier': alertid}
+    else:
+        alert['AlertIdentifier'] = alertid
+    return alert
+
+
+def posts(stub):
+    return sorted(path for method, path, token, body in stub.log if method == 'POST')
+
+
+def test_poll_reports_raised_changed_and_cleared(stub):
+    stub.payloads['/v1/alerts'] = [alert('a1'), alert('a2', link=True)]
+    watcher = alertWatcher(client(stub))
+    assert [(change.kind, change.alertid) for change in watcher.poll()] == [('raised', 'a1'), ('raised', 'a2')]
+    assert watcher.poll() == []
+    stub.payloads['/v1/alerts'] = [alert('a3'), alert('a2', dismissed=True, link=True)]
+    changes = watcher.poll()
+    assert [(change.kind, change.alertid) for change in changes] == [('raised', 'a3'), ('changed', 'a2'),
+                                                                     ('cleared', 'a1')]
+    assert changes[1].previous['IsDismissed'] is False and changes[1].alert['IsDismissed'] is True
+    assert changes[2].alert == alert('a1')
+
+
+def test_first_poll_can_skip_existing_alerts(stub):
+    stub.payloads['/v1/alerts'] = [alert('a1')]
+    watcher = alertWatcher(client(stub), report_existing=False)
+    assert watcher.poll() == []
+    stub.payloads['/v1/alerts'] = []
+    assert [change.kind for change in watcher.poll()] == ['cleared']
+
+
+def test_bulk_dismiss_skips_alerts_already_dismissed(stub):
+    stub.payloads['/v1/alerts'] = [alert('a1'), alert('a2', dismissed=True), alert('a3', level='Error')]
+    watcher = alertWatcher(client(stub))
+    results = watcher.dismiss(Level='Warning')
+    assert list(results) == ['a1'] and results['a1'].ok
+    results = watcher.undismiss()
+    assert list(results) == ['a2'] and results['a2'].ok
+    assert posts(stub) == ['/v1/alerts/a1/dismiss', '/v1/alerts/a2/undismiss']
+
+
+def test_bulk_dismiss_reports_errors_per_alert(stub):
+    stub.payloads['/v1/alerts'] = [alert(f'a{n}') for n in range(1, 6)]
+    stub.statuses['/v1/alerts/a2/dismiss'] = [500]
+    watcher = alertWatcher(client(stub, unreachable=['a4']), report_existing=False)
+    results = watcher.dismiss(where=lambda item: item['AlertIdentifier'] != 'a5', max_workers=3)
+    assert sorted(results) == ['a1', 'a2', 'a3', 'a4']
+    assert results['a1'].ok and results['a3'].ok
+    assert results['a2'].status_code == 500
+    assert isinstance(results['a4'], requests.ConnectionError)
+    assert posts(stub) == ['/v1/alerts/a1/dismiss', '/v1/alerts/a2/dismiss', '/v1/alerts/a3/dismiss']
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from zertoapl.zerto_async import (asyncVpgSettings, asyncVpgs, asyncZertoSession, asyncZvm,  # noqa: E402
+                                  parsePayload, rejectStream)
+from zertoapl.zerto_retry import retryPolicy  # noqa: E402
+
+
+def test_stream_is_rejected_with_value_error():
+    rejectStream(False)
+    with pytest.raises(ValueError, match='stream=True'):
+        rejectStream(True)
+
+
+def test_parse_payload():
+    assert parsePayload(b'') is None
+    assert parsePayload(b'{"a": 1}') == {'a': 1}
+    assert parsePayload(b'not json') == 'not json'
+
+
+HEADERS = {'Accept': 'application/json', 'Content-Type': 'application/json', 'x-zerto-session': 'token'}
+
+
+def run(stub, scenario, **sessionkwargs):
+    """
+    Runs scenario(session, zvm, vpgs, settings) on a fresh event loop against the stub. The classes share one headers
+    dict, as they do when built from the result of login.
+    """
+
+    headers = dict(HEADERS)
+
+    async def main():
+        async with asyncZertoSession(pool_size=4, **sessionkwargs) as session:
+            z = asyncZvm('127.0.0.1', headers, session)
+            z.zvmurl = stub.url + '/v1'
+            vpgs = asyncVpgs('127.0.0.1', headers, session)
+            vpgs.zvmip = stub.url + '/v1'
+            settings = asyncVpgSettings('127.0.0.1', headers, session)
+            settings.zvmip = stub.url + '/v1'
+            return await scenario(session, z, vpgs, settings)
+
+    return asyncio.run(main())
+
+
+def test_round_trip_through_the_async_classes(stub):
+    stub.payloads['/v1/localsite'] = {'SiteIdentifier': 'site-1'}
+    stub.payloads['/v1/vpgs'] = [{'VpgIdentifier': 'vpg-1'}]
+    stub.payloads['/v1/vpgSettings/stub-task-identifier'] = {'Basic': {'RpoInSeconds': 300}}
+
+    async def scenario(session, z, vpgs, settings):
+        return await asyncio.gather(z.getLocalSiteGuid(), vpgs.getInfoAllVpgs(),
+                                    settings.editVpg('vpg-1', {'Basic': {'RpoInSeconds': 120}}))
+
+    assert run(stub, scenario) == ['site-1', [{'VpgIdentifier': 'vpg-1'}], 'stub-task-identifier']
+    assert [entry[:2] for entry in stub.log if entry[1].startswith('/v1/vpgSettings')] == [
+        ('POST', '/v1/vpgSettings'), ('GET', '/v1/vpgSettings/stub-task-identifier'),
+        ('PUT', '/v1/vpgSettings/stub-task-identifier/basic'), ('POST', '/v1/vpgSettings/stub-task-identifier/commit')]
+
+
+def test_transient_status_is_retried(stub):
+    retry = retryPolicy(backoff_base=0.01)
+    stub.statuses['/v1/localsite'] = [503, 503]
+    stub.payloads['/v1/localsite'] = {'SiteIdentifier': 'site-1'}
+
+    async def scenario(session, z, vpgs, settings):
+        return await z.getLocalSiteGuid()
+
+    assert run(stub, scenario, retry=retry) == 'site-1'
+    assert len(stub.log) == 3 and retry.stats['retries'] == 2
+
+
+def test_expired_token_is_renewed(stub):
+    stub.statuses['/v1/vpgs'] = [401]
+    renewals = []
+
+    async def renewer(stale):
+        renewals.append(stale)
+        return {'x-zerto-session': 'fresh'}
+
+    async def scenario(session, z, vpgs, settings):
+        return await vpgs.getInfoAllVpgs()
+
+    assert run(stub, scenario, renewer=renewer) == [{'Identifier': 'stub'}]
+    assert renewals == ['token']
+    assert [entry[2] for entry in stub.log] == ['token', 'fresh']
+
+
+def test_error_status_raises(stub):
+    stub.statuses['/v1/vpgs'] = [500]
+
+    async def scenario(session, z, vpgs, settings):
+        return await vpgs.getInfoAllVpgs()
+
+    with pytest.raises(Exception, match='HTTP: 500'):
+        run(stub, scenario)
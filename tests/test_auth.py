@@ -0,0 +1,68 @@
+import requests
+
+from zertoapl import zerto_auth
+
+
+class loginSession:
+    """
+    Accepts logins with the password 'right' and hands out a new token for each of them.
+    """
+
+    def __init__(self):
+        self.logins = 0
+
+    def post(self, url, auth=None, **kwargs):
+        response = requests.Response()
+        if auth.password == 'right':
+            self.logins += 1
+            response.status_code = 200
+            response.headers['x-zerto-session'] = f'token-{self.logins}'
+        else:
+            response.status_code = 401
+            response.reason = 'Unauthorized'
+            response._content = b''
+        return response
+
+
+def test_stored_token_is_reused():
+    store = zerto_auth.memoryTokenStore()
+    session = loginSession()
+    first = zerto_auth.login('10.0.0.1', 'admin', 'right', httpsession=session, tokenstore=store)
+    second = zerto_auth.login('10.0.0.1', 'admin', 'right', httpsession=session, tokenstore=store)
+    assert first['x-zerto-session'] == second['x-zerto-session'] == 'token-1'
+    assert session.logins == 1
+
+
+def test_wrong_password_does_not_reuse_token(tmp_path):
+    for store in (zerto_auth.memoryTokenStore(), zerto_auth.fileTokenStore(str(tmp_path / 'tokens.json'))):
+        session = loginSession()
+        zerto_auth.login('10.0.0.1', 'admin', 'right', httpsession=session, tokenstore=store)
+        try:
+            zerto_auth.login('10.0.0.1', 'admin', 'wrong', httpsession=session, tokenstore=store)
+        except Exception as error:
+            assert 'HTTP: 401' in str(error)
+        else:
+            raise AssertionError("login with a wrong password reused the stored token")
+
+
+def test_token_file_does_not_contain_password(tmp_path):
+    path = tmp_path / 'tokens.json'
+    zerto_auth.login('10.0.0.1', 'admin', 'right', httpsession=loginSession(),
+                     tokenstore=zerto_auth.fileTokenStore(str(path)))
+    assert 'right' not in path.read_text()
+
+
+def test_rejected_token_is_renewed():
+    store = zerto_auth.memoryTokenStore()
+    session = loginSession()
+    zerto_auth.login('10.0.0.1', 'admin', 'right', httpsession=session, tokenstore=store)
+    renewed = zerto_auth.login('10.0.0.1', 'admin', 'right', httpsession=session, tokenstore=store,
+                               rejected_token='token-1')
+    assert renewed['x-zerto-session'] == 'token-2'
+
+
+def test_token_key_keeps_no_password():
+    key = zerto_auth.tokenKey('10.0.0.1', 'admin', 'right')
+    assert key.startswith('admin@10.0.0.1#') and 'right' not in key
+    # a memoized tokenKey would hold every password it was given for the life of the process
+    assert not hasattr(zerto_auth.tokenKey, 'cache_info')
@@ -0,0 +1,47 @@
+from zertoapl.zerto_cache import responseCache
+from zertoapl.zerto_session import zertoSession
+from zertoapl.zvm import zvm
+
+HEADERS = {'Accept': 'application/json', 'Content-Type': 'application/json', 'x-zerto-session': 'token'}
+
+
+def client(stub, cache):
+    z = zvm('127.0.0.1', HEADERS, httpsession=zertoSession(cache=cache))
+    z.zvmurl = stub.url + '/v1'
+    return z
+
+
+def test_static_endpoint_is_cached(stub):
+    cache = responseCache()
+    z = client(stub, cache)
+    stub.payloads['/v1/license'] = {'LicenseKey': 'old'}
+    assert z.getLicense().json() == {'LicenseKey': 'old'}
+    stub.payloads['/v1/license'] = {'LicenseKey': 'new'}
+    assert z.getLicense().json() == {'LicenseKey': 'old'}
+    assert cache.stats['hits'] == 1
+
+
+def test_mutation_invalidates_endpoint(stub):
+    cache = responseCache()
+    z = client(stub, cache)
+    stub.payloads['/v1/license'] = {'LicenseKey': 'old'}
+    stub.payloads['/v1/localsite'] = {'SiteIdentifier': 'site-1'}
+    assert z.getLicense().json() == {'LicenseKey': 'old'}
+    z.getLocalSiteInfo()
+    stub.payloads['/v1/license'] = {'LicenseKey': 'new'}
+    assert z.addLicense('new').ok
+    assert z.getLicense().json() == {'LicenseKey': 'new'}
+    stub.payloads['/v1/license'] = {}
+    z.delLicense()
+    assert z.getLicense().json() == {}
+    z.getLocalSiteInfo()
+    assert cache.stats['hits'] == 1
+
+
+def test_params_in_any_form_requests_accepts(stub):
+    cache = responseCache(ttls={'/alerts/levels': 60})
+    session = zertoSession(cache=cache)
+    url = stub.url + '/v1/alerts/levels'
+    for params in ({'b': '2', 'a': '1'}, [('a', '1'), ('b', '2')], 'a=1&b=2', b'a=1&b=2', None):
+        assert session.get(url, params=params, headers=HEADERS).ok
+    assert cache.stats == {'hits': 3, 'misses': 2, 'evictions': 0}
@@ -0,0 +1,109 @@
+import json
+import threading
+import time
+
+import pytest
+import requests
+
+from zertoapl.zerto_checkpoints import checkpointIndex, checkpointTagger
+
+
+class flakyVpgs:
+    """
+    Fails the first checkpoint listing, then returns the given checkpoints.
+    """
+
+    def __init__(self, checkpoints):
+        self.checkpoints = checkpoints
+        self.calls = 0
+
+    def getCheckpointsForVpg(self, vpgid, stream=False, startdate=None, enddate=None):
+        self.calls += 1
+        if self.calls == 1:
+            raise Exception("HTTP: 503 - Service Unavailable, Message: ")
+        return iter(self.checkpoints)
+
+
+CHECKPOINTS = [{'CheckpointIdentifier': '1', 'TimeStamp': '2021-03-01T10:00:00Z', 'Tag': None},
+               {'CheckpointIdentifier': '2', 'TimeStamp': '2021-03-01T10:05:00Z', 'Tag': 'pre-patch'},
+               {'CheckpointIdentifier': '3', 'TimeStamp': '2021-03-01T10:10:00Z', 'Tag': None}]
+
+
+def test_failed_first_refresh_is_retried():
+    vpgs = flakyVpgs(CHECKPOINTS)
+    index = checkpointIndex(vpgs, 'vpg-1')
+    with pytest.raises(Exception):
+        index.atOrBefore('2021-03-01T10:07:00Z')
+    assert index.requests == 0
+    assert index.atOrBefore('2021-03-01T10:07:00Z')['CheckpointIdentifier'] == '2'
+    assert index.nearestTagged('2021-03-01T10:20:00Z', tag='pre-patch')['CheckpointIdentifier'] == '2'
+    assert index.requests == 1
+
+
+def jsonResponse(body, status=200, reason='OK'):
+    response = requests.Response()
+    response.status_code = status
+    response.reason = reason
+    response._content = json.dumps(body).encode()
+    return response
+
+
+class taggingVpgs:
+    """
+    Records when each call is made. The warm-up call of 'slow' takes 0.2 s and that of 'down' fails; the checkpoint
+    inserted in a VPG gets the time stamp given in stamps.
+    """
+
+    def __init__(self, stamps):
+        self.stamps = stamps
+        self.warmedUp = {}
+        self.inserts = []
+        self._lock = threading.Lock()
+
+    def getCheckpointStatsForVpg(self, vpgid):
+        if vpgid == 'slow':
+            time.sleep(0.2)
+        self.warmedUp[vpgid] = time.monotonic()
+        if vpgid == 'down':
+            return jsonResponse('unavailable', 503, 'Service Unavailable')
+        return jsonResponse({})
+
+    def insertTaggedCheckpoint(self, vpgid, body):
+        with self._lock:
+            self.inserts.append((vpgid, json.loads(body)['checkpointName'], time.monotonic()))
+        return jsonResponse(None)
+
+    def getCheckpointsForVpg(self, vpgid, stream=False, startdate=None, enddate=None):
+        assert startdate is not None
+        tagged = [{'CheckpointIdentifier': f'{vpgid}-{tag}', 'TimeStamp': self.stamps[vpgid], 'Tag': tag}
+                  for inserted, tag, when in self.inserts if inserted == vpgid]
+        untagged = {'CheckpointIdentifier': 'old', 'TimeStamp': '2021-03-01T09:00:00Z', 'Tag': None}
+        return jsonResponse([untagged] + tagged)
+
+
+def test_tags_are_sent_together_after_every_warm_up():
+    vpgs = taggingVpgs({'a': '2021-03-01T10:00:00.100Z', 'b': '2021-03-01T10:00:00.040Z',
+                        'slow': '2021-03-01T10:00:00.250Z'})
+    result = checkpointTagger(vpgs, timeout=5, interval=0.01).tag(['a', 'b', 'slow'], 'pre-patch')
+    assert result.ok
+    assert sorted((vpgid, tag) for vpgid, tag, when in vpgs.inserts) == [
+        ('a', 'pre-patch'), ('b', 'pre-patch'), ('slow', 'pre-patch')]
+    sent = [when for vpgid, tag, when in vpgs.inserts]
+    assert min(sent) >= max(vpgs.warmedUp.values())
+    assert result.sendSpread == pytest.approx(max(sent) - min(sent), abs=0.05)
+    assert result.spread == pytest.approx(0.21)
+    assert {row['vpgid']: row['offset'] for row in result.report()} == {'a': 60.0, 'b': 0.0, 'slow': 210.0}
+
+
+def test_failed_vpg_does_not_hold_up_the_others():
+    vpgs = taggingVpgs({'a': '2021-03-01T10:00:00Z', 'b': '2021-03-01T10:00:00.010Z'})
+    start = time.monotonic()
+    result = checkpointTagger(vpgs, timeout=5, interval=0.01).tag(['a', 'down', 'b'], 'pre-patch')
+    assert time.monotonic() - start < 2
+    assert not result.ok
+    assert sorted(vpgid for vpgid, tag, when in vpgs.inserts) == ['a', 'b']
+    rows = {row['vpgid']: row for row in result.report()}
+    assert rows['down']['error'] == 'HTTP: 503 - Service Unavailable, Message: "unavailable"'
+    assert (rows['down']['ok'], rows['down']['sent'], rows['down']['offset']) == (False, None, None)
+    assert rows['a']['ok'] and rows['b']['offset'] == 10.0
+    assert result.spread == pytest.approx(0.01)
@@ -0,0 +1,43 @@
+import pytest
+
+from zertoapl import zerto_auth
+from zertoapl.zerto_cache import responseCache
+from zertoapl.zerto_retry import retryPolicy
+from zertoapl.zertoapl import zertoapl
+
+
+@pytest.fixture
+def logins(monkeypatch):
+    """
+    Replaces the login made by the zertoapl client and records its keyword arguments.
+    """
+
+    calls = []
+
+    def login(zvm_ip, zvm_user, zvm_password, **kwargs):
+        calls.append(kwargs)
+        return {'x-zerto-session': 'token'}
+
+    monkeypatch.setattr(zerto_auth, 'login', login)
+    return calls
+
+
+def test_token_store_is_opt_in(logins):
+    client = zertoapl('10.0.10.50', 'admin', 'secret')
+    assert client.tokenstore is None and logins[-1]['tokenstore'] is None
+    client = zertoapl('10.0.10.50', 'admin', 'secret', tokenstore=zerto_auth.defaultTokenStore)
+    assert logins[-1]['tokenstore'] is zerto_auth.defaultTokenStore
+    assert client.renewSession('stale') == {'x-zerto-session': 'token'}
+    assert logins[-1]['rejected_token'] == 'stale'
+
+
+def test_retries_are_opt_in(logins):
+    assert zertoapl('10.0.10.50', 'admin', 'secret').httpsession.retry is None
+    retry = retryPolicy(max_retries=2)
+    assert zertoapl('10.0.10.50', 'admin', 'secret', retry=retry).httpsession.retry is retry
+
+
+def test_cache_is_opt_in(logins):
+    assert zertoapl('10.0.10.50', 'admin', 'secret').httpsession.cache is None
+    cache = responseCache()
+    assert zertoapl('10.0.10.50', 'admin', 'secret', cache=cache).httpsession.cache is cache
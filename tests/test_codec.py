@@ -0,0 +1,35 @@
+import pytest
+import requests
+
+from zertoapl import zerto_codec
+from zertoapl.zerto_codec import attachCodec, stdlibCodec
+
+# requests before 2.27 raised the decoder's own ValueError
+REQUESTS_JSON_ERROR = getattr(requests.exceptions, 'JSONDecodeError', ValueError)
+CODECS = [stdlibCodec()] + ([zerto_codec.orjsonCodec()] if zerto_codec.orjson is not None else [])
+
+
+def response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    return response
+
+
+@pytest.mark.parametrize('codec', CODECS, ids=lambda codec: codec.name)
+def test_codec_decodes_json(codec):
+    assert attachCodec(response(b'{"VpgName": "a", "Size": 1.5}'), codec).json() == {'VpgName': 'a', 'Size': 1.5}
+
+
+@pytest.mark.parametrize('codec', CODECS, ids=lambda codec: codec.name)
+@pytest.mark.parametrize('body', [b'', b'<html>Service Unavailable</html>', b'{"a": '])
+def test_invalid_body_raises_requests_error(codec, body):
+    with pytest.raises(REQUESTS_JSON_ERROR):
+        attachCodec(response(body), codec).json()
+
+
+@pytest.mark.parametrize('codec', CODECS, ids=lambda codec: codec.name)
+def test_encode_round_trip(codec):
+    body = {'Basic': {'Name': 'vpg', 'RpoInSeconds': 300}, 'Vms': [{'VmIdentifier': 'vm-1'}]}
+    assert codec.loads(codec.encode(body)) == body
+    assert codec.loads(codec.dumps(body)) == body
@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urlsplit
+
+from zertoapl.zerto_events import eventTail, eventTime
+from zertoapl.zerto_session import zertoSession
+from zertoapl.zvm import zvm
+
+HEADERS = {'Accept': 'application/json', 'Content-Type': 'application/json', 'x-zerto-session': 'token'}
+
+
+def client(stub):
+    z = zvm('127.0.0.1', HEADERS, httpsession=zertoSession())
+    z.zvmurl = stub.url + '/v1'
+    return z
+
+
+def event(eventid, occurred):
+    return {'EventIdentifier': eventid, 'OccurredOn': occurred}
+
+
+def queries(stub):
+    """
+    Returns the query parameters of every /v1/events request the stub received.
+    """
+
+    return [dict(parse_qsl(urlsplit(path).query)) for method, path, token, body in stub.log
+            if urlsplit(path).path == '/v1/events']
+
+
+def test_event_time_ignores_fraction_digits():
+    assert eventTime('2021-03-01T10:00:00.5') == eventTime('2021-03-01T10:00:00.500000Z')
+    assert eventTime('2021-03-01T12:00:00+02:00') == datetime(2021, 3, 1, 10, tzinfo=timezone.utc)
+
+
+def test_filtered_events_sends_given_filters(stub):
+    stub.payloads['/v1/events'] = [event('event-1', '2021-03-01T10:00:00')]
+    z = client(stub)
+    response = z.filteredEvents(startdate='2021-03-01T00:00:00.000', vpgidentifier='vpg-1', category='Events',
+                                alertidentifier='alert-1')
+    assert response.json() == [event('event-1', '2021-03-01T10:00:00')]
+    z.filteredEvents()
+    assert queries(stub) == [{'startDate': '2021-03-01T00:00:00.000', 'vpgIdentifier': 'vpg-1',
+                              'category': 'Events', 'alertIdentifier': 'alert-1'}, {}]
+
+
+def test_events_at_the_same_time_are_delivered_once(stub):
+    stub.payloads['/v1/events'] = [event('b', '2021-03-01T10:00:00.1'), event('a', '2021-03-01T09:00:00')]
+    tail = eventTail(client(stub), category='Events')
+    assert [item['EventIdentifier'] for item in tail.poll()] == ['a', 'b']
+    # the ZVM returns events at the cursor time again, along with a new one at that very time
+    stub.payloads['/v1/events'] = [event('b', '2021-03-01T10:00:00.100'), event('c', '2021-03-01T10:00:00.1')]
+    assert [item['EventIdentifier'] for item in tail.poll()] == ['c']
+    assert tail.poll() == []
+    assert tail.cursor == {'occurredOn': '2021-03-01T10:00:00.1', 'seen': ['b', 'c']}
+    assert queries(stub) == [{'category': 'Events'}] + [
+        {'category': 'Events', 'startDate': '2021-03-01T10:00:00.1'}] * 2
+
+
+def test_cursor_file_resumes_where_the_last_run_stopped(stub, tmp_path):
+    path = str(tmp_path / 'cursor.json')
+    stub.payloads['/v1/events'] = [event('a', '2021-03-01T09:00:00'), event('b', '2021-03-01T10:00:00')]
+    assert len(eventTail(client(stub), path=path).poll()) == 2
+    restarted = eventTail(client(stub), path=path)
+    assert restarted.cursor == {'occurredOn': '2021-03-01T10:00:00', 'seen': ['b']}
+    assert restarted.poll() == []
+    assert queries(stub)[-1] == {'startDate': '2021-03-01T10:00:00'}
+
+
+def test_startdate_filter_sets_the_first_poll(stub):
+    stub.payloads['/v1/events'] = []
+    tail = eventTail(client(stub), startdate='2021-03-01T00:00:00')
+    assert tail.poll() == []
+    assert queries(stub) == [{'startDate': '2021-03-01T00:00:00'}]
@@ -0,0 +1,131 @@
+import json
+from concurrent.futures import Future
+
+import pytest
+import requests
+
+from zertoapl.zerto_failover import failoverOrchestrator
+from zertoapl.zerto_failovertest import failoverTestRunner
+from zertoapl.zerto_tasks import taskError
+
+
+def jsonResponse(body, status=200, reason='OK'):
+    response = requests.Response()
+    response.status_code = status
+    response.reason = reason
+    response._content = json.dumps(body).encode()
+    return response
+
+
+class fakeVpgs:
+    """
+    Lists the VPGs with their priorities and starts a task for every failover, failover test and stop.
+    """
+
+    def __init__(self, priorities, rejected=()):
+        self.priorities = priorities
+        self.rejected = set(rejected)
+        self.calls = []
+
+    def getInfoAllVpgs(self):
+        return jsonResponse([{'VpgIdentifier': vpgid, 'VpgName': vpgid.upper(), 'Priority': priority}
+                             for vpgid, priority in self.priorities.items()])
+
+    def _start(self, action, vpgid, body):
+        self.calls.append((action, vpgid, json.loads(body)))
+        if vpgid in self.rejected:
+            return jsonResponse('busy', 409, 'Conflict')
+        return jsonResponse(f'{action}-{vpgid}')
+
+    def failoverVpg(self, vpgid, body):
+        return self._start('failover', vpgid, body)
+
+    def failoverTest(self, vpgid, body):
+        return self._start('test', vpgid, body)
+
+    def stopFailoverTest(self, vpgid, body):
+        return self._start('stop', vpgid, body)
+
+
+class fakeWaiter:
+    """
+    Completes every task at once, except those in failed.
+    """
+
+    def __init__(self, failed=()):
+        self.failed = set(failed)
+
+    def watch(self, taskid, callback=None, timeout=None):
+        future = Future()
+        if taskid in self.failed:
+            future.set_exception(taskError(taskid, {'Status': {'State': 5}}))
+        else:
+            future.set_result({'Status': {'State': 6}})
+        if callback is not None:
+            callback(future)
+        return future
+
+
+def test_waves_follow_priorities():
+    vpgs = fakeVpgs({'low': 0, 'high': 2, 'medium': 1, 'high2': 'High'})
+    orchestrator = failoverOrchestrator(vpgs, None, waiter=fakeWaiter())
+    assert orchestrator.plan() == [('High', ['high', 'high2']), ('Medium', ['medium']), ('Low', ['low'])]
+    run = orchestrator.failover(all_vpgs=True)
+    assert run.ok
+    assert [call[1] for call in vpgs.calls][-1] == 'low'
+    assert [(row['wave'], row['vpgid'], row['name'], row['ok']) for row in run.report()] == [
+        ('High', 'high', 'HIGH', True), ('High', 'high2', 'HIGH2', True), ('Medium', 'medium', 'MEDIUM', True),
+        ('Low', 'low', 'LOW', True)]
+
+
+def test_failover_needs_an_explicit_selection():
+    vpgs = fakeVpgs({'a': 2, 'b': 0})
+    orchestrator = failoverOrchestrator(vpgs, None, waiter=fakeWaiter())
+    with pytest.raises(ValueError, match='all_vpgs=True'):
+        orchestrator.failover()
+    assert vpgs.calls == []
+    assert [row['vpgid'] for row in orchestrator.failover(vpgids=['b']).report()] == ['b']
+    assert [row['vpgid'] for row in orchestrator.failover(waves=[['a']]).report()] == ['a']
+
+
+def test_failed_wave_stops_the_run():
+    vpgs = fakeVpgs({'a': 2, 'b': 2, 'c': 0}, rejected=['b'])
+    run = failoverOrchestrator(vpgs, None, waiter=fakeWaiter()).failover(all_vpgs=True)
+    assert not run.ok
+    assert run.waves[0].outcomes['b'].error == 'HTTP: 409 - Conflict, Message: "busy"'
+    assert run.skipped == [('Low', ['c'])]
+    assert run.report()[-1] == {'wave': 'Low', 'vpgid': 'c', 'name': None, 'ok': False, 'taskid': None,
+                                'elapsed': 0.0, 'error': 'not started'}
+
+
+def test_threshold_lets_next_wave_start():
+    vpgs = fakeVpgs({'a': 2, 'b': 2, 'c': 0})
+    run = failoverOrchestrator(vpgs, None, threshold=0.5, waiter=fakeWaiter(failed=['failover-b'])).failover(
+        vpgids=['a', 'b', 'c'])
+    assert [wave.passed for wave in run.waves] == [True, True]
+    assert run.waves[0].outcomes['b'].error == 'Task failover-b ended in state 5'
+    assert run.waves[0].outcomes['b'].task == {'Status': {'State': 5}}
+
+
+def test_failover_tests_are_always_stopped():
+    vpgs = fakeVpgs({'a': 2, 'b': 2})
+
+    def check(vpgid):
+        if vpgid == 'b':
+            raise RuntimeError('app down')
+        return True, 'app up'
+
+    run = failoverTestRunner(vpgs, None, slots=2, hold=0, check=check, waiter=fakeWaiter()).run(['a', 'b'])
+    assert [(row['vpgid'], row['ok'], row['stage'], row['error']) for row in run.report()] == [
+        ('a', True, 'done', None), ('b', False, 'done', 'Check failed: RuntimeError: app down')]
+    stops = {call[1]: call[2] for call in vpgs.calls if call[0] == 'stop'}
+    assert stops == {'a': {'FailoverTestSuccess': True, 'FailoverTestSummary': 'app up'},
+                     'b': {'FailoverTestSuccess': False, 'FailoverTestSummary': 'Check failed: RuntimeError: app down'}}
+
+
+def test_failed_failover_test_is_stopped_and_keeps_its_stage():
+    vpgs = fakeVpgs({'a': 2})
+    run = failoverTestRunner(vpgs, None, hold=0, waiter=fakeWaiter(failed=['test-a'])).run(['a'])
+    outcome = run.outcomes['a']
+    assert (outcome.ok, outcome.stage, outcome.error) == (False, 'ready', 'Task test-a ended in state 5')
+    assert [call[0] for call in vpgs.calls] == ['test', 'stop']
@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+
+from zertoapl import zerto_fleet
+from zertoapl.zerto_fleet import zertoFleet
+
+SITES = [{'name': name, 'zvm_ip': name, 'zvm_user': 'admin', 'zvm_password': 'secret'}
+         for name in ('good', 'slow', 'bad')]
+
+
+class fakeClient:
+    """
+    Stands in for a logged-in zertoapl client. The login of 'denied' fails, and answer() hangs for 'slow' until
+    released is set and fails for 'bad'.
+    """
+
+    released = None
+
+    def __init__(self, zvm_ip, zvm_user, zvm_password, **kwargs):
+        if zvm_ip == 'denied':
+            raise Exception("HTTP: 401 - Unauthorized, Message: denied")
+        self.zvm_ip = zvm_ip
+
+    def answer(self):
+        if self.zvm_ip == 'slow':
+            self.released.wait(10)
+        if self.zvm_ip == 'bad':
+            raise ValueError('no such VPG')
+        return self.zvm_ip
+
+
+@pytest.fixture
+def fleet(monkeypatch):
+    monkeypatch.setattr(zerto_fleet, 'zertoapl', fakeClient)
+    fakeClient.released = threading.Event()
+    with zertoFleet(SITES + [{'zvm_ip': 'denied', 'zvm_user': 'admin', 'zvm_password': 'wrong'}]) as fleet:
+        yield fleet
+    fakeClient.released.set()
+
+
+def test_logins_report_failed_sites(fleet):
+    assert sorted(fleet.clients) == ['bad', 'good', 'slow']
+    assert str(fleet.loginErrors['denied']).startswith('HTTP: 401')
+
+
+def test_results_and_errors_per_site_within_deadline(fleet):
+    start = time.monotonic()
+    result = fleet.map(lambda client: client.answer(), deadline=0.3)
+    assert time.monotonic() - start < 1.0
+    assert result.results == {'good': 'good'}
+    assert isinstance(result.errors['slow'], TimeoutError)
+    assert isinstance(result.errors['bad'], ValueError) and str(result.errors['bad']) == 'no such VPG'
+    assert not result.ok
+
+
+def test_straggler_does_not_delay_later_calls(fleet):
+    # more stragglers than the fleet has sites
+    for _ in range(5):
+        fleet.map(lambda client: client.answer(), deadline=0.05)
+    for _ in range(3):
+        result = fleet.map(lambda client: client.zvm_ip, deadline=0.5)
+        assert result.results == {'good': 'good', 'slow': 'slow', 'bad': 'bad'}
+        assert result.elapsed < 0.5
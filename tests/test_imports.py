@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def loadedAfter(statement):
+    """
+    Runs statement in a fresh interpreter and returns which of requests and asyncio it left in sys.modules.
+    """
+
+    script = statement + "\nimport sys\nprint(' '.join(m for m in ('requests', 'asyncio') if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+@pytest.mark.parametrize('statement', ['import zertoapl', 'import zertoapl.zvm', 'from zertoapl import zvm'])
+def test_import_does_not_load_requests_or_asyncio(statement):
+    assert loadedAfter(statement) == []
+
+
+def test_client_without_httpsession_loads_requests():
+    # guards the test above: the probe does see requests once something actually needs it
+    statement = "import zertoapl.zvm\nzertoapl.zvm.zvm('127.0.0.1', {})"
+    assert 'requests' in loadedAfter(statement)
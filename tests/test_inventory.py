@@ -0,0 +1,60 @@
+import pytest
+
+from zertoapl.zerto_inventory import inventoryIndex
+from zertoapl.zerto_session import zertoSession
+from zertoapl.zvm import zvm
+
+HEADERS = {'Accept': 'application/json', 'Content-Type': 'application/json', 'x-zerto-session': 'token'}
+
+
+@pytest.fixture
+def index(stub):
+    stub.payloads.update({
+        '/v1/localsite': {'SiteIdentifier': 'site-1'},
+        '/v1/datastores': [{'DatastoreName': 'gold', 'DatastoreIdentifier': 'ds-1'},
+                           {'DatastoreName': 'Silver', 'DatastoreIdentifier': 'ds-2'},
+                           {'DatastoreName': 'gold', 'DatastoreIdentifier': 'ds-3'}],
+        '/v1/virtualizationsites/site-1/hosts': [{'VirtualizationHostName': 'esx01.lab', 'HostIdentifier': 'host-1'},
+                                                 {'VirtualizationHostName': 'ESX02.lab', 'HostIdentifier': 'host-2'}],
+        '/v1/virtualizationsites/site-1/networks': [
+            {'VirtualizationNetworkName': 'VM Network', 'NetworkIdentifier': 'net-1'},
+            {'VirtualizationNetworkName': 'vm network', 'NetworkIdentifier': 'net-2'}],
+    })
+    z = zvm('127.0.0.1', HEADERS, httpsession=zertoSession())
+    z.zvmurl = stub.url + '/v1'
+    return inventoryIndex(z)
+
+
+def test_duplicates_are_reported(index):
+    assert index.duplicates('datastores') == {'gold': ['ds-1', 'ds-3']}
+    assert index.datastoreGuid('gold') == 'ds-1'
+    assert index.duplicates('networks') == {}
+    assert index.duplicates('networks', ignore_case=True) == {'vm network': ['net-1', 'net-2']}
+
+
+def test_case_insensitive_lookup(index):
+    assert index.hostGuid('esx02.lab') is None
+    assert index.hostGuid('esx02.lab', ignore_case=True) == 'host-2'
+    # an exact match wins over a case-insensitive one
+    assert index.networkGuid('vm network', ignore_case=True) == 'net-2'
+
+
+def test_resolve_fetches_each_collection_once(stub, index):
+    resolved = index.resolve(datastores=['Silver', 'bronze'], hosts=['esx01.lab', 'ESX01.LAB'],
+                             networks=['VM Network'], ignore_case=True)
+    assert resolved == {'datastores': {'Silver': 'ds-2', 'bronze': None},
+                        'hosts': {'esx01.lab': 'host-1', 'ESX01.LAB': 'host-1'},
+                        'networks': {'VM Network': 'net-1'}}
+    assert index.resolve(hosts=['esx03.lab']) == {'datastores': {}, 'hosts': {'esx03.lab': None}, 'networks': {}}
+    assert index.requests == 4
+    assert sorted(path for method, path, token, body in stub.log) == [
+        '/v1/datastores', '/v1/localsite', '/v1/virtualizationsites/site-1/hosts',
+        '/v1/virtualizationsites/site-1/networks']
+
+
+def test_refresh_fetches_again(stub, index):
+    assert index.datastoreGuid('Silver') == 'ds-2'
+    stub.payloads['/v1/datastores'] = [{'DatastoreName': 'Silver', 'DatastoreIdentifier': 'ds-9'}]
+    assert index.datastoreGuid('Silver') == 'ds-2'
+    index.refresh('datastores')
+    assert index.datastoreGuid('Silver') == 'ds-9'
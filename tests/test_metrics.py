@@ -0,0 +1,64 @@
+import threading
+
+import pytest
+
+from zertoapl.zerto_metrics import rpoCollector
+
+
+def vpg(vpgid, rpo, history=60):
+    return {'VpgIdentifier': vpgid, 'VpgName': vpgid.upper(), 'ActualRPO': rpo,
+            'HistoryStatusApi': {'ActualHistoryInMinutes': history}}
+
+
+def test_ring_keeps_the_newest_samples():
+    collector = rpoCollector(None, capacity=10)
+    for minute in range(25):
+        collector.record([vpg('a', minute)], when=60.0 * minute)
+    assert len(collector) == 10
+    assert list(collector.values('a', 'ActualRPO')) == list(range(15, 25))
+    assert list(collector.values('a', 'ActualRPO', window=180)) == [22, 23, 24]
+    assert list(collector.values('a', 'ActualRPO', window=180, end=60.0 * 20)) == [18, 19, 20]
+
+
+def test_stats_skip_missing_samples():
+    collector = rpoCollector(None, capacity=10)
+    for minute in range(10):
+        collector.record([vpg('a', minute)] if minute % 2 else [vpg('b', 1)], when=60.0 * minute)
+    stats = collector.stats('a', 'ActualRPO', percentiles=(50, 95))
+    assert stats == {'count': 5, 'min': 1.0, 'max': 9.0, 'mean': 5.0, 'p50': 5.0, 'p95': pytest.approx(8.6)}
+    assert collector.stats('a', 'ActualRPO', window=30)['p50'] == 9.0
+    assert collector.stats('a', 'HistoryStatusApi.ActualHistoryInMinutes')['max'] == 60.0
+
+
+def test_vpg_missing_for_a_whole_ring_is_dropped():
+    collector = rpoCollector(None, capacity=4)
+    collector.record([vpg('a', 1), vpg('b', 1)], when=0.0)
+    for minute in range(1, 6):
+        collector.record([vpg('a', 1)], when=60.0 * minute)
+    assert list(collector.summary('ActualRPO')) == ['a']
+    with pytest.raises(KeyError):
+        collector.stats('b', 'ActualRPO')
+
+
+def test_summary_while_vpgs_are_evicted():
+    collector = rpoCollector(None, capacity=2)
+    stop = threading.Event()
+    errors = []
+
+    def summarize():
+        while not stop.is_set():
+            try:
+                collector.summary('ActualRPO')
+            except Exception as error:
+                errors.append(error)
+                return
+
+    thread = threading.Thread(target=summarize)
+    thread.start()
+    try:
+        for minute in range(3000):
+            collector.record([vpg(f'vpg-{minute // 3 + n}', minute) for n in range(20)], when=60.0 * minute)
+    finally:
+        stop.set()
+        thread.join()
+    assert errors == []
@@ -0,0 +1,73 @@
+import pickle
+
+import pytest
+
+from zertoapl import zerto_models
+from zertoapl.zerto_models import taskRecord, volumeRecord, vpgRecord, zertoRecord
+from zertoapl.zerto_session import zertoSession
+from zertoapl.zvm import zvm
+
+VPG = {
+    'VpgName': 'app', 'VpgIdentifier': 'vpg-1', 'Priority': 1, 'ActualRPO': 7,
+    'Entities': {'Protected': 0, 'Recovery': 1, 'Source': 0, 'Target': 1},
+    'HistoryStatusApi': {'ActualHistoryInMinutes': 240, 'ConfiguredHistoryInMinutes': 1440,
+                         'EarliestCheckpoint': {'CheckpointIdentifier': 'cp-1', 'Tag': None,
+                                                'TimeStamp': '2021-03-01T10:00:00Z'}},
+    'ProtectedSite': {'href': 'https://zvm/v1/localsite', 'identifier': 'site-1', 'rel': None, 'type': 'LocalSite'},
+    'FailSafeHistory': {'ActualFailSafeHistory': 0, 'NewInThisVersion': True},
+    'NewTopLevelKey': [1, 2],
+}
+
+
+def recordClasses():
+    pending, found = [zertoRecord], []
+    while pending:
+        for subclass in pending.pop().__subclasses__():
+            if subclass.__module__ == zerto_models.__name__:
+                found.append(subclass)
+                pending.append(subclass)
+    return found
+
+
+@pytest.mark.parametrize('cls', recordClasses(), ids=lambda cls: cls.__name__)
+def test_records_have_no_instance_dict(cls):
+    record = cls.fromDict({})
+    assert not hasattr(record, '__dict__')
+    with pytest.raises(AttributeError):
+        record.NotAnApiField = 1
+
+
+def test_round_trip_keeps_every_key():
+    record = vpgRecord.fromDict(VPG)
+    assert record.toDict() == VPG
+    assert record.HistoryStatusApi.EarliestCheckpoint.CheckpointIdentifier == 'cp-1'
+    assert record.ProtectedSite.identifier == 'site-1'
+    # a section with a key the record does not know is kept as the ZVM sent it
+    assert record.FailSafeHistory.NewInThisVersion is True
+    assert record.NewTopLevelKey == [1, 2] and record.SubStatus is None
+    assert record.toDict() == VPG
+
+
+def test_pickle_round_trip():
+    record = vpgRecord.fromDict(VPG)
+    record.Entities
+    copy = pickle.loads(pickle.dumps(record))
+    assert copy == record and copy.toDict() == VPG
+    assert not hasattr(copy, '__dict__')
+
+
+def test_records_from_a_stub_response(stub):
+    tasks = [{'TaskIdentifier': 't1', 'Type': 'FailOver', 'Status': {'Progress': 100, 'State': 6}},
+             {'TaskIdentifier': 't2', 'Status': {'Progress': 40, 'State': 1}}]
+    volumes = [{'VolumeIdentifier': 'vol-1', 'Size': {'ProvisionedInBytes': 10, 'UsedInBytes': 4},
+                'Vm': {'Identifier': 'vm-1', 'Name': 'web'}}]
+    stub.payloads.update({'/v1/tasks': tasks, '/v1/volumes': volumes})
+    z = zvm('127.0.0.1', {'x-zerto-session': 'token'}, httpsession=zertoSession())
+    z.zvmurl = stub.url + '/v1'
+    records = taskRecord.fromList(z.getAllTasks())
+    assert [(record.TaskIdentifier, record.Status.State) for record in records] == [('t1', 6), ('t2', 1)]
+    assert [record.toDict() for record in records] == tasks
+    assert volumeRecord.fromList(z.getAllVolumes(stream=True))[0].toDict() == volumes[0]
+    stub.statuses['/v1/tasks'] = [500]
+    with pytest.raises(Exception, match='HTTP: 500'):
+        taskRecord.fromList(z.getAllTasks())
@@ -0,0 +1,88 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from stub_zvm import stubZvm
+
+from zertoapl.zerto_retry import retryPolicy
+from zertoapl.zerto_session import zertoSession
+
+HEADERS = {'Accept': 'application/json', 'Content-Type': 'application/json', 'x-zerto-session': 'token'}
+
+
+class scriptedSession(zertoSession):
+    """
+    A zertoSession whose requests are answered with the given status codes, one per request, instead of the network.
+    """
+
+    def __init__(self, statuses, **kwargs):
+        super().__init__(**kwargs)
+        self.statuses = list(statuses)
+        self.sent = []
+        self.responses = []
+
+    def sendGoverned(self, method, url, *args, **kwargs):
+        self.sent.append((method, url, dict(kwargs.get('headers') or {})))
+        response = requests.Response()
+        response.status_code = self.statuses.pop(0)
+        response._content = b'"ok"'
+        response.closed = False
+        response.close = lambda: setattr(response, 'closed', True)
+        self.responses.append(response)
+        return response
+
+
+def test_401_renews_token_and_closes_rejected_response():
+    session = scriptedSession([401, 200], renewer=lambda stale: {'x-zerto-session': 'fresh'})
+    headers = {'x-zerto-session': 'stale'}
+    response = session.get('http://zvm/v1/vpgs', headers=headers)
+    assert response.status_code == 200
+    assert [sent[2]['x-zerto-session'] for sent in session.sent] == ['stale', 'fresh']
+    assert headers['x-zerto-session'] == 'fresh'
+    assert session.responses[0].closed
+
+
+def test_retries_transient_status_through_stub(stub):
+    retry = retryPolicy(backoff_base=0.01)
+    session = zertoSession(retry=retry)
+    stub.statuses['/v1/vpgs'] = [503, 502]
+    response = session.get(stub.url + '/v1/vpgs', headers=dict(HEADERS))
+    assert response.status_code == 200
+    assert [entry[:2] for entry in stub.log] == [('GET', '/v1/vpgs')] * 3
+    assert retry.stats['retries'] == 2
+
+
+def test_post_is_not_retried_through_stub(stub):
+    session = zertoSession(retry=retryPolicy(backoff_base=0.01))
+    stub.statuses['/v1/vpgs'] = [503]
+    assert session.post(stub.url + '/v1/vpgs', headers=dict(HEADERS), data='{}').status_code == 503
+    assert len(stub.log) == 1
+
+
+def test_401_renews_token_through_stub(stub):
+    def renewer(stale):
+        response = requests.post(stub.url + '/v1/session/add', data='{}')
+        return {'x-zerto-session': response.headers['x-zerto-session']}
+
+    headers = dict(HEADERS, **{'x-zerto-session': 'stale'})
+    session = zertoSession(renewer=renewer)
+    stub.statuses['/v1/vpgs'] = [401]
+    assert session.get(stub.url + '/v1/vpgs', headers=headers).ok
+    assert [(method, path, token) for method, path, token, body in stub.log] == [
+        ('GET', '/v1/vpgs', 'stale'), ('POST', '/v1/session/add', None), ('GET', '/v1/vpgs', 'stub-session-token')]
+    assert headers['x-zerto-session'] == 'stub-session-token'
+
+
+def test_identical_gets_are_coalesced_through_stub():
+    with stubZvm({'/v1/vpgs': [{'VpgIdentifier': 'vpg-1'}]}, delay=0.5) as stub:
+        session = zertoSession()
+        barrier = threading.Barrier(8)
+
+        def fetch(_):
+            barrier.wait()
+            return session.get(stub.url + '/v1/vpgs', headers=HEADERS, params={'a': '1'}).json()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(fetch, range(8)))
+        assert results == [[{'VpgIdentifier': 'vpg-1'}]] * 8
+        assert len(stub.log) == 1
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from zertoapl.zerto_session import zertoSession
+from zertoapl.zerto_stream import iterJsonArray
+from zertoapl.zvm import zvm
+
+
+class chunkedResponse:
+    """
+    Stands in for a requests response read with stream=True, handing out the body in the given chunks.
+    """
+
+    ok = True
+    status_code = 200
+    reason = 'OK'
+    encoding = 'utf-8'
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        return iter(self.chunks)
+
+    def close(self):
+        self.closed = True
+
+
+BODY = json.dumps([1.5, 1e10, -2.25e-3, 10, 0, -7, 3E+2, True, False, None, "a,b]", {"Size": 1.0e3, "Tags": []},
+                   [1, [2.5]], "é€"], ensure_ascii=False).encode()
+
+
+@pytest.mark.parametrize('split', range(len(BODY) + 1))
+def test_every_split_offset(split):
+    response = chunkedResponse([BODY[:split], BODY[split:]])
+    assert list(iterJsonArray(response)) == json.loads(BODY)
+    assert response.closed
+
+
+def test_one_byte_chunks():
+    response = chunkedResponse([BODY[i:i + 1] for i in range(len(BODY))])
+    assert list(iterJsonArray(response)) == json.loads(BODY)
+
+
+@pytest.mark.parametrize('chunks', [[b'[1.', b'5]'], [b'[1e', b'10]'], [b'[1e+', b'2]'], [b'[-', b'3]'],
+                                    [b'[12', b'34]'], [b'[tr', b'ue]']])
+def test_number_split_in_chunks(chunks):
+    assert list(iterJsonArray(chunkedResponse(chunks))) == json.loads(b''.join(chunks))
+
+
+def test_empty_array():
+    assert list(iterJsonArray(chunkedResponse([b' [ ', b' ] ']))) == []
+
+
+def test_truncated_body():
+    with pytest.raises(ValueError):
+        list(iterJsonArray(chunkedResponse([b'[1, 2'])))
+
+
+def test_not_an_array():
+    with pytest.raises(ValueError):
+        list(iterJsonArray(chunkedResponse([b'{"a": 1}'])))
+
+
+def test_invalid_number():
+    with pytest.raises(ValueError):
+        list(iterJsonArray(chunkedResponse([b'[1.', b'x]'])))
+
+
+def test_streamed_volumes_from_stub(stub):
+    volumes = [{'VmIdentifier': f'vm-{n}', 'Size': {'ProvisionedSizeInMb': n * 1.5}} for n in range(100)]
+    stub.payloads['/v1/volumes'] = volumes
+    z = zvm('127.0.0.1', {'x-zerto-session': 'token'}, httpsession=zertoSession())
+    z.zvmurl = stub.url + '/v1'
+    assert list(z.getAllVolumes(stream=True)) == volumes
@@ -0,0 +1,51 @@
+import pytest
+
+from zertoapl.zerto_session import zertoSession
+from zertoapl.zerto_tasks import taskError, taskWaiter
+from zertoapl.zvm import zvm
+
+HEADERS = {'Accept': 'application/json', 'Content-Type': 'application/json', 'x-zerto-session': 'token'}
+
+
+def task(taskid, state, progress=0):
+    return {'TaskIdentifier': taskid, 'Status': {'State': state, 'Progress': progress}}
+
+
+@pytest.fixture
+def waiter(stub):
+    z = zvm('127.0.0.1', HEADERS, httpsession=zertoSession())
+    z.zvmurl = stub.url + '/v1'
+    with taskWaiter(z, min_interval=0.01, max_interval=0.05) as waiter:
+        yield waiter
+
+
+def test_tasks_resolve_from_one_list(stub, waiter):
+    stub.payloads['/v1/tasks'] = [task('done', 6), task('broken', 5), task('running', 1, 40)]
+    assert waiter.watch('done').result(5) == task('done', 6)
+    with pytest.raises(taskError) as error:
+        waiter.watch('broken').result(5)
+    assert error.value.task == task('broken', 5)
+    assert waiter.wait(['done', 'broken'], timeout=5) == {'done': task('done', 6), 'broken': task('broken', 5)}
+    assert all(entry[1] == '/v1/tasks' for entry in stub.log)
+
+
+def test_task_missing_from_list_is_looked_up(stub, waiter):
+    stub.payloads['/v1/tasks'] = []
+    stub.payloads['/v1/tasks/aged'] = task('aged', 6)
+    assert waiter.watch('aged').result(5) == task('aged', 6)
+    assert waiter.stats['singleLookups'] == 1
+    assert [entry[1] for entry in stub.log].count('/v1/tasks') == 2
+
+
+def test_unfinished_task_times_out(stub, waiter):
+    stub.payloads['/v1/tasks'] = [task('slow', 1, 10)]
+    with pytest.raises(TimeoutError):
+        waiter.watch('slow', timeout=0.1).result(5)
+    assert waiter.stats['timedOut'] == 1
+
+
+def test_failed_tick_is_retried(stub, waiter):
+    stub.payloads['/v1/tasks'] = [task('done', 6)]
+    stub.statuses['/v1/tasks'] = [503]
+    assert waiter.watch('done').result(5) == task('done', 6)
+    assert waiter.stats['ticks'] == 2
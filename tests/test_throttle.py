@@ -0,0 +1,84 @@
+import asyncio
+import gc
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from stub_zvm import stubZvm
+
+from zertoapl.zerto_session import zertoSession
+from zertoapl.zerto_throttle import configureGovernor, removeGovernor, tokenBucket
+
+HEADERS = {'Accept': 'application/json', 'Content-Type': 'application/json', 'x-zerto-session': 'token'}
+
+
+@pytest.fixture
+def governed():
+    """
+    Returns a function installing a governor for the stub's host; it is removed after the test.
+    """
+
+    yield lambda **limits: configureGovernor('127.0.0.1', **limits)
+    removeGovernor('127.0.0.1')
+
+
+def fetch(url, count, workers):
+    session = zertoSession(pool_size=workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda n: session.get(url + f'?n={n}', headers=HEADERS).status_code, range(count)))
+
+
+def test_bucket_allows_burst_then_rate():
+    bucket = tokenBucket(10, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0.0] * 3
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+
+def test_rate_limit_spaces_requests(stub, governed):
+    governor = governed(rate=20, burst=1)
+    start = time.monotonic()
+    assert fetch(stub.url + '/v1/vpgs', 6, 6) == [200] * 6
+    # the first call is admitted at once, the five others one every 1/20 s
+    assert time.monotonic() - start >= 0.24
+    assert governor.stats['calls'] == 6
+    assert governor.stats['throttledSeconds'] == pytest.approx(0.05 + 0.1 + 0.15 + 0.2 + 0.25, abs=0.05)
+
+
+def test_in_flight_cap_bounds_peak_concurrency(governed):
+    governed(max_in_flight=2)
+    with stubZvm(delay=0.1) as stub:
+        start = time.monotonic()
+        assert fetch(stub.url + '/v1/vpgs', 8, 8) == [200] * 8
+        assert stub.gauge.peak == 2
+        assert time.monotonic() - start >= 0.4
+
+
+def test_callers_waiting_for_rate_do_not_hold_slots(governed):
+    governor = governed(rate=5, burst=1, max_in_flight=1)
+    governor.bucket.reserve()
+
+    def call():
+        with governor.slot():
+            pass
+
+    # the caller waits 0.2 s for its token; meanwhile its slot is still free for others
+    waiting = threading.Thread(target=call)
+    waiting.start()
+    time.sleep(0.05)
+    assert governor._semaphore.acquire(blocking=False)
+    governor._semaphore.release()
+    waiting.join()
+
+
+def test_async_semaphores_do_not_keep_loops_alive(governed):
+    governor = governed(max_in_flight=2)
+
+    async def use():
+        async with governor.asyncSlot():
+            return len(governor._asyncSemaphores)
+
+    assert asyncio.run(use()) == 1
+    gc.collect()
+    assert len(governor._asyncSemaphores) == 0
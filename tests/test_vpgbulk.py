@@ -0,0 +1,100 @@
+import json
+from concurrent.futures import Future
+
+import requests
+
+from zertoapl.zerto_tasks import taskError
+from zertoapl.zerto_vpgbulk import bulkVpgCreator, chunkVms
+
+
+def jsonResponse(status, body):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body.encode()
+    return response
+
+
+class fakeSettings:
+    """
+    Accepts every settings object, and rejects the commit of the VPGs named in rejected once. The commits of the VPGs
+    named in dropped are accepted, but the connection drops before the answer arrives; those named in garbled get an
+    answer that is not JSON.
+    """
+
+    def __init__(self, rejected=(), dropped=(), garbled=()):
+        self.rejected = set(rejected)
+        self.dropped = set(dropped)
+        self.garbled = set(garbled)
+        self.created = []
+        self.deleted = []
+        self.names = {}
+
+    def createNewVpgSettingsObject(self, body):
+        name = json.loads(body)['Basic']['Name']
+        self.created.append(name)
+        settingsid = f'settings-{len(self.created)}'
+        self.names[settingsid] = name
+        return jsonResponse(200, f'"{settingsid}"')
+
+    def commitSettingsObject(self, settingsid):
+        name = self.names[settingsid]
+        if name in self.rejected:
+            self.rejected.discard(name)
+            return jsonResponse(400, '"rejected"')
+        if name in self.dropped:
+            raise requests.ConnectionError('connection reset')
+        if name in self.garbled:
+            return jsonResponse(200, '<html>')
+        return jsonResponse(200, f'"task-{name}"')
+
+    def deleteSettingsObject(self, settingsid):
+        self.deleted.append(settingsid)
+        return jsonResponse(200, '""')
+
+
+class fakeWaiter:
+    """
+    Fails the commit task of the VPGs named in failed.
+    """
+
+    def __init__(self, failed=()):
+        self.failed = set(failed)
+
+    def watch(self, taskid, callback=None, timeout=None):
+        future = Future()
+        if taskid[len('task-'):] in self.failed:
+            future.set_exception(taskError(taskid, {'Status': {'State': 5}}))
+        else:
+            future.set_result({'Status': {'State': 6}})
+        return future
+
+
+def test_chunks_respect_count_and_size():
+    vms = [{'VmIdentifier': str(n), 'SizeInMb': 400} for n in range(7)]
+    assert [len(chunk) for chunk in chunkVms(vms, max_vms=3)] == [3, 3, 1]
+    assert [len(chunk) for chunk in chunkVms(vms, max_vms=10, max_size_mb=1000)] == [2, 2, 2, 1]
+
+
+def test_retry_skips_vpgs_whose_commit_was_accepted():
+    settings = fakeSettings(rejected=['app-001'])
+    creator = bulkVpgCreator(settings, None, {'Basic': {}}, max_vms=2, waiter=fakeWaiter(failed=['app-002']))
+    rollout = creator.protect([str(n) for n in range(6)], 'app')
+    assert [(row['name'], row['ok'], row['stage']) for row in rollout.report()] == [
+        ('app-001', False, 'commit'), ('app-002', False, 'task'), ('app-003', True, 'done')]
+    retried = creator.retryFailed(rollout)
+    assert settings.created == ['app-001', 'app-002', 'app-003', 'app-001']
+    assert retried.outcomes['app-001'].ok
+    assert retried.outcomes['app-002'].stage == 'task'
+
+
+def test_commit_without_answer_is_discarded_and_not_retried():
+    settings = fakeSettings(dropped=['app-001'], garbled=['app-002'])
+    creator = bulkVpgCreator(settings, None, {'Basic': {}}, max_vms=2, waiter=fakeWaiter())
+    rollout = creator.protect([str(n) for n in range(6)], 'app')
+    assert [(row['name'], row['ok'], row['stage']) for row in rollout.report()] == [
+        ('app-001', False, 'commit-unknown'), ('app-002', False, 'commit-unknown'), ('app-003', True, 'done')]
+    assert rollout.outcomes['app-001'].error == 'ConnectionError: connection reset'
+    assert sorted(settings.names[settingsid] for settingsid in settings.deleted) == ['app-001', 'app-002']
+    retried = creator.retryFailed(rollout)
+    assert sorted(settings.created) == ['app-001', 'app-002', 'app-003']
+    assert retried.outcomes['app-001'].stage == 'commit-unknown'
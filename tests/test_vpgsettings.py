@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from zertoapl.vpg import vpgSettings
+from zertoapl.zerto_session import zertoSession
+
+HEADERS = {'Accept': 'application/json', 'Content-Type': 'application/json', 'x-zerto-session': 'token'}
+
+CURRENT = {
+    'VpgIdentifier': 'vpg-1',
+    'Basic': {'Name': 'app', 'RpoInSeconds': 300, 'JournalHistoryInHours': 24},
+    'Journal': {'Limitation': {'HardLimitInMB': 0}},
+    'Vms': [{'VmIdentifier': 'vm-1', 'Recovery': {'HostIdentifier': 'host-1'}}],
+}
+
+# the stub answers the POST creating a settings object with this identifier
+SETTINGSID = 'stub-task-identifier'
+
+
+@pytest.fixture
+def settings(stub):
+    stub.payloads['/v1/vpgSettings/' + SETTINGSID] = CURRENT
+    settings = vpgSettings('127.0.0.1', HEADERS, httpsession=zertoSession())
+    settings.zvmip = stub.url + '/v1'
+    return settings
+
+
+def sent(stub):
+    return [(method, path, json.loads(body) if body else None) for method, path, token, body in stub.log]
+
+
+def test_diff_keeps_only_changed_sections():
+    desired = {'VpgIdentifier': 'vpg-2', 'Basic': {'RpoInSeconds': 120},
+               'Journal': {'Limitation': {'HardLimitInMB': 0}},
+               'Vms': [{'VmIdentifier': 'vm-1', 'Recovery': {'HostIdentifier': 'host-1'}}, {'VmIdentifier': 'vm-2'}]}
+    assert vpgSettings.diffSettings(CURRENT, desired) == {
+        'Basic': {'Name': 'app', 'RpoInSeconds': 120, 'JournalHistoryInHours': 24},
+        'Vms': {'vm-2': {'VmIdentifier': 'vm-2'}},
+    }
+    assert vpgSettings.diffSettings(CURRENT, {'Basic': {'Name': 'app'}}) == {}
+
+
+def test_diff_rejects_unknown_section():
+    with pytest.raises(ValueError):
+        vpgSettings.diffSettings(CURRENT, {'Basics': {}})
+
+
+def test_edit_sends_changed_sections_and_commits(stub, settings):
+    response = settings.editVpg('vpg-1', {'Basic': {'RpoInSeconds': 120},
+                                          'Vms': [{'VmIdentifier': 'vm-1', 'Recovery': {'HostIdentifier': 'host-2'}},
+                                                  {'VmIdentifier': 'vm-2'}]})
+    assert response.json() == 'stub-task-identifier'
+    assert sent(stub) == [
+        ('POST', '/v1/vpgSettings', {'VpgIdentifier': 'vpg-1'}),
+        ('GET', '/v1/vpgSettings/' + SETTINGSID, None),
+        ('PUT', '/v1/vpgSettings/' + SETTINGSID + '/basic', dict(CURRENT['Basic'], RpoInSeconds=120)),
+        ('PUT', '/v1/vpgSettings/' + SETTINGSID + '/vms/vm-1',
+         {'VmIdentifier': 'vm-1', 'Recovery': {'HostIdentifier': 'host-2'}}),
+        ('POST', '/v1/vpgSettings/' + SETTINGSID + '/vms', {'VmIdentifier': 'vm-2'}),
+        ('POST', '/v1/vpgSettings/' + SETTINGSID + '/commit', None),
+    ]
+
+
+def test_edit_without_changes_discards_settings_object(stub, settings):
+    assert settings.editVpg('vpg-1', {'Basic': {'RpoInSeconds': 300}}) is None
+    assert [entry[:2] for entry in sent(stub)][-1] == ('DELETE', '/v1/vpgSettings/' + SETTINGSID)
+    assert not any(path.endswith('/commit') for method, path, body in sent(stub))
+
+
+def test_rejected_edit_discards_settings_object(stub, settings):
+    stub.statuses['/v1/vpgSettings/' + SETTINGSID + '/journal'] = [400]
+    with pytest.raises(Exception, match='HTTP: 400'):
+        settings.editVpg('vpg-1', {'Journal': {'Limitation': {'HardLimitInMB': 1024}}})
+    assert [entry[:2] for entry in sent(stub)][-1] == ('DELETE', '/v1/vpgSettings/' + SETTINGSID)
+    assert not any(path.endswith('/commit') for method, path, body in sent(stub))
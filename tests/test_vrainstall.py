@@ -0,0 +1,69 @@
+import json
+from concurrent.futures import Future
+
+import requests
+
+from zertoapl.zerto_rollout import bulkRollout, describeError
+from zertoapl.zerto_tasks import taskError
+from zertoapl.zerto_vrainstall import bulkVraInstaller, vraRollout
+
+
+class fakeInventory:
+    def resolve(self, datastores=(), hosts=(), networks=()):
+        return {'datastores': {name: f'ds-{name}' for name in datastores},
+                'hosts': {name: (None if name == 'unknown' else f'host-{name}') for name in hosts},
+                'networks': {name: f'net-{name}' for name in networks}}
+
+
+class fakeVra:
+    """
+    Rejects the first installation on each host named in flaky.
+    """
+
+    def __init__(self, flaky=()):
+        self.flaky = set(flaky)
+        self.installed = []
+
+    def installVRA(self, body):
+        host = json.loads(body)['HostIdentifier']
+        response = requests.Response()
+        if host in self.flaky:
+            self.flaky.discard(host)
+            response.status_code, response.reason, response._content = 409, 'Conflict', b'busy'
+        else:
+            self.installed.append(host)
+            response.status_code, response._content = 200, json.dumps(f'task-{host}').encode()
+        return response
+
+
+class doneWaiter:
+    def watch(self, taskid, callback=None, timeout=None):
+        future = Future()
+        future.set_result({'Status': {'State': 6}})
+        return future
+
+
+def spec(host):
+    return {'host': host, 'datastore': 'ds1', 'network': 'net1', 'ip': '10.0.0.1', 'subnet': '255.255.255.0',
+            'gateway': '10.0.0.254'}
+
+
+def test_install_and_retry():
+    vra = fakeVra(flaky=['host-esx2'])
+    installer = bulkVraInstaller(vra, None, fakeInventory(), waiter=doneWaiter())
+    rollout = installer.install([spec('esx1'), spec('esx2'), spec('unknown')])
+    assert isinstance(rollout, bulkRollout)
+    assert [row['ok'] for row in rollout.report()] == [True, False, False]
+    assert rollout.outcomes['esx2'].error == 'HTTP: 409 - Conflict, Message: busy'
+    assert rollout.outcomes['unknown'].error == "Unknown host 'unknown'"
+    assert [failed['host'] for failed in rollout.failed] == ['esx2', 'unknown']
+    retried = installer.retryFailed(rollout)
+    assert isinstance(retried, vraRollout)
+    assert [row['host'] for row in retried.report() if row['ok']] == ['esx1', 'esx2']
+    assert vra.installed == ['host-esx1', 'host-esx2']
+
+
+def test_describe_error():
+    assert describeError(Exception('HTTP: 500 - Error, Message: ')) == 'HTTP: 500 - Error, Message: '
+    assert describeError(taskError('t1', {'Status': {'State': 5}})) == 'Task t1 ended in state 5'
+    assert describeError(KeyError('x')) == "KeyError: 'x'"
@@ -0,0 +1,26 @@
+"""
+zertoapl is an unofficial Python wrapper for the Zerto REST API.
+
+Submodules are imported the first time they are accessed (zertoapl.zvm, zertoapl.zerto_alerts, ...) or imported
+(from zertoapl import zvm), so that "import zertoapl" stays cheap and a script that only needs one module does not
+load the others, or requests, at startup.
+"""
+
+import importlib
+
+__all__ = ['vpg', 'vra', 'zerto_alerts', 'zerto_async', 'zerto_auth', 'zerto_cache', 'zerto_checkpoints',
+           'zerto_coalesce', 'zerto_codec', 'zerto_events', 'zerto_failover', 'zerto_failovertest', 'zerto_fleet',
+           'zerto_inventory', 'zerto_metrics', 'zerto_models', 'zerto_retry', 'zerto_rollout', 'zerto_session',
+           'zerto_stream', 'zerto_tasks', 'zerto_throttle', 'zerto_vpgbulk', 'zerto_vrainstall', 'zertoapl', 'zvm']
+
+_submodules = frozenset(__all__)
+
+
+def __getattr__(name):
+    if name in _submodules:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _submodules)
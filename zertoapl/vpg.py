@@ -4,7 +4,10 @@ gathering VPG info such as checkpoints, as well as performing actions such as fa
 or fail over live. 
 """
 
-import requests
+import json
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .zerto_stream import iterJsonArray
 
 class vpgs():
     """
@@ -26,6 +29,9 @@ class vpgs():
     vpgid: str
         unique identifier for individual VPG
 
+    httpsession : requests.Session
+        the session (and connection pool) used for every API call
+
     Methods
     -------
     getInfoAllVpgs()
@@ -34,7 +40,7 @@ class vpgs():
     getInfoSingleVPG(vpgid)
         Returns information for individual VPG
     
-    getCheckpointsForVPG(vpgid)
+    getCheckpointsForVPG(vpgid, stream=False)
         Returns all checkpoints for individual VPG
 
     getCheckpointStatsForVpg(vpgid)
@@ -108,7 +114,7 @@ class vpgs():
     """
     endPoint = '/vpgs'
 
-    def __init__(self, zvmip, headerwithkey, vpgid=None):
+    def __init__(self, zvmip, headerwithkey, vpgid=None, httpsession=None):
         """
         Parameters
         ----------
@@ -123,11 +129,18 @@ class vpgs():
                 }
         vpgid: str
             unique identifier for individual VPG
+        httpsession : requests.Session, optional
+            A (pooled) session shared with other classes, such as the zertoSession created by the zertoapl class. A
+            private session is created when none is given.
         """
 
         self.zvmip = 'https://' + zvmip + ':9669/v1'
         self.headerwithkey = headerwithkey
         self.vpgid = vpgid
+        if httpsession is None:
+            import requests
+            httpsession = requests.Session()
+        self.httpsession = httpsession
 
     def getInfoAllVpgs(self):
         """
@@ -138,7 +151,7 @@ class vpgs():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint, headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint, headers=self.headerwithkey, verify=False)
 
     def getInfoSingleVpg(self, vpgid):
         """
@@ -154,23 +167,35 @@ class vpgs():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/' + vpgid, headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/' + vpgid, headers=self.headerwithkey, verify=False)
 
-    def getCheckpointsForVpg(self, vpgid):
+    def getCheckpointsForVpg(self, vpgid, stream=False, startdate=None, enddate=None):
         """
-        Returns all checkpoints for individual VPG
+        Returns all checkpoints for individual VPG, or those in a time window. The window is applied by the ZVM, so
+        only the matching checkpoints are transferred.
 
         Parameters
         ----------
         vpgid : str, required
             The VPG identifier that you want checkpoint information returned on 
+        stream : bool, optional
+            Return a generator yielding one checkpoint at a time, decoded while the response is being downloaded,
+            instead of the response (default: False). See zerto_stream.iterJsonArray.
+        startdate : str, optional
+            Only checkpoints taken at or after this time, for example '2021-03-01T00:00:00.000'
+        enddate : str, optional
+            Only checkpoints taken at or before this time
 
         Returns
         -------
-        type requests.models.Response object
+        type requests.models.Response object, or a generator of checkpoint dicts when stream is True
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/' + vpgid + '/checkpoints', headers=self.headerwithkey, verify=False)
+        window = {'startDate': startdate, 'endDate': enddate}
+        response = self.httpsession.get(self.zvmip + self.endPoint + '/' + vpgid + '/checkpoints',
+                                        headers=self.headerwithkey, verify=False, stream=stream,
+                                        params={key: value for key, value in window.items() if value is not None})
+        return iterJsonArray(response) if stream else response
 
     def getCheckpointStatsForVpg(self, vpgid):
         """
@@ -186,7 +211,7 @@ class vpgs():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/' + vpgid + '/checkpoints/stats', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/' + vpgid + '/checkpoints/stats', headers=self.headerwithkey, verify=False)
 
     def getValidValuesForVpgEntities(self):
         """
@@ -197,7 +222,7 @@ class vpgs():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/entitytypes', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/entitytypes', headers=self.headerwithkey, verify=False)
     
     def getValidValuesForFailoverCommitPolicies(self):
         """
@@ -208,7 +233,7 @@ class vpgs():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/failovercommitpolicies', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/failovercommitpolicies', headers=self.headerwithkey, verify=False)
         
     def getValidValuesForFailoverShutdownPolicies(self):
         """
@@ -219,7 +244,7 @@ class vpgs():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/failovershutdownpolicies', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/failovershutdownpolicies', headers=self.headerwithkey, verify=False)
         
     def getValidValuesForVpgPriorities(self):
         """
@@ -230,7 +255,7 @@ class vpgs():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/priorities', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/priorities', headers=self.headerwithkey, verify=False)
 
     def getValidValuesForFailoverRetentionPolicies(self):
         """
@@ -241,7 +266,7 @@ class vpgs():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/retentionpolicies', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/retentionpolicies', headers=self.headerwithkey, verify=False)
 
     def getValidValuesForVpgStatuses(self):
         """
@@ -252,7 +277,7 @@ class vpgs():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/statuses', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/statuses', headers=self.headerwithkey, verify=False)
         
     def getValidValuesForVpgSubstatuses(self):
         """
@@ -263,7 +288,7 @@ class vpgs():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/substatuses', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/substatuses', headers=self.headerwithkey, verify=False)
         
     def insertTaggedCheckpoint(self, vpgid, body):
         """
@@ -285,7 +310,7 @@ class vpgs():
         type requests.models.Response object
         """
 
-        return requests.post(self.zvmip + self.endPoint + '/' + vpgid + '/Checkpoints', body = body, headers=self.headerwithkey, verify=False)
+        return self.httpsession.post(self.zvmip + self.endPoint + '/' + vpgid + '/Checkpoints', data=body, headers=self.headerwithkey, verify=False)
         
     def cloneVpg(self, vpgid, body):
         """
@@ -312,7 +337,7 @@ class vpgs():
         type requests.models.Response object
         """
 
-        return requests.post(self.zvmip + self.endPoint + '/' + vpgid + '/CloneStart', body = body, headers=self.headerwithkey, verify=False)
+        return self.httpsession.post(self.zvmip + self.endPoint + '/' + vpgid + '/CloneStart', data=body, headers=self.headerwithkey, verify=False)
         
     def cloneAbort(self, vpgid):
         """
@@ -328,7 +353,7 @@ class vpgs():
         type requests.models.Response object
         """
 
-        return requests.post(self.zvmip + self.endPoint + '/' + vpgid + '/CloneAbort', headers=self.headerwithkey, verify=False)
+        return self.httpsession.post(self.zvmip + self.endPoint + '/' + vpgid + '/CloneAbort', headers=self.headerwithkey, verify=False)
 
     def failoverVpg(self, vpgid, body):
         """
@@ -358,7 +383,7 @@ class vpgs():
         type requests.models.Response object
         """
 
-        return requests.post(self.zvmip + self.endPoint + '/' + vpgid + '/Failover', body = body, headers=self.headerwithkey, verify=False)
+        return self.httpsession.post(self.zvmip + self.endPoint + '/' + vpgid + '/Failover', data=body, headers=self.headerwithkey, verify=False)
        
     def commitFailover(self, vpgid, body):
         """
@@ -380,7 +405,7 @@ class vpgs():
         type requests.models.Response object
         """
 
-        return requests.post(self.zvmip + self.endPoint + '/' + vpgid + '/FailoverCommit', body = body, headers=self.headerwithkey, verify=False)
+        return self.httpsession.post(self.zvmip + self.endPoint + '/' + vpgid + '/FailoverCommit', data=body, headers=self.headerwithkey, verify=False)
         
     def rollbackFailover(self, vpgid):
         """
@@ -395,7 +420,7 @@ class vpgs():
         -------
         type requests.models.Response object
         """        
-        return requests.post(self.zvmip + self.endPoint + '/' + vpgid + '/FailoverRollback', headers=self.headerwithkey, verify=False)
+        return self.httpsession.post(self.zvmip + self.endPoint + '/' + vpgid + '/FailoverRollback', headers=self.headerwithkey, verify=False)
        
 
     def failoverTest(self, vpgid, body):
@@ -421,7 +446,7 @@ class vpgs():
         -------
         type requests.models.Response object
         """
-        return requests.post(self.zvmip + self.endPoint + '/' + vpgid + '/FailoverTest', body = body, headers=self.headerwithkey, verify=False)
+        return self.httpsession.post(self.zvmip + self.endPoint + '/' + vpgid + '/FailoverTest', data=body, headers=self.headerwithkey, verify=False)
 
     def stopFailoverTest(self, vpgid, body):
         """
@@ -444,7 +469,7 @@ class vpgs():
         type requests.models.Response object
         """
 
-        return requests.post(self.zvmip + self.endPoint + '/' + vpgid + '/FailoverTestStop', body = body, headers=self.headerwithkey, verify=False)
+        return self.httpsession.post(self.zvmip + self.endPoint + '/' + vpgid + '/FailoverTestStop', data=body, headers=self.headerwithkey, verify=False)
         
     def forceSyncVpg(self, vpgid):
         """
@@ -459,7 +484,7 @@ class vpgs():
         -------
         type requests.models.Response object
         """           
-        return requests.post(self.zvmip + self.endPoint + '/' + vpgid + '/forcesync', headers=self.headerwithkey, verify=False)
+        return self.httpsession.post(self.zvmip + self.endPoint + '/' + vpgid + '/forcesync', headers=self.headerwithkey, verify=False)
 
     def moveVpg(self, vpgid, body):
         """
@@ -486,7 +511,7 @@ class vpgs():
         type requests.models.Response object
         """
 
-        return requests.post(self.zvmip + self.endPoint + '/' + vpgid + '/move', body = body, headers=self.headerwithkey, verify=False)
+        return self.httpsession.post(self.zvmip + self.endPoint + '/' + vpgid + '/move', data=body, headers=self.headerwithkey, verify=False)
 
     def rollbackMoveVpg(self, vpgid, body):
         """
@@ -502,7 +527,7 @@ class vpgs():
         type requests.models.Response object
         """       
 
-        return requests.post(self.zvmip + self.endPoint + '/' + vpgid + '/moveRollback', body = body, headers=self.headerwithkey, verify=False)
+        return self.httpsession.post(self.zvmip + self.endPoint + '/' + vpgid + '/moveRollback', data=body, headers=self.headerwithkey, verify=False)
 
     def commitMove(self, vpgid, body):
         """
@@ -523,7 +548,7 @@ class vpgs():
         -------
         type requests.models.Response object
         """        
-        return requests.post(self.zvmip + self.endPoint + '/' + vpgid + '/moveCommit', body = body, headers=self.headerwithkey, verify=False)
+        return self.httpsession.post(self.zvmip + self.endPoint + '/' + vpgid + '/moveCommit', data=body, headers=self.headerwithkey, verify=False)
 
     def pauseVpgProtection(self, vpgid):
         """
@@ -539,7 +564,7 @@ class vpgs():
         type requests.models.Response object
         """
 
-        return requests.post(self.zvmip + self.endPoint + '/' + vpgid + '/pause', headers=self.headerwithkey, verify=False)
+        return self.httpsession.post(self.zvmip + self.endPoint + '/' + vpgid + '/pause', headers=self.headerwithkey, verify=False)
 
     def resumeVpgProtection(self, vpgid):
         """
@@ -555,7 +580,7 @@ class vpgs():
         type requests.models.Response object
         """
 
-        return requests.post(self.zvmip + self.endPoint + '/' + vpgid + '/resume', headers=self.headerwithkey, verify=False)
+        return self.httpsession.post(self.zvmip + self.endPoint + '/' + vpgid + '/resume', headers=self.headerwithkey, verify=False)
 
     def deleteVpg(self, vpgid, body):
         """
@@ -576,7 +601,7 @@ class vpgs():
         -------
         type requests.models.Response object
         """           
-        return requests.delete(self.zvmip + self.endPoint + '/' + vpgid, data=body, headers=self.headerwithkey, verify=False)
+        return self.httpsession.delete(self.zvmip + self.endPoint + '/' + vpgid, data=body, headers=self.headerwithkey, verify=False)
 
 class vpgSettings():
     """
@@ -606,9 +631,12 @@ class vpgSettings():
     volumeid : str (default: None)
         identifier of a volume
 
+    httpsession : requests.Session
+        the session (and connection pool) used for every API call
+
     Methods
     -------
-    getSettingsForVpgs()
+    getSettingsForVpgs(stream=False)
         Returns settings information for all VPGs
 
     getSettingsForSingleVpg(vpgid)
@@ -656,6 +684,12 @@ class vpgSettings():
     getSingleVolumeSettingsForSingleVmInVpg(vpgid, vmid, volumeid)
         Returns information about a single specified volume about a single specified VM in a single specified VPG
 
+    getSettingsTree(vpgid, max_concurrent=8)
+        Returns every settings section of a VPG, including the NIC and volume settings of each VM, fetched concurrently
+
+    getSettingsTrees(vpgids, max_concurrent=16)
+        Returns the settings trees of many VPGs, fetched concurrently
+
     createNewVpgSettingsObject(argbody)
         Creates an empty VPG settings object. This object is the foundation of a new VPG.
 
@@ -701,6 +735,15 @@ class vpgSettings():
     editVolumeSettingsObject(vpgid, vmid, volumeid, body)
         Edits the volume settings object of an open VPG.
 
+    diffSettings(current, desired)
+        Returns the sections (and VMs) of desired that differ from current.
+
+    patchSettingsObject(vpgid, desired, current=None)
+        Sends only the sections of an open VPG settings object that desired changes.
+
+    editVpg(vpgid, desired)
+        Opens a settings object for an existing VPG, patches it with desired and commits it if anything changed.
+
     deleteSettingsObject(vpgid)
         Deletes a VPG Settings object.
 
@@ -734,7 +777,7 @@ class vpgSettings():
 
     endPoint = '/vpgSettings'
 
-    def __init__(self, zvmip, headerwithkey, vpgid=None, vmid=None, nicid=None, volumeid=None):
+    def __init__(self, zvmip, headerwithkey, vpgid=None, vmid=None, nicid=None, volumeid=None, httpsession=None):
         """
         Parameters
         ----------
@@ -760,6 +803,10 @@ class vpgSettings():
 
         volumeid : str, optional
             ID of the volume in question
+
+        httpsession : requests.Session, optional
+            A (pooled) session shared with other classes, such as the zertoSession created by the zertoapl class. A
+            private session is created when none is given.
         """
         self.zvmip = 'https://' + zvmip + ':9669/v1'
         self.headerwithkey = headerwithkey
@@ -767,18 +814,30 @@ class vpgSettings():
         self.vmid = vmid
         self.nicid = nicid
         self.volumeid = volumeid
+        if httpsession is None:
+            import requests
+            httpsession = requests.Session()
+        self.httpsession = httpsession
 
 
-    def getSettingsForVpgs(self):
+    def getSettingsForVpgs(self, stream=False):
         """
         Returns settings information for all VPGs
 
+        Parameters
+        ----------
+        stream : bool, optional
+            Return a generator yielding the settings of one VPG at a time, decoded while the response is being
+            downloaded, instead of the response (default: False). See zerto_stream.iterJsonArray.
+
         Returns
         -------
-        type requests.models.Response object
+        type requests.models.Response object, or a generator of VPG settings dicts when stream is True
         """
 
-        return requests.get(self.zvmip + self.endPoint, headers=self.headerwithkey, verify=False)
+        response = self.httpsession.get(self.zvmip + self.endPoint, headers=self.headerwithkey, verify=False,
+                                        stream=stream)
+        return iterJsonArray(response) if stream else response
 
     def getSettingsForSingleVpg(self, vpgid):
         """
@@ -794,7 +853,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/' + vpgid, headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/' + vpgid, headers=self.headerwithkey, verify=False)
 
     def getBasicVpgSettings(self, vpgid):
         """
@@ -810,8 +869,8 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/' + vpgid + '/basic', headers=self.headerwithkey,
-                            verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/' + vpgid + '/basic', headers=self.headerwithkey,
+                                    verify=False)
 
     def getBootVpgSettings(self, vpgid):
         """
@@ -827,8 +886,8 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/' + vpgid + '/bootgroup', headers=self.headerwithkey,
-                            verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/' + vpgid + '/bootgroup', headers=self.headerwithkey,
+                                    verify=False)
 
     def getJournalVpgSettings(self, vpgid):
         """
@@ -844,8 +903,8 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/' + vpgid + '/journal', headers=self.headerwithkey,
-                            verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/' + vpgid + '/journal', headers=self.headerwithkey,
+                                    verify=False)
 
     def getLtrVpgSettings(self, vpgid):
         """
@@ -861,7 +920,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/' + vpgid + '/ltr', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/' + vpgid + '/ltr', headers=self.headerwithkey, verify=False)
 
     def getNetworkVpgSettings(self, vpgid):
         """
@@ -877,7 +936,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/' + vpgid + '/networks', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/' + vpgid + '/networks', headers=self.headerwithkey, verify=False)
 
     def getVpgPriority(self, vpgid):
         """
@@ -893,7 +952,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/' + vpgid + '/priority', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/' + vpgid + '/priority', headers=self.headerwithkey, verify=False)
 
     def getVpgRecoverySettings(self, vpgid):
         """
@@ -909,7 +968,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/' + vpgid + '/recovery', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/' + vpgid + '/recovery', headers=self.headerwithkey, verify=False)
 
     def getVpgScriptSettings(self, vpgid):
         """
@@ -925,7 +984,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/' + vpgid + '/scripting', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/' + vpgid + '/scripting', headers=self.headerwithkey, verify=False)
 
     def getAllVmSettingsForAVpg(self, vpgid):
         """
@@ -941,7 +1000,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/' + vpgid + '/vms', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/' + vpgid + '/vms', headers=self.headerwithkey, verify=False)
 
     def getVMSettingsForSingleVmInVpg(self, vpgid, vmid):
         """
@@ -959,7 +1018,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/' + vpgid + '/vms/' + vmid, headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/' + vpgid + '/vms/' + vmid, headers=self.headerwithkey, verify=False)
 
     def getNICSettingsForSingleVmInVpg(self, vpgid, vmid):
         """
@@ -977,7 +1036,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/' + vpgid + '/vms/' + vmid + '/nics', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/' + vpgid + '/vms/' + vmid + '/nics', headers=self.headerwithkey, verify=False)
 
     def getSingleNICSettingsForSingleVmInVpg(self, vpgid, vmid, nicid):
         """
@@ -997,8 +1056,8 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/' + vpgid + '/vms/' + vmid + '/nics/' + nicid,
-                                headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/' + vpgid + '/vms/' + vmid + '/nics/' + nicid,
+                                        headers=self.headerwithkey, verify=False)
 
     def getVolumeSettingsForSingleVmInVpg(self, vpgid, vmid):
         """
@@ -1016,8 +1075,8 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/' + vpgid + '/vms/' + vmid + '/volumes',
-                                headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/' + vpgid + '/vms/' + vmid + '/volumes',
+                                        headers=self.headerwithkey, verify=False)
 
     def getSingleVolumeSettingsForSingleVmInVpg(self, vpgid, vmid, volumeid):
         """
@@ -1037,8 +1096,80 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmip + self.endPoint + '/' + vpgid + '/vms/' + vmid + '/volumes/' + volumeid,
-                                headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmip + self.endPoint + '/' + vpgid + '/vms/' + vmid + '/volumes/' + volumeid,
+                                        headers=self.headerwithkey, verify=False)
+
+    def _getJson(self, url):
+        response = self.httpsession.get(url, headers=self.headerwithkey, verify=False)
+        if not response.ok:
+            raise Exception(f"HTTP: {response.status_code} - {response.reason}, Message: {response.text}")
+        return response.json()
+
+    def getSettingsTree(self, vpgid, max_concurrent=8):
+        """
+        Returns every settings section of a VPG settings object in one dict, fetched concurrently.
+
+        Parameters
+        ----------
+        vpgid : str, required
+            ID of the VPG settings object in question
+        max_concurrent : int, optional
+            Requests in flight at the same time (default: 8)
+
+        Returns
+        -------
+        type dict
+            Basic, BootGroups, Journal, LongTermRetention, Networks, Recovery, Scripting and Vms, where every VM carries
+            its Nics and Volumes settings
+        """
+
+        return self.getSettingsTrees([vpgid], max_concurrent)[vpgid]
+
+    def getSettingsTrees(self, vpgids, max_concurrent=16):
+        """
+        Returns the settings trees (see getSettingsTree) of many VPG settings objects. All requests share one pool, and
+        the NIC and volume settings of a VPG's VMs are requested as soon as its VM list arrives.
+
+        Parameters
+        ----------
+        vpgids : list, required
+            IDs of the VPG settings objects in question
+        max_concurrent : int, optional
+            Requests in flight at the same time (default: 16)
+
+        Returns
+        -------
+        type dict
+            VPG settings ID -> settings tree
+        """
+
+        base = self.zvmip + self.endPoint + '/'
+        trees = {vpgid: {} for vpgid in vpgids}
+        pending = {}
+        with ThreadPoolExecutor(max_workers=max(max_concurrent, 1)) as executor:
+            try:
+                for vpgid in trees:
+                    for section, path in list(self.sectionPaths.items()) + [('Vms', '/vms')]:
+                        pending[executor.submit(self._getJson, base + vpgid + path)] = (vpgid, section, None)
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        vpgid, section, vm = pending.pop(future)
+                        if vm is not None:
+                            vm[section] = future.result()
+                            continue
+                        trees[vpgid][section] = future.result()
+                        if section != 'Vms':
+                            continue
+                        for vm in trees[vpgid]['Vms']:
+                            for key, path in (('Nics', '/nics'), ('Volumes', '/volumes')):
+                                url = base + vpgid + '/vms/' + vm['VmIdentifier'] + path
+                                pending[executor.submit(self._getJson, url)] = (vpgid, key, vm)
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+        return trees
 
     def createNewVpgSettingsObject(self, argbody):
         """
@@ -1054,7 +1185,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.post(self.zvmip + self.endPoint, data=argbody, headers=self.headerwithkey, verify=False)
+        return self.httpsession.post(self.zvmip + self.endPoint, data=argbody, headers=self.headerwithkey, verify=False)
 
     def createDefaultVpgLTRSettings(self, vpgid, body):
         """
@@ -1073,7 +1204,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.post(self.zvmip + self.endPoint + '/' + vpgid + '/ltr', body=body, headers=self.headerwithkey, verify=False)
+        return self.httpsession.post(self.zvmip + self.endPoint + '/' + vpgid + '/ltr', data=body, headers=self.headerwithkey, verify=False)
 
     def commitSettingsObject(self, vpgid):
         """
@@ -1089,7 +1220,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.post(self.zvmip + self.endPoint + '/' + vpgid + '/commit', headers=self.headerwithkey, verify=False)
+        return self.httpsession.post(self.zvmip + self.endPoint + '/' + vpgid + '/commit', headers=self.headerwithkey, verify=False)
 
     def addVmsToSettingObject(self, vpgid, body):
         """
@@ -1108,7 +1239,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.post(self.zvmip + self.endPoint + '/' + vpgid + '/vms', body=body, headers=self.headerwithkey, verify=False)
+        return self.httpsession.post(self.zvmip + self.endPoint + '/' + vpgid + '/vms', data=body, headers=self.headerwithkey, verify=False)
 
     def editVpgSettingsObject(self, vpgid, argbody):
         """
@@ -1127,7 +1258,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.put(self.zvmip + self.endPoint + '/' + vpgid, data=argbody, headers=self.headerwithkey, verify=False)
+        return self.httpsession.put(self.zvmip + self.endPoint + '/' + vpgid, data=argbody, headers=self.headerwithkey, verify=False)
 
     def editBasicSettingsObject(self, vpgid, body):
         """
@@ -1146,7 +1277,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.put(self.zvmip + self.endPoint + '/' + vpgid + '/basic', body=body, headers=self.headerwithkey, verify=False)
+        return self.httpsession.put(self.zvmip + self.endPoint + '/' + vpgid + '/basic', data=body, headers=self.headerwithkey, verify=False)
 
     def editBootSettingsObject(self, vpgid, body):
         """
@@ -1165,7 +1296,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.put(self.zvmip + self.endPoint + '/' + vpgid + '/bootgroup', body=body, headers=self.headerwithkey, verify=False)
+        return self.httpsession.put(self.zvmip + self.endPoint + '/' + vpgid + '/bootgroup', data=body, headers=self.headerwithkey, verify=False)
 
     def editJournalObject(self, vpgid, body):
         """
@@ -1184,7 +1315,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.put(self.zvmip + self.endPoint + '/' + vpgid + '/journal', body=body, headers=self.headerwithkey, verify=False)
+        return self.httpsession.put(self.zvmip + self.endPoint + '/' + vpgid + '/journal', data=body, headers=self.headerwithkey, verify=False)
 
     def editLtrSettings(self, vpgid, body):
         """
@@ -1203,7 +1334,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.put(self.zvmip + self.endPoint + '/' + vpgid + '/ltr', body=body, headers=self.headerwithkey, verify=False)
+        return self.httpsession.put(self.zvmip + self.endPoint + '/' + vpgid + '/ltr', data=body, headers=self.headerwithkey, verify=False)
 
     def editNetworksObject(self, vpgid, body):
         """
@@ -1222,7 +1353,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.put(self.zvmip + self.endPoint + '/' + vpgid + '/networks', body=body, headers=self.headerwithkey, verify=False)
+        return self.httpsession.put(self.zvmip + self.endPoint + '/' + vpgid + '/networks', data=body, headers=self.headerwithkey, verify=False)
 
     def editRecoveryObject(self, vpgid, body):
         """
@@ -1241,7 +1372,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.put(self.zvmip + self.endPoint + '/' + vpgid + '/recovery', body=body, headers=self.headerwithkey, verify=False)
+        return self.httpsession.put(self.zvmip + self.endPoint + '/' + vpgid + '/recovery', data=body, headers=self.headerwithkey, verify=False)
 
     def editScriptingObject(self, vpgid, body):
         """
@@ -1260,7 +1391,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.put(self.zvmip + self.endPoint + '/' + vpgid + '/scripting', body=body, headers=self.headerwithkey, verify=False)
+        return self.httpsession.put(self.zvmip + self.endPoint + '/' + vpgid + '/scripting', data=body, headers=self.headerwithkey, verify=False)
 
     def editVmSettingsObject(self, vpgid, vmid, body):
         """
@@ -1281,7 +1412,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.put(self.zvmip + self.endPoint + '/' + vpgid + '/vms/' + vmid, body=body, headers=self.headerwithkey, verify=False)
+        return self.httpsession.put(self.zvmip + self.endPoint + '/' + vpgid + '/vms/' + vmid, data=body, headers=self.headerwithkey, verify=False)
 
     def editNicSettingsObject(self, vpgid, vmid, nicid, body):
         """
@@ -1304,7 +1435,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.put(self.zvmip + self.endPoint + '/' + vpgid + '/vms/' + vmid + '/nics' + nicid, body=body, headers=self.headerwithkey, verify=False)
+        return self.httpsession.put(self.zvmip + self.endPoint + '/' + vpgid + '/vms/' + vmid + '/nics/' + nicid, data=body, headers=self.headerwithkey, verify=False)
 
     def editVolumeSettingsObject(self, vpgid, vmid, volumeid, body):
         """
@@ -1327,7 +1458,159 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.put(self.zvmip + self.endPoint + '/' + vpgid + '/vms/' + vmid + '/volumes/' + volumeid, body=body, headers=self.headerwithkey, verify=False)
+        return self.httpsession.put(self.zvmip + self.endPoint + '/' + vpgid + '/vms/' + vmid + '/volumes/' + volumeid, data=body, headers=self.headerwithkey, verify=False)
+
+    # settings section -> path of its edit endpoint under /vpgSettings/{vpgid}
+    sectionPaths = {
+        'Basic': '/basic',
+        'BootGroups': '/bootgroup',
+        'Journal': '/journal',
+        'LongTermRetention': '/ltr',
+        'Networks': '/networks',
+        'Recovery': '/recovery',
+        'Scripting': '/scripting',
+    }
+
+    @staticmethod
+    def _merge(current, desired):
+        if isinstance(current, dict) and isinstance(desired, dict):
+            merged = dict(current)
+            for key, value in desired.items():
+                merged[key] = vpgSettings._merge(current.get(key), value)
+            return merged
+        return desired
+
+    @staticmethod
+    def diffSettings(current, desired):
+        """
+        Returns the parts of desired that differ from current.
+
+        desired may be partial: {'Basic': {'RpoInSeconds': 300}} only changes the RPO and keeps the rest of the Basic
+        section. Dictionaries are merged key by key, anything else (lists included) replaces the current value. VMs
+        in desired['Vms'] are matched to the current ones by VmIdentifier; VMs that desired does not mention are left
+        as they are.
+
+        Parameters
+        ----------
+        current : dict, required
+            VPG settings as returned by getSettingsForSingleVpg
+        desired : dict, required
+            Sections (or parts of sections) to change
+
+        Returns
+        -------
+        type dict
+            section name -> complete section body, for the changed sections only, and 'Vms' -> {vmid: complete VM
+            settings} for the changed or new VMs. Empty when nothing changed.
+        """
+
+        changed = {}
+        for section, value in desired.items():
+            if section in ('VpgIdentifier', 'VpgSettingsIdentifier'):
+                continue
+            if section == 'Vms':
+                currentvms = {vm['VmIdentifier']: vm for vm in current.get('Vms') or ()}
+                vms = {}
+                for vm in value:
+                    merged = vpgSettings._merge(currentvms.get(vm['VmIdentifier']), vm)
+                    if merged != currentvms.get(vm['VmIdentifier']):
+                        vms[vm['VmIdentifier']] = merged
+                if vms:
+                    changed['Vms'] = vms
+            elif section in vpgSettings.sectionPaths:
+                merged = vpgSettings._merge(current.get(section), value)
+                if merged != current.get(section):
+                    changed[section] = merged
+            else:
+                raise ValueError(f"Unknown VPG settings section: {section}")
+        return changed
+
+    def _encode(self, body):
+        codec = getattr(self.httpsession, 'codec', None)
+        return codec.encode(body) if codec is not None else json.dumps(body)
+
+    def patchSettingsObject(self, vpgid, desired, current=None):
+        """
+        Edits an open VPG settings object, sending only the sections (and VMs) that desired changes. No request is
+        made when nothing changed.
+
+        Parameters
+        ----------
+        vpgid : str, required
+            ID of the open VPG settings object
+        desired : dict, required
+            Sections (or parts of sections) to change, see diffSettings
+        current : dict, optional
+            Current settings of the object, if already known (default: fetched with getSettingsForSingleVpg)
+
+        Returns
+        -------
+        type dict
+            section name (or VM identifier) -> requests.models.Response object, for every edit that was sent
+        """
+
+        if current is None:
+            response = self.getSettingsForSingleVpg(vpgid)
+            if not response.ok:
+                raise Exception(f"HTTP: {response.status_code} - {response.reason}, Message: {response.text}")
+            current = response.json()
+        return {key: send() for key, send in self._edits(vpgid, current, desired)}
+
+    def _edits(self, vpgid, current, desired):
+        """
+        Returns (section name or VM identifier, callable sending the edit) for every change desired makes to current.
+        """
+
+        edits = []
+        currentvms = {vm['VmIdentifier'] for vm in current.get('Vms') or ()}
+        for section, body in self.diffSettings(current, desired).items():
+            if section != 'Vms':
+                url = self.zvmip + self.endPoint + '/' + vpgid + self.sectionPaths[section]
+                edits.append((section, lambda url=url, body=body: self.httpsession.put(
+                    url, data=self._encode(body), headers=self.headerwithkey, verify=False)))
+                continue
+            for vmid, vm in body.items():
+                if vmid in currentvms:
+                    edits.append((vmid, lambda vmid=vmid, vm=vm: self.editVmSettingsObject(vpgid, vmid,
+                                                                                           self._encode(vm))))
+                else:
+                    edits.append((vmid, lambda vm=vm: self.addVmsToSettingObject(vpgid, self._encode(vm))))
+        return edits
+
+    def editVpg(self, vpgid, desired):
+        """
+        Changes an existing VPG: opens a settings object for it, sends only the sections that desired changes and
+        commits. When nothing changed, the settings object is discarded without committing.
+
+        Parameters
+        ----------
+        vpgid : str, required
+            ID of the existing VPG
+        desired : dict, required
+            Sections (or parts of sections) to change, see diffSettings
+
+        Returns
+        -------
+        type requests.models.Response object
+            the commit response (its body is the task identifier), or None when nothing changed
+        """
+
+        response = self.createNewVpgSettingsObject(self._encode({'VpgIdentifier': vpgid}))
+        if not response.ok:
+            raise Exception(f"HTTP: {response.status_code} - {response.reason}, Message: {response.text}")
+        settingsid = response.json()
+        try:
+            responses = self.patchSettingsObject(settingsid, desired)
+            for response in responses.values():
+                if not response.ok:
+                    raise Exception(f"HTTP: {response.status_code} - {response.reason}, Message: {response.text}")
+        except Exception:
+            self.deleteSettingsObject(settingsid)
+            raise
+        if not responses:
+            self.deleteSettingsObject(settingsid)
+            return None
+        return self.commitSettingsObject(settingsid)
 
     def deleteSettingsObject(self, vpgid):
         """
@@ -1343,7 +1626,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.delete(self.zvmip + self.endPoint + '/' + vpgid, headers=self.headerwithkey, verify=False)
+        return self.httpsession.delete(self.zvmip + self.endPoint + '/' + vpgid, headers=self.headerwithkey, verify=False)
 
     def deleteBasicSettingsObject(self, vpgid):
         """
@@ -1359,7 +1642,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.delete(self.zvmip + self.endPoint + '/' + vpgid + '/basic', headers=self.headerwithkey, verify=False)
+        return self.httpsession.delete(self.zvmip + self.endPoint + '/' + vpgid + '/basic', headers=self.headerwithkey, verify=False)
 
     def deleteBootSettingsObject(self, vpgid):
         """
@@ -1375,7 +1658,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.delete(self.zvmip + self.endPoint + '/' + vpgid + '/bootgroup', headers=self.headerwithkey, verify=False)
+        return self.httpsession.delete(self.zvmip + self.endPoint + '/' + vpgid + '/bootgroup', headers=self.headerwithkey, verify=False)
 
     def deleteJournalSettingsObject(self, vpgid):
         """
@@ -1391,7 +1674,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.delete(self.zvmip + self.endPoint + '/' + vpgid + '/journal', headers=self.headerwithkey, verify=False)
+        return self.httpsession.delete(self.zvmip + self.endPoint + '/' + vpgid + '/journal', headers=self.headerwithkey, verify=False)
 
     def deleteLTRSettingsObject(self, vpgid):
         """
@@ -1407,7 +1690,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.delete(self.zvmip + self.endPoint + '/' + vpgid + '/ltr', headers=self.headerwithkey, verify=False)
+        return self.httpsession.delete(self.zvmip + self.endPoint + '/' + vpgid + '/ltr', headers=self.headerwithkey, verify=False)
 
     def deleteNetworkSettingsObject(self, vpgid):
         """
@@ -1423,7 +1706,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.delete(self.zvmip + self.endPoint + '/' + vpgid + '/networks', headers=self.headerwithkey, verify=False)
+        return self.httpsession.delete(self.zvmip + self.endPoint + '/' + vpgid + '/networks', headers=self.headerwithkey, verify=False)
 
     def deleteRecoverySettingsObject(self, vpgid):
         """
@@ -1439,7 +1722,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.delete(self.zvmip + self.endPoint + '/' + vpgid + '/recovery', headers=self.headerwithkey, verify=False)
+        return self.httpsession.delete(self.zvmip + self.endPoint + '/' + vpgid + '/recovery', headers=self.headerwithkey, verify=False)
 
     def deleteScriptSettingsObject(self, vpgid):
         """
@@ -1455,7 +1738,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.delete(self.zvmip + self.endPoint + '/' + vpgid + '/scripting', headers=self.headerwithkey, verify=False)
+        return self.httpsession.delete(self.zvmip + self.endPoint + '/' + vpgid + '/scripting', headers=self.headerwithkey, verify=False)
 
     def deleteVMSettingsFromAVpg(self, vpgid, vmid):
         """
@@ -1473,7 +1756,7 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.delete(self.zvmip + self.endPoint + '/' + vpgid + '/vms/' + vmid, headers=self.headerwithkey, verify=False)
+        return self.httpsession.delete(self.zvmip + self.endPoint + '/' + vpgid + '/vms/' + vmid, headers=self.headerwithkey, verify=False)
 
     def deleteNicSettingsObject(self, vpgid, vmid, nicid):
         """
@@ -1493,4 +1776,4 @@ class vpgSettings():
         type requests.models.Response object
         """
 
-        return requests.delete(self.zvmip + self.endPoint + '/' + vpgid + '/vms/' + vmid + '/nics/' + nicid, headers=self.headerwithkey, verify=False)
+        return self.httpsession.delete(self.zvmip + self.endPoint + '/' + vpgid + '/vms/' + vmid + '/nics/' + nicid, headers=self.headerwithkey, verify=False)
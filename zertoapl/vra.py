@@ -5,7 +5,6 @@ a vra
 """
 
 import json 
-import requests
 #from zerto_auth import testUrl, testHeaders
 
 class vra():
@@ -31,6 +30,9 @@ class vra():
     vra_dict: dict
         dictionary object for VRA inputs 
 
+    httpsession : requests.Session
+        the session (and connection pool) used for every API call
+
     Methods
     -------
     infoAllVRAs()
@@ -48,7 +50,7 @@ class vra():
     """
     endPoint = '/vras'
     
-    def __init__(self, zvmip, headerwithkey):
+    def __init__(self, zvmip, headerwithkey, httpsession=None):
         """
         Parameters
         ----------
@@ -61,10 +63,17 @@ class vra():
                     'Content-Type': 'application/json'
                     'x-zerto-session': str-type containing valid session key generated with zerto_auth.py
                 }
+        httpsession : requests.Session, optional
+            A (pooled) session shared with other classes, such as the zertoSession created by the zertoapl class. A
+            private session is created when none is given.
         """
 
         self.zvmurl = 'https://' + zvmip + ':9669/v1'
         self.headerwithkey = headerwithkey 
+        if httpsession is None:
+            import requests
+            httpsession = requests.Session()
+        self.httpsession = httpsession
        
     def infoAllVRAs(self):
         """
@@ -75,7 +84,7 @@ class vra():
         type requests.models.Response object
         """
              
-        return requests.get(self.zvmurl + self.endPoint, headers=self.headerwithkey, verify=False, timeout=10)
+        return self.httpsession.get(self.zvmurl + self.endPoint, headers=self.headerwithkey, verify=False, timeout=10)
  
     def upgradeGroupVRAs(self, vra_id):
         """
@@ -99,7 +108,7 @@ class vra():
         -------
         type requests.models.Response object
         """    
-        return requests.post(self.zvmurl + self.endPoint + "/upgrade", headers=self.headerwithkey, data=vra_id, verify=False, timeout=10)
+        return self.httpsession.post(self.zvmurl + self.endPoint + "/upgrade", headers=self.headerwithkey, data=vra_id, verify=False, timeout=10)
   
     def upgradeVRA(self, vra_id):
         """
@@ -114,7 +123,7 @@ class vra():
         -------
         type requests.models.Response object
         """        
-        return requests.post(self.zvmurl + self.endPoint +"/" + vra_id + "/upgrade", headers=self.headerwithkey, verify=False, timeout=10)
+        return self.httpsession.post(self.zvmurl + self.endPoint +"/" + vra_id + "/upgrade", headers=self.headerwithkey, verify=False, timeout=10)
 
     def installVRA(self, vra_dict):
         """
@@ -144,7 +153,7 @@ class vra():
         -------
         type requests.models.Response object
         """ 
-        return requests.post(self.zvmurl + self.endPoint, headers=self.headerwithkey, data=vra_dict, verify=False, timeout=10)
+        return self.httpsession.post(self.zvmurl + self.endPoint, headers=self.headerwithkey, data=vra_dict, verify=False, timeout=10)
 
     def editVRA(self, vra_dict, vra_id):
         """
@@ -173,7 +182,7 @@ class vra():
         type requests.models.Response object
         """         
 
-        return requests.put(self.zvmurl + self.endPoint +"/" + vra_id, headers=self.headerwithkey, data=vra_dict, verify=False, timeout=10)
+        return self.httpsession.put(self.zvmurl + self.endPoint +"/" + vra_id, headers=self.headerwithkey, data=vra_dict, verify=False, timeout=10)
     
     def delVRA(self, vra_id):
         """
@@ -188,12 +197,12 @@ class vra():
         -------
         type requests.models.Response object
         """   
-        return requests.delete(self.zvmurl + self.endPoint +"/" + vra_id, headers=self.headerwithkey, verify=False, timeout=10)
+        return self.httpsession.delete(self.zvmurl + self.endPoint +"/" + vra_id, headers=self.headerwithkey, verify=False, timeout=10)
 
 
 class vraObject():
 
-    def __init__(self, zvmip, headerwithkey, datastorename=None, hostname=None, networkname=None, ram=None, ip=None, subnet=None, gateway=None, hostpass=False, pubKey=True):
+    def __init__(self, zvmip, headerwithkey, datastorename=None, hostname=None, networkname=None, ram=None, ip=None, subnet=None, gateway=None, hostpass=False, pubKey=True, httpsession=None):
         """
         Parameters
         ----------
@@ -206,10 +215,16 @@ class vraObject():
                     'Content-Type': 'application/json'
                     'x-zerto-session': str-type containing valid session key generated with zerto_auth.py
                 }
+        httpsession : requests.Session, optional
+            A (pooled) session shared with other classes. A private session is created when none is given.
         """
 
         self.zvmurl = 'https://' + zvmip + ':9669/v1'
         self.headerwithkey = headerwithkey 
+        if httpsession is None:
+            import requests
+            httpsession = requests.Session()
+        self.httpsession = httpsession
         self.datastore = datastorename
         self.host = hostname
         self.network = networkname
@@ -0,0 +1,200 @@
+"""
+The zerto_alerts.py module contains the alertWatcher class, which turns successive zvm.infoAllAlerts snapshots into a
+feed of raised, changed and cleared alerts, and dismisses or undismisses many alerts concurrently.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def alertIdentifier(alert):
+    """
+    Returns the identifier of an alert as returned by zvm.infoAllAlerts. Depending on the ZVM version it is found in
+    AlertIdentifier or in Link.identifier.
+    """
+
+    return alert.get('AlertIdentifier') or (alert.get('Link') or {}).get('identifier')
+
+
+class alertChange:
+    """
+    The alertChange class describes one difference between two alert snapshots.
+
+    ...
+
+    Attributes
+    ----------
+    kind : str
+        'raised' (new alert), 'changed' (an alert whose fields changed, including being dismissed) or 'cleared'
+        (an alert that is no longer reported)
+    alertid : str
+        identifier of the alert
+    alert : dict
+        the alert as now reported, or the last version seen for a cleared alert
+    previous : dict
+        the alert as reported by the previous snapshot, or None for a raised alert
+    """
+
+    __slots__ = ('kind', 'alertid', 'alert', 'previous')
+
+    def __init__(self, kind, alertid, alert, previous=None):
+        self.kind = kind
+        self.alertid = alertid
+        self.alert = alert
+        self.previous = previous
+
+    def __repr__(self):
+        return f"alertChange(kind={self.kind!r}, alertid={self.alertid!r})"
+
+
+class alertWatcher:
+    """
+    The alertWatcher class keeps the previous alert snapshot keyed by alert identifier and reports only what changed.
+
+    ...
+
+    Attributes
+    ----------
+    snapshot : dict
+        alert identifier -> alert, as returned by the latest poll
+
+    Methods
+    -------
+    poll()
+        Fetches the alerts and returns the list of alertChange since the previous poll.
+    follow(interval=10, stop=None)
+        Generator yielding alertChange objects as alerts are raised, changed or cleared.
+    select(where=None, **match)
+        Returns the alerts of the snapshot matching a predicate and/or field values.
+    dismiss(where=None, max_workers=8, **match)
+        Dismisses the matching alerts concurrently.
+    undismiss(where=None, max_workers=8, **match)
+        Undismisses the matching alerts concurrently.
+    """
+
+    def __init__(self, zvmobj, report_existing=True, key=alertIdentifier):
+        """
+        Parameters
+        ----------
+        zvmobj : zvm, required
+            zvm instance used to fetch and dismiss alerts
+        report_existing : bool, optional
+            Report the alerts present at the first poll as raised (default: True). When False, the first poll only
+            records the snapshot.
+        key : callable, optional
+            Returns the identifier of an alert (default: alertIdentifier)
+        """
+
+        self.zvm = zvmobj
+        self.report_existing = report_existing
+        self.key = key
+        self.snapshot = None
+
+    def poll(self):
+        """
+        Returns
+        -------
+        type list of alertChange: raised alerts first, then changed, then cleared
+        """
+
+        response = self.zvm.infoAllAlerts()
+        if not response.ok:
+            raise Exception(f"HTTP: {response.status_code} - {response.reason}, Message: {response.text}")
+        current = {self.key(alert): alert for alert in response.json()}
+        previous, self.snapshot = self.snapshot, current
+        if previous is None:
+            if not self.report_existing:
+                return []
+            previous = {}
+
+        raised, changed = [], []
+        for alertid, alert in current.items():
+            before = previous.get(alertid)
+            if before is None:
+                raised.append(alertChange('raised', alertid, alert))
+            elif before != alert:
+                changed.append(alertChange('changed', alertid, alert, before))
+        cleared = [alertChange('cleared', alertid, alert, alert)
+                   for alertid, alert in previous.items() if alertid not in current]
+        return raised + changed + cleared
+
+    def follow(self, interval=10, stop=None):
+        """
+        Yields alertChange objects as they occur, polling the ZVM every interval seconds.
+
+        Parameters
+        ----------
+        interval : float, optional
+            Seconds between two polls (default: 10)
+        stop : threading.Event, optional
+            The generator returns once this event is set
+        """
+
+        while stop is None or not stop.is_set():
+            for change in self.poll():
+                yield change
+            if stop is not None:
+                stop.wait(interval)
+            else:
+                time.sleep(interval)
+
+    def select(self, where=None, **match):
+        """
+        Parameters
+        ----------
+        where : callable, optional
+            Receives an alert and returns True to select it
+        **match
+            Alert fields and the values they must have, for example Level='Warning' or HelpIdentifier='VPG0009'
+
+        Returns
+        -------
+        type list of alert dicts from the latest snapshot (a poll is made first if there is none)
+        """
+
+        if self.snapshot is None:
+            self.poll()
+        return [alert for alert in self.snapshot.values()
+                if all(alert.get(field) == value for field, value in match.items())
+                and (where is None or where(alert))]
+
+    def _bulk(self, action, alerts, max_workers):
+        identifiers = [self.key(alert) for alert in alerts]
+        results = {}
+        if not identifiers:
+            return results
+
+        def call(alertid):
+            try:
+                return alertid, action(alertid)
+            except Exception as error:
+                return alertid, error
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(identifiers))) as executor:
+            for alertid, result in executor.map(call, identifiers):
+                results[alertid] = result
+        return results
+
+    def dismiss(self, where=None, max_workers=8, **match):
+        """
+        Dismisses every matching alert that is not dismissed yet, max_workers at a time.
+
+        Returns
+        -------
+        type dict: alert identifier -> requests.models.Response object, or the exception raised for that alert
+        """
+
+        alerts = [alert for alert in self.select(where, **match) if not alert.get('IsDismissed')]
+        return self._bulk(self.zvm.dismissAlert, alerts, max_workers)
+
+    def undismiss(self, where=None, max_workers=8, **match):
+        """
+        Undismisses every matching alert that is dismissed, max_workers at a time.
+
+        Returns
+        -------
+        type dict: alert identifier -> requests.models.Response object, or the exception raised for that alert
+        """
+
+        alerts = [alert for alert in self.select(where, **match) if alert.get('IsDismissed')]
+        return self._bulk(self.zvm.undismissAlert, alerts, max_workers)
@@ -0,0 +1,404 @@
+"""
+The zerto_async.py module contains asyncio counterparts of the zvm, vpgs, vpgSettings and vra classes as well as of
+zerto_auth.login. Calls are made through a pooled aiohttp session, so a single event loop can keep hundreds of API
+calls to one or many ZVMs/ZCAs in flight at once.
+
+Every method keeps the name of its synchronous counterpart but must be awaited, and returns the parsed payload (the
+decoded JSON body, the body text when it is not JSON, or None for an empty body) instead of a requests Response. A
+failed call raises an Exception carrying the HTTP status, mirroring zerto_auth.login.
+
+aiohttp is an optional dependency: pip install zertoapl[async]
+"""
+
+import asyncio
+import json
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from . import zerto_auth
+from .vpg import vpgs, vpgSettings
+from .vra import vra
+from .zerto_throttle import governorFor
+from .zvm import zvm
+
+
+class asyncZertoSession:
+    """
+    The asyncZertoSession class is a connection-pooled aiohttp session exposing the get/post/put/delete signature used
+    by the synchronous classes.
+
+    ...
+
+    Attributes
+    ----------
+    pool_size : int
+        the maximum number of connections kept open across all ZVM/ZCA hosts
+
+    keep_alive : bool
+        whether connections are kept open between requests
+
+    renewer : coroutine function
+        awaited with the rejected token when the ZVM answers a request with a 401; must return fresh login headers (see
+        login). None disables automatic renewal.
+
+    retry : retryPolicy
+        the policy applied to transient failures (see zerto_retry). None disables retries.
+
+    codec : stdlibCodec or orjsonCodec
+        decodes response payloads (see zerto_codec). None uses the standard library.
+    """
+
+    def __init__(self, pool_size=100, keep_alive=True, renewer=None, retry=None, codec=None):
+        """
+        Parameters
+        ----------
+        pool_size : int, optional
+            The maximum number of simultaneous connections (default: 100). This bounds how many calls are actually on
+            the wire at once; further calls wait for a free connection.
+        keep_alive : bool, optional
+            Keep connections open between requests (default: True).
+        renewer : coroutine function, optional
+            Returns fresh login headers when the current token has expired.
+        retry : retryPolicy, optional
+            Retries transient failures with backoff. Calls are not retried when omitted.
+        codec : stdlibCodec or orjsonCodec, optional
+            JSON codec for response payloads, for example zerto_codec.defaultCodec().
+        """
+
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for the asyncio client: pip install zertoapl[async]")
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.renewer = renewer
+        self.retry = retry
+        self.codec = codec
+        self._session = None
+        self._renewLock = None
+
+    @property
+    def session(self):
+        """
+        The underlying aiohttp.ClientSession, created on first use so that it binds to the running event loop.
+        """
+
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, force_close=not self.keep_alive)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def request(self, method, url, headers=None, data=None, params=None, verify=True, timeout=None, auth=None,
+                      stream=False):
+        """
+        Sends a single request and returns its parsed payload.
+
+        Parameters
+        ----------
+        method : str, required
+            HTTP verb
+        url : str, required
+            Full URL of the API endpoint
+        headers : dict, optional
+            Request headers, usually the dict returned by login
+        data : str or bytes, optional
+            Request body
+        params : dict, optional
+            Query string parameters
+        verify : bool, optional
+            Verify the TLS certificate of the ZVM/ZCA (default: True)
+        timeout : float, optional
+            Total timeout in seconds for the call
+        auth : tuple, optional
+            (username, password) for HTTP basic authentication
+        stream : bool, optional
+            Accepted for compatibility with requests; must be False, the payload is always read in full
+
+        Returns
+        -------
+        type dict, list, str or None
+        """
+
+        rejectStream(stream)
+        if auth is not None and not isinstance(auth, aiohttp.BasicAuth):
+            auth = aiohttp.BasicAuth(*auth)
+        attempt = 0
+        while True:
+            if self.retry is not None:
+                self.retry.count('attempts')
+            try:
+                status, reason, responseHeaders, body = await self.sendAuthenticated(method, url, headers, data, params,
+                                                                                     verify, timeout, auth)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if self.retry is None or not self.retry.shouldRetry(method, attempt):
+                    raise
+                await asyncio.sleep(self.retry.delay(attempt))
+            else:
+                if self.retry is None or not self.retry.shouldRetry(method, attempt, status):
+                    break
+                await asyncio.sleep(self.retry.delay(attempt, responseHeaders))
+            attempt += 1
+        if status >= 400:
+            raise Exception(f"HTTP: {status} - {reason}, Message: {body.decode(errors='replace')}")
+        return parsePayload(body, self.codec)
+
+    async def sendAuthenticated(self, method, url, headers, data, params, verify, timeout, auth):
+        """
+        Sends a single request, renewing the token and replaying the request once if the ZVM answers with a 401.
+        Returns the status, reason, headers and raw body of the response.
+        """
+
+        for attempt in range(2):
+            sent = headers.get('x-zerto-session') if headers is not None else None
+            result = await self.sendGoverned(method, url, headers, data, params, verify, timeout, auth)
+            if result[0] == 401 and attempt == 0 and self.renewer is not None and sent is not None:
+                await self.renewToken(headers, sent)
+                continue
+            return result
+
+    async def sendGoverned(self, method, url, headers, data, params, verify, timeout, auth):
+        """
+        Sends a single request within the limits of the zvmGovernor registered for the target host, if any (see
+        zerto_throttle.configureGovernor).
+        """
+
+        governor = governorFor(url)
+        if governor is None:
+            return await self.exchange(method, url, headers, data, params, verify, timeout, auth)
+        async with governor.asyncSlot():
+            return await self.exchange(method, url, headers, data, params, verify, timeout, auth)
+
+    async def exchange(self, method, url, headers, data, params, verify, timeout, auth):
+        async with self.session.request(method, url, headers=headers, data=data, params=params,
+                                        ssl=None if verify else False, auth=auth,
+                                        timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            return response.status, response.reason, response.headers, await response.read()
+
+    async def renewToken(self, headers, stale):
+        """
+        Replaces the x-zerto-session token in headers (in place) with a freshly issued one; concurrent callers that hit
+        a 401 with the same stale token trigger a single login.
+        """
+
+        if self._renewLock is None:
+            self._renewLock = asyncio.Lock()
+        async with self._renewLock:
+            if headers.get('x-zerto-session') == stale:
+                headers['x-zerto-session'] = (await self.renewer(stale))['x-zerto-session']
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+def rejectStream(stream):
+    if stream:
+        raise ValueError("stream=True is only supported by the requests-based classes")
+
+
+def parsePayload(body, codec=None):
+    """
+    Decodes a response body: JSON when possible (with codec, if given), text otherwise, None when empty.
+    """
+
+    if not body:
+        return None
+    try:
+        return codec.loads(body) if codec is not None else json.loads(body)
+    except ValueError:
+        return body.decode(errors='replace')
+
+
+async def login(zvm_ip, zvm_user, zvm_password, verbose=False, httpsession=None, tokenstore=None,
+                rejected_token=None, token_ttl=zerto_auth.DEFAULT_TOKEN_TTL):
+    """The asyncio counterpart of zerto_auth.login. Returns a dict-type containing the valid headers, including the
+    x-zerto-session token, for future API requests.
+
+    An asyncZertoSession can be passed as httpsession so the login shares the pool used by the API calls; otherwise a
+    temporary session is opened and closed for the login alone. tokenstore, rejected_token and token_ttl behave as in
+    zerto_auth.login.
+    """
+
+    headers = {
+        'Accept': 'application/json',
+        'Content-Type': 'application/json'
+        }
+    key = zerto_auth.tokenKey(zvm_ip, zvm_user, zvm_password) if tokenstore is not None else None
+    if key is not None:
+        cached = tokenstore.get(key)
+        if cached and cached != rejected_token:
+            headers['x-zerto-session'] = cached
+            return headers
+
+    sessionUrl = 'https://' + zvm_ip + ':9669/v1/session/add'
+    if verbose:
+        print("Getting API token for " + zvm_ip + "...")
+    auth_info = "{\r\n\t\"AuthenticationMethod\":1\r\n}"
+
+    owned = httpsession is None
+    if owned:
+        httpsession = asyncZertoSession(pool_size=1)
+    try:
+        async with httpsession.session.post(sessionUrl, headers=headers, data=auth_info, ssl=False,
+                                            timeout=aiohttp.ClientTimeout(total=10),
+                                            auth=aiohttp.BasicAuth(zvm_user, zvm_password)) as response:
+            text = await response.text()
+            if response.status >= 400:
+                raise Exception(f"HTTP: {response.status} - {response.reason}, Message: {text}")
+            auth_token = response.headers['x-zerto-session']
+    finally:
+        if owned:
+            await httpsession.close()
+    headers['x-zerto-session'] = auth_token
+    if tokenstore is not None:
+        tokenstore.put(key, auth_token, token_ttl)
+    if verbose:
+        print("Api Token: " + auth_token)
+        print(headers)
+    return headers
+
+
+class asyncZvm(zvm):
+    """
+    The asyncio counterpart of the zvm class. All zvm methods are available under the same names and must be awaited.
+    """
+
+    def __init__(self, zvmip, headerwithkey, httpsession):
+        """
+        Parameters
+        ----------
+        zvmip : str
+            The IP of the ZVM or ZCA
+        headerwithkey : dict
+            The headers returned by login
+        httpsession : asyncZertoSession
+            The pooled session shared with the other async classes
+        """
+
+        super().__init__(zvmip, headerwithkey, httpsession=httpsession)
+
+    async def getDatastoreGuid(self, datastorename):
+        for datastore in await self.datastoreInfo():
+            if datastore['DatastoreName'] == datastorename:
+                return datastore['DatastoreIdentifier']
+
+    async def getLocalSiteGuid(self):
+        return (await self.getLocalSiteInfo())['SiteIdentifier']
+
+    async def getHostGuid(self, hostname):
+        for host in await self.getHostsAtSite(await self.getLocalSiteGuid()):
+            if host['VirtualizationHostName'] == hostname:
+                return host['HostIdentifier']
+
+    async def getNetworkGuid(self, networkname):
+        for network in await self.getNetworksAtSite(await self.getLocalSiteGuid()):
+            if network['VirtualizationNetworkName'] == networkname:
+                return network['NetworkIdentifier']
+
+    def allEvents(self, stream=False):
+        rejectStream(stream)
+        return super().allEvents()
+
+    def getAllVolumes(self, stream=False):
+        rejectStream(stream)
+        return super().getAllVolumes()
+
+
+class asyncVpgs(vpgs):
+    """
+    The asyncio counterpart of the vpgs class. All vpgs methods are available under the same names and must be
+    awaited.
+    """
+
+    def __init__(self, zvmip, headerwithkey, httpsession, vpgid=None):
+        super().__init__(zvmip, headerwithkey, vpgid, httpsession=httpsession)
+
+    def getCheckpointsForVpg(self, vpgid, stream=False, startdate=None, enddate=None):
+        rejectStream(stream)
+        return super().getCheckpointsForVpg(vpgid, startdate=startdate, enddate=enddate)
+
+
+class asyncVpgSettings(vpgSettings):
+    """
+    The asyncio counterpart of the vpgSettings class. All vpgSettings methods are available under the same names and
+    must be awaited.
+    """
+
+    def __init__(self, zvmip, headerwithkey, httpsession, vpgid=None, vmid=None, nicid=None, volumeid=None):
+        super().__init__(zvmip, headerwithkey, vpgid, vmid, nicid, volumeid, httpsession=httpsession)
+
+    def getSettingsForVpgs(self, stream=False):
+        rejectStream(stream)
+        return super().getSettingsForVpgs()
+
+    async def getSettingsTree(self, vpgid, max_concurrent=8):
+        return (await self.getSettingsTrees([vpgid], max_concurrent))[vpgid]
+
+    async def getSettingsTrees(self, vpgids, max_concurrent=16):
+        base = self.zvmip + self.endPoint + '/'
+        semaphore = asyncio.Semaphore(max(max_concurrent, 1))
+
+        async def fetch(url):
+            async with semaphore:
+                return await self.httpsession.get(url, headers=self.headerwithkey, verify=False)
+
+        async def vmTree(vpgid, vm):
+            url = base + vpgid + '/vms/' + vm['VmIdentifier']
+            vm['Nics'], vm['Volumes'] = await asyncio.gather(fetch(url + '/nics'), fetch(url + '/volumes'))
+            return vm
+
+        async def vmTrees(vpgid):
+            return list(await asyncio.gather(*(vmTree(vpgid, vm) for vm in await fetch(base + vpgid + '/vms'))))
+
+        async def tree(vpgid):
+            sections = list(self.sectionPaths)
+            results = await asyncio.gather(*(fetch(base + vpgid + self.sectionPaths[section]) for section in sections),
+                                           vmTrees(vpgid))
+            return dict(zip(sections + ['Vms'], results))
+
+        return dict(zip(vpgids, await asyncio.gather(*(tree(vpgid) for vpgid in vpgids))))
+
+    async def patchSettingsObject(self, vpgid, desired, current=None):
+        if current is None:
+            current = await self.getSettingsForSingleVpg(vpgid)
+        return {key: await send() for key, send in self._edits(vpgid, current, desired)}
+
+    async def editVpg(self, vpgid, desired):
+        settingsid = await self.createNewVpgSettingsObject(self._encode({'VpgIdentifier': vpgid}))
+        try:
+            responses = await self.patchSettingsObject(settingsid, desired)
+        except Exception:
+            await self.deleteSettingsObject(settingsid)
+            raise
+        if not responses:
+            await self.deleteSettingsObject(settingsid)
+            return None
+        return await self.commitSettingsObject(settingsid)
+
+
+class asyncVra(vra):
+    """
+    The asyncio counterpart of the vra class. All vra methods are available under the same names and must be awaited.
+    """
+
+    def __init__(self, zvmip, headerwithkey, httpsession):
+        super().__init__(zvmip, headerwithkey, httpsession=httpsession)
@@ -1,32 +1,205 @@
 """
 The zerto_auth.py module is the main authenticator script that must be run before any other API calls are accepted
 by the target Zerto Virtual Manager or Zerto Cloud Appliance.
+
+API tokens can be kept in a token store (memoryTokenStore or fileTokenStore) so that later logins, in the same process
+or in another one, reuse a still-valid x-zerto-session token instead of posting to /v1/session/add again.
 """
 
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
 import requests
 from requests.auth import HTTPBasicAuth
 
-def login(zvm_ip, zvm_user, zvm_password, verbose=False):
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+# The ZVM expires an API session after 30 minutes without activity; stay safely below that.
+DEFAULT_TOKEN_TTL = 25 * 60
+
+
+class memoryTokenStore:
+    """
+    Keeps API tokens in memory, shared by every login in the current process.
+
+    Methods
+    -------
+    get(key)
+        Returns the stored token for key, or None when there is none or it has expired.
+    put(key, token, ttl)
+        Stores token for key for ttl seconds.
+    discard(key)
+        Forgets the token stored for key.
+    """
+
+    def __init__(self):
+        self._tokens = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._tokens.get(key)
+            if entry is None or entry['expires'] <= time.time():
+                return None
+            return entry['token']
+
+    def put(self, key, token, ttl=DEFAULT_TOKEN_TTL):
+        with self._lock:
+            self._tokens[key] = {'token': token, 'expires': time.time() + ttl}
+
+    def discard(self, key):
+        with self._lock:
+            self._tokens.pop(key, None)
+
+
+class fileTokenStore:
+    """
+    Keeps API tokens in a JSON file so that separate processes (for example short-lived cron scripts) can share them.
+    Every read-modify-write of the file happens under an exclusive lock on a sidecar ".lock" file, and the file is
+    created readable by the owner only.
+
+    Methods
+    -------
+    get(key)
+        Returns the stored token for key, or None when there is none or it has expired.
+    put(key, token, ttl)
+        Stores token for key for ttl seconds.
+    discard(key)
+        Forgets the token stored for key.
+    """
+
+    def __init__(self, path):
+        """
+        Parameters
+        ----------
+        path : str, required
+            Location of the token file. "~" is expanded and missing directories are created.
+        """
+
+        self.path = os.path.expanduser(path)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            fd = os.open(self.path + '.lock', os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                else:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+                os.close(fd)
+
+    def _read(self):
+        try:
+            with open(self.path) as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, tokens):
+        now = time.time()
+        tokens = {key: entry for key, entry in tokens.items() if entry['expires'] > now}
+        temp = self.path + '.tmp'
+        fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as fh:
+            json.dump(tokens, fh)
+        os.replace(temp, self.path)
+
+    def get(self, key):
+        with self._locked():
+            entry = self._read().get(key)
+        if entry is None or entry['expires'] <= time.time():
+            return None
+        return entry['token']
+
+    def put(self, key, token, ttl=DEFAULT_TOKEN_TTL):
+        with self._locked():
+            tokens = self._read()
+            tokens[key] = {'token': token, 'expires': time.time() + ttl}
+            self._write(tokens)
+
+    def discard(self, key):
+        with self._locked():
+            tokens = self._read()
+            if tokens.pop(key, None) is not None:
+                self._write(tokens)
+
+
+defaultTokenStore = memoryTokenStore()
+
+
+def tokenKey(zvm_ip, zvm_user, zvm_password):
+    """
+    Returns the key a token is stored under. It includes a salted, stretched hash of the password, so that a login
+    with a wrong password never finds the token issued for the right one, and the token file does not reveal the
+    password.
+    """
+
+    account = zvm_user + '@' + zvm_ip
+    digest = hashlib.pbkdf2_hmac('sha256', zvm_password.encode(), ('zertoapl:' + account).encode(), 100000)
+    return account + '#' + digest.hex()[:32]
+
+
+def login(zvm_ip, zvm_user, zvm_password, verbose=False, httpsession=None, tokenstore=None, rejected_token=None,
+          token_ttl=DEFAULT_TOKEN_TTL):
     """The login function returns a valid header, including an API token, that can then be passed to newly instansiated
     classes from other modules.
 
     The login function accepts three str-type inputs (IP addresss of ZVM/ZCA, username of ZVM/ZCA, and password of ZVM/
-    ZCA) and returns a dict-type containing the valid headers for future API requests.
+    ZCA) and returns a dict-type containing the valid headers for future API requests. An optional requests.Session
+    (httpsession) can be passed so the login reuses the same connection pool as the subsequent API calls.
+
+    When a tokenstore (memoryTokenStore or fileTokenStore) is given, a still-valid token stored for the same user,
+    password and ZVM/ZCA is returned without contacting the ZVM, and newly issued tokens are stored for token_ttl
+    seconds. Pass the token the ZVM just rejected as rejected_token to renew it: the stored token is then only reused if
+    another process has already replaced it.
     """
-    sessionUrl = 'https://' + zvm_ip + ':9669/v1/session/add'
-    if verbose:
-        print("Getting API token for " + zvm_ip + "...")
-    auth_info = "{\r\n\t\"AuthenticationMethod\":1\r\n}"
     headers = {
         'Accept': 'application/json',
         'Content-Type': 'application/json'
         }
+    key = tokenKey(zvm_ip, zvm_user, zvm_password) if tokenstore is not None else None
+    if key is not None:
+        cached = tokenstore.get(key)
+        if cached and cached != rejected_token:
+            if verbose:
+                print("Reusing stored API token for " + zvm_ip)
+            headers['x-zerto-session'] = cached
+            return headers
+
+    sessionUrl = 'https://' + zvm_ip + ':9669/v1/session/add'
+    if verbose:
+        print("Getting API token for " + zvm_ip + "...")
+    auth_info = "{\r\n\t\"AuthenticationMethod\":1\r\n}"
 
-    response = requests.post(sessionUrl, headers=headers, data=auth_info, verify=False, timeout=10, auth=HTTPBasicAuth(zvm_user,
-                                                                                                                    zvm_password))
+    if httpsession is None:
+        httpsession = requests
+    response = httpsession.post(sessionUrl, headers=headers, data=auth_info, verify=False, timeout=10, auth=HTTPBasicAuth(zvm_user,
+                                                                                                                       zvm_password))
     if response.ok:
         auth_token = response.headers['x-zerto-session']
         headers['x-zerto-session'] = auth_token
+        if tokenstore is not None:
+            tokenstore.put(key, auth_token, token_ttl)
         if verbose:
             print("Api Token: " + auth_token)
             print(headers)
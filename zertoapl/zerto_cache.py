@@ -0,0 +1,209 @@
+"""
+The zerto_cache.py module contains the responseCache class used by zertoSession to serve endpoints whose data almost
+never changes (valid-value enumerations, local site identity, license) from memory, and optionally from disk across
+runs, instead of asking the ZVM again on every call.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import requests
+from requests.models import RequestEncodingMixin
+from requests.structures import CaseInsensitiveDict
+
+# Seconds each endpoint (path below /v1) stays cached. Endpoints not listed here are never cached.
+DEFAULT_TTLS = {
+    '/alerts/entities': 24 * 3600,
+    '/alerts/helpidentifiers': 24 * 3600,
+    '/alerts/levels': 24 * 3600,
+    '/events/categories': 24 * 3600,
+    '/events/entities': 24 * 3600,
+    '/events/types': 24 * 3600,
+    '/tasks/types': 24 * 3600,
+    '/vpgs/entitytypes': 24 * 3600,
+    '/vpgs/failovercommitpolicies': 24 * 3600,
+    '/vpgs/failovershutdownpolicies': 24 * 3600,
+    '/vpgs/priorities': 24 * 3600,
+    '/vpgs/retentionpolicies': 24 * 3600,
+    '/vpgs/statuses': 24 * 3600,
+    '/vpgs/substatuses': 24 * 3600,
+    '/localsite': 3600,
+    '/license': 600,
+}
+
+
+def queryKey(params):
+    """
+    Returns the query string requests builds for params (a dict, a list of tuples, str or bytes), with dict keys sorted
+    so that equal dicts give the same key.
+    """
+
+    if not params:
+        return ''
+    if hasattr(params, 'items'):
+        params = sorted(params.items(), key=lambda item: str(item[0]))
+    query = RequestEncodingMixin._encode_params(params)
+    return query.decode('latin-1') if isinstance(query, bytes) else query
+
+
+class responseCache:
+    """
+    The responseCache class keeps successful GET responses for a per-endpoint time-to-live, evicting the least recently
+    used entry once max_entries is reached.
+
+    ...
+
+    Attributes
+    ----------
+    ttls : dict
+        endpoint path below /v1 (for example '/vpgs/statuses') -> seconds its responses stay cached
+
+    stats : dict
+        counters for 'hits', 'misses' and 'evictions'
+
+    Methods
+    -------
+    get(url, params=None)
+        Returns the cached response for url, or None.
+    put(url, params, response)
+        Caches response if its endpoint has a TTL and it succeeded.
+    invalidate(endpoint=None, host=None)
+        Drops cached entries, all of them by default.
+    """
+
+    def __init__(self, ttls=None, max_entries=256, path=None):
+        """
+        Parameters
+        ----------
+        ttls : dict, optional
+            Endpoint path -> seconds; replaces DEFAULT_TTLS. Set an endpoint to 0 to stop caching it.
+        max_entries : int, optional
+            Entries kept before the least recently used one is evicted (default: 256)
+        path : str, optional
+            JSON file the cache is loaded from and saved to, so that separate runs share it. "~" is expanded.
+        """
+
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self.path = os.path.expanduser(path) if path else None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._saveLock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        if self.path:
+            self._load()
+
+    @staticmethod
+    def endpoint(url):
+        path = urlsplit(url).path
+        return path[3:] if path.startswith('/v1/') else path
+
+    @staticmethod
+    def key(url, params=None):
+        query = queryKey(params)
+        return url + '?' + query if query else url
+
+    def ttlFor(self, url):
+        return self.ttls.get(self.endpoint(url), 0)
+
+    def get(self, url, params=None):
+        """
+        Parameters
+        ----------
+        url : str, required
+            Full URL of the API endpoint
+        params : dict, list of tuples, str or bytes, optional
+            Query string parameters, as passed to requests
+
+        Returns
+        -------
+        type requests.models.Response object, or None
+        """
+
+        key = self.key(url, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[1]
+
+    def put(self, url, params, response):
+        ttl = self.ttlFor(url)
+        if not ttl or not response.ok:
+            return
+        key = self.key(url, params)
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+        self.save()
+
+    def invalidate(self, endpoint=None, host=None):
+        """
+        Drops cached entries.
+
+        Parameters
+        ----------
+        endpoint : str, optional
+            Only drop entries for this endpoint path below /v1 (for example '/license')
+        host : str, optional
+            Only drop entries for this ZVM/ZCA host
+        """
+
+        with self._lock:
+            for key in list(self._entries):
+                if endpoint is not None and self.endpoint(key.split('?')[0]) != endpoint:
+                    continue
+                if host is not None and urlsplit(key).hostname != host:
+                    continue
+                del self._entries[key]
+        self.save()
+
+    def save(self):
+        """
+        Writes the unexpired entries to path, if one was given.
+        """
+
+        if not self.path:
+            return
+        now = time.time()
+        with self._lock:
+            serialized = {key: {'expires': expires, 'status': response.status_code, 'url': response.url,
+                                'headers': dict(response.headers), 'encoding': response.encoding,
+                                'content': response.content.decode('latin-1')}
+                          for key, (expires, response) in self._entries.items() if expires > now}
+        temp = self.path + '.' + str(os.getpid()) + '.tmp'
+        with self._saveLock:
+            fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as fh:
+                json.dump(serialized, fh)
+            os.replace(temp, self.path)
+
+    def _load(self):
+        try:
+            with open(self.path) as fh:
+                serialized = json.load(fh)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for key, entry in serialized.items():
+            if entry['expires'] <= now:
+                continue
+            response = requests.Response()
+            response.status_code = entry['status']
+            response.url = entry['url']
+            response.headers = CaseInsensitiveDict(entry['headers'])
+            response.encoding = entry['encoding']
+            response._content = entry['content'].encode('latin-1')
+            self._entries[key] = (entry['expires'], response)
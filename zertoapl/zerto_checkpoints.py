@@ -0,0 +1,411 @@
+"""
+The zerto_checkpoints.py module contains the checkpointIndex class, which keeps the checkpoints of a VPG sorted by time
+so that the point in time to recover to is found with a binary search instead of a scan of the whole journal. The index
+is filled from the ZVM's server-side time window (vpgs.getCheckpointsForVpg startdate/enddate) and refreshed
+incrementally, asking only for checkpoints taken since the newest one already indexed.
+
+It also contains the checkpointTagger class, which inserts a tagged checkpoint in many VPGs at (nearly) the same moment
+and measures how far apart the resulting checkpoints are.
+"""
+
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from .zerto_codec import defaultCodec
+from .zerto_events import eventTime
+from .zerto_rollout import describeError, httpError
+
+
+def checkpointTime(value):
+    """
+    Converts a checkpoint time to a POSIX timestamp. Accepts a TimeStamp string as returned by the ZVM, a datetime
+    (naive datetimes are taken as UTC) or a number, which is returned as it is.
+    """
+
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return (value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)).timestamp()
+    return eventTime(value).timestamp()
+
+
+class _timeline:
+    __slots__ = ('times', 'checkpoints')
+
+    def __init__(self):
+        self.times = []
+        self.checkpoints = []
+
+    def insert(self, stamp, checkpoint):
+        position = bisect_right(self.times, stamp)
+        self.times.insert(position, stamp)
+        self.checkpoints.insert(position, checkpoint)
+
+    def atOrBefore(self, stamp):
+        position = bisect_right(self.times, stamp)
+        return self.checkpoints[position - 1] if position else None
+
+    def nearest(self, stamp):
+        position = bisect_left(self.times, stamp)
+        candidates = [index for index in (position - 1, position) if 0 <= index < len(self.times)]
+        if not candidates:
+            return None
+        return self.checkpoints[min(candidates, key=lambda index: abs(self.times[index] - stamp))]
+
+    def prune(self, stamp):
+        position = bisect_left(self.times, stamp)
+        removed = self.checkpoints[:position]
+        del self.times[:position]
+        del self.checkpoints[:position]
+        return removed
+
+
+class checkpointIndex:
+    """
+    The checkpointIndex class indexes the checkpoints of one VPG by time.
+
+    ...
+
+    Attributes
+    ----------
+    vpgid : str
+        identifier of the VPG
+    requests : int
+        number of successful API calls made to build and refresh the index, for diagnostics
+
+    Methods
+    -------
+    refresh()
+        Adds the checkpoints taken since the newest one indexed and returns how many were added.
+    latest()
+        Returns the newest checkpoint.
+    atOrBefore(when)
+        Returns the latest checkpoint taken at or before when.
+    nearestTagged(when, tag=None)
+        Returns the tagged checkpoint (optionally with the given tag) closest to when.
+    between(start, end)
+        Returns the checkpoints taken from start to end, oldest first.
+    prune(before)
+        Forgets the checkpoints taken before a time, for example those that left the journal.
+    """
+
+    def __init__(self, vpgsobj, vpgid, since=None):
+        """
+        Parameters
+        ----------
+        vpgsobj : vpgs, required
+            vpgs instance used to fetch the checkpoints
+        vpgid : str, required
+            ID of the VPG in question
+        since : str, optional
+            Only index checkpoints taken at or after this time, in the format the ZVM accepts for startDate, for
+            example '2021-03-01T00:00:00.000' (default: the whole journal)
+        """
+
+        self.vpgs = vpgsobj
+        self.vpgid = vpgid
+        self.since = since
+        self.requests = 0
+        self._all = _timeline()
+        self._tagged = _timeline()
+        self._tags = {}
+        self._ids = set()
+        self._newest = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """
+        Asks the ZVM for the checkpoints taken at or after the newest checkpoint already indexed (or since, on the
+        first call) and adds the new ones.
+
+        Returns
+        -------
+        type int, the number of checkpoints added
+        """
+
+        with self._lock:
+            startdate = self._newest['TimeStamp'] if self._newest is not None else self.since
+            added = 0
+            for checkpoint in self.vpgs.getCheckpointsForVpg(self.vpgid, stream=True, startdate=startdate):
+                if checkpoint['CheckpointIdentifier'] in self._ids:
+                    continue
+                self._ids.add(checkpoint['CheckpointIdentifier'])
+                stamp = checkpointTime(checkpoint['TimeStamp'])
+                self._all.insert(stamp, checkpoint)
+                if checkpoint.get('Tag'):
+                    self._tagged.insert(stamp, checkpoint)
+                    self._tags.setdefault(checkpoint['Tag'], _timeline()).insert(stamp, checkpoint)
+                added += 1
+            # Counted only once the fetch succeeded, so that a failed first refresh is retried by the next lookup.
+            self.requests += 1
+            if self._all.checkpoints:
+                self._newest = self._all.checkpoints[-1]
+            return added
+
+    def _ready(self):
+        if not self.requests:
+            self.refresh()
+
+    def __len__(self):
+        return len(self._all.times)
+
+    def latest(self):
+        self._ready()
+        return self._newest
+
+    def atOrBefore(self, when):
+        """
+        Returns the latest checkpoint taken at or before when (a TimeStamp string, datetime or POSIX timestamp), or
+        None if every indexed checkpoint is newer.
+        """
+
+        self._ready()
+        with self._lock:
+            return self._all.atOrBefore(checkpointTime(when))
+
+    def nearestTagged(self, when, tag=None):
+        """
+        Returns the tagged checkpoint closest to when (before or after it), or None if there is none. With tag, only
+        checkpoints carrying exactly that tag are considered.
+        """
+
+        self._ready()
+        with self._lock:
+            timeline = self._tagged if tag is None else self._tags.get(tag)
+            return timeline.nearest(checkpointTime(when)) if timeline is not None else None
+
+    def between(self, start, end):
+        self._ready()
+        with self._lock:
+            low = bisect_left(self._all.times, checkpointTime(start))
+            high = bisect_right(self._all.times, checkpointTime(end))
+            return self._all.checkpoints[low:high]
+
+    def prune(self, before):
+        """
+        Forgets the checkpoints taken before the given time. Returns how many were removed.
+        """
+
+        with self._lock:
+            stamp = checkpointTime(before)
+            removed = self._all.prune(stamp)
+            self._tagged.prune(stamp)
+            for tag, timeline in list(self._tags.items()):
+                timeline.prune(stamp)
+                if not timeline.times:
+                    del self._tags[tag]
+            self._ids.difference_update(checkpoint['CheckpointIdentifier'] for checkpoint in removed)
+            return len(removed)
+
+
+class tagOutcome:
+    """
+    The tagOutcome class holds the result of inserting the tagged checkpoint in one VPG.
+
+    ...
+
+    Attributes
+    ----------
+    vpgid : str
+        identifier of the VPG
+    ok : bool
+        True when the insert was accepted and the tagged checkpoint was found in the journal
+    sent : float
+        seconds after the barrier was released that the insert request was sent
+    acknowledged : float
+        seconds after the barrier was released that the ZVM answered the insert request
+    checkpoint : dict
+        the tagged checkpoint as returned by vpgs.getCheckpointsForVpg, or None
+    error : str
+        why the checkpoint was not inserted or not found, or None
+    """
+
+    def __init__(self, vpgid):
+        self.vpgid = vpgid
+        self.ok = False
+        self.sent = None
+        self.acknowledged = None
+        self.checkpoint = None
+        self.error = None
+
+    @property
+    def timestamp(self):
+        return checkpointTime(self.checkpoint['TimeStamp']) if self.checkpoint is not None else None
+
+    def __repr__(self):
+        return f"tagOutcome(vpgid={self.vpgid!r}, ok={self.ok}, error={self.error!r})"
+
+
+class taggingResult:
+    """
+    The taggingResult class holds the outcome of a multi-VPG tagged checkpoint.
+
+    ...
+
+    Attributes
+    ----------
+    tag : str
+        the checkpoint name
+    outcomes : dict
+        VPG identifier -> tagOutcome
+    sendSpread : float
+        seconds between the first and the last insert request being sent
+    spread : float
+        seconds between the earliest and the latest tagged checkpoint, or None when fewer than two were found
+
+    Methods
+    -------
+    report()
+        Returns one dict per VPG (vpgid, ok, sent, acknowledged, timestamp, offset, error), where offset is the
+        number of milliseconds the VPG's checkpoint was taken after the earliest one.
+    """
+
+    def __init__(self, tag, vpgids):
+        self.tag = tag
+        self.outcomes = {vpgid: tagOutcome(vpgid) for vpgid in vpgids}
+        self.sendSpread = None
+        self.spread = None
+
+    @property
+    def ok(self):
+        return all(outcome.ok for outcome in self.outcomes.values())
+
+    def _measure(self):
+        sent = [outcome.sent for outcome in self.outcomes.values() if outcome.sent is not None]
+        stamps = [outcome.timestamp for outcome in self.outcomes.values() if outcome.checkpoint is not None]
+        self.sendSpread = max(sent) - min(sent) if sent else None
+        self.spread = max(stamps) - min(stamps) if len(stamps) > 1 else None
+
+    def report(self):
+        stamps = [outcome.timestamp for outcome in self.outcomes.values() if outcome.checkpoint is not None]
+        earliest = min(stamps) if stamps else None
+        return [{'vpgid': outcome.vpgid, 'ok': outcome.ok,
+                 'sent': round(outcome.sent * 1000, 1) if outcome.sent is not None else None,
+                 'acknowledged': round(outcome.acknowledged * 1000, 1) if outcome.acknowledged is not None else None,
+                 'timestamp': outcome.checkpoint['TimeStamp'] if outcome.checkpoint is not None else None,
+                 'offset': round((outcome.timestamp - earliest) * 1000, 1) if outcome.checkpoint is not None else None,
+                 'error': outcome.error} for outcome in self.outcomes.values()]
+
+    def __repr__(self):
+        spread = f"{self.spread * 1000:.0f}ms" if self.spread is not None else None
+        return f"taggingResult(tag={self.tag!r}, ok={self.ok}, spread={spread})"
+
+
+class checkpointTagger:
+    """
+    The checkpointTagger class inserts a tagged checkpoint in many VPGs at (nearly) the same moment.
+
+    Every VPG gets a thread of its own. Each thread first makes an authenticated call for its VPG, which opens a pooled
+    connection and renews the session token if needed. The threads then wait on a barrier and all send their insert
+    request as soon as it is released. Afterwards the tagged checkpoints are looked up in the journals to measure how
+    far apart they were taken. The session should pool at least one connection per VPG (zertoapl(pool_size=...)).
+
+    ...
+
+    Methods
+    -------
+    tag(vpgids, tag)
+        Inserts the tagged checkpoint in every VPG and returns a taggingResult.
+    """
+
+    def __init__(self, vpgsobj, timeout=60.0, interval=1.0, codec=None):
+        """
+        Parameters
+        ----------
+        vpgsobj : vpgs, required
+            vpgs instance the checkpoints are inserted and looked up through
+        timeout : float, optional
+            Seconds to wait for all threads to reach the barrier, and then for the checkpoints to appear in the
+            journals (default: 60)
+        interval : float, optional
+            Seconds between two lookups of the checkpoints that have not appeared yet (default: 1)
+        codec : stdlibCodec or orjsonCodec, optional
+            JSON codec used to encode the insert requests (default: zerto_codec.defaultCodec())
+        """
+
+        self.vpgs = vpgsobj
+        self.timeout = timeout
+        self.interval = interval
+        self.codec = codec if codec is not None else defaultCodec()
+
+    @staticmethod
+    def _check(response):
+        if not response.ok:
+            raise Exception(httpError(response))
+        return response
+
+    def _insert(self, outcome, barrier, released, body):
+        try:
+            self._check(self.vpgs.getCheckpointStatsForVpg(outcome.vpgid))
+        except Exception as error:
+            outcome.error = describeError(error)
+        try:
+            barrier.wait(self.timeout)
+        except threading.BrokenBarrierError:
+            outcome.error = outcome.error or "Barrier broken before the insert was sent"
+        if outcome.error is not None:
+            return
+        outcome.sent = time.monotonic() - released[0]
+        try:
+            self._check(self.vpgs.insertTaggedCheckpoint(outcome.vpgid, body))
+            outcome.acknowledged = time.monotonic() - released[0]
+        except Exception as error:
+            outcome.error = describeError(error)
+
+    def _find(self, outcome, tag, startdate):
+        try:
+            response = self._check(self.vpgs.getCheckpointsForVpg(outcome.vpgid, startdate=startdate))
+            tagged = [checkpoint for checkpoint in response.json() if checkpoint.get('Tag') == tag]
+            if tagged:
+                outcome.checkpoint = max(tagged, key=lambda checkpoint: checkpointTime(checkpoint['TimeStamp']))
+                outcome.ok = True
+                outcome.error = None
+        except Exception as error:
+            outcome.error = describeError(error)
+
+    def tag(self, vpgids, tag):
+        """
+        Parameters
+        ----------
+        vpgids : list, required
+            VPGs to insert the checkpoint in
+        tag : str, required
+            Name of the checkpoint
+
+        Returns
+        -------
+        type taggingResult
+        """
+
+        result = taggingResult(tag, vpgids)
+        if not result.outcomes:
+            return result
+        body = self.codec.encode({"checkpointName": tag})
+        # Checkpoints are looked up from a few minutes before the inserts, to allow for clock skew with the ZVM.
+        startdate = (datetime.now(timezone.utc) - timedelta(minutes=5)).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+        released = [None]
+
+        def release():
+            released[0] = time.monotonic()
+
+        barrier = threading.Barrier(len(result.outcomes), action=release)
+        with ThreadPoolExecutor(max_workers=len(result.outcomes)) as executor:
+            list(executor.map(lambda outcome: self._insert(outcome, barrier, released, body),
+                              result.outcomes.values()))
+            deadline = time.monotonic() + self.timeout
+            while True:
+                missing = [outcome for outcome in result.outcomes.values()
+                           if outcome.acknowledged is not None and outcome.checkpoint is None]
+                if missing:
+                    list(executor.map(lambda outcome: self._find(outcome, tag, startdate), missing))
+                if all(outcome.checkpoint is not None for outcome in missing) or time.monotonic() >= deadline:
+                    break
+                time.sleep(self.interval)
+        for outcome in result.outcomes.values():
+            if outcome.acknowledged is not None and outcome.checkpoint is None and outcome.error is None:
+                outcome.error = "Tagged checkpoint not found in the journal"
+        result._measure()
+        return result
@@ -0,0 +1,80 @@
+"""
+The zerto_coalesce.py module contains the singleFlight class used by zertoSession to coalesce identical GET requests.
+When several threads ask the ZVM for the same thing at the same moment (getInfoAllVpgs, datastoreInfo,
+getLocalSiteInfo, ...), only the first one sends the request; the others wait for it and receive the same response.
+"""
+
+import threading
+
+
+class _call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class singleFlight:
+    """
+    The singleFlight class runs at most one call per key at a time and hands its outcome to every concurrent caller
+    with the same key.
+
+    ...
+
+    Attributes
+    ----------
+    stats : dict
+        counters for 'leaders' (calls actually made) and 'followers' (callers served by another caller's call)
+
+    Methods
+    -------
+    do(key, function)
+        Returns function() or, if a call with the same key is already running, waits for and returns its result.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.stats = {'leaders': 0, 'followers': 0}
+
+    def do(self, key, function):
+        """
+        Parameters
+        ----------
+        key : hashable, required
+            Identifies identical calls
+        function : callable, required
+            Makes the call; invoked without arguments by the first caller only
+
+        Returns
+        -------
+        The value returned by function. An exception raised by function is raised in every waiting caller.
+        """
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _call()
+                self.stats['leaders'] += 1
+            else:
+                self.stats['followers'] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
@@ -0,0 +1,113 @@
+"""
+The zerto_codec.py module contains the JSON codecs used to encode request bodies and decode response bodies. A
+zertoSession (or asyncZertoSession) given a codec decodes every response's .json() with it and encodes the json= keyword
+argument of every request with it. defaultCodec() picks orjson when it is installed (pip install zertoapl[fast]) and
+the standard library otherwise.
+"""
+
+import json
+
+import requests
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# The exception requests' own Response.json() raises (requests 2.27 and later), so that callers catching it keep working
+# when a codec decodes the body
+JSONDecodeError = getattr(requests.exceptions, 'JSONDecodeError', json.JSONDecodeError)
+
+
+class stdlibCodec:
+    """
+    The stdlibCodec class encodes and decodes JSON with the standard library json module.
+
+    Methods
+    -------
+    dumps(obj)
+        Returns obj encoded as a JSON str.
+    encode(obj)
+        Returns obj encoded as UTF-8 JSON bytes, for request bodies.
+    loads(data)
+        Decodes a JSON str or bytes.
+    """
+
+    name = 'json'
+
+    @staticmethod
+    def dumps(obj):
+        return json.dumps(obj)
+
+    @staticmethod
+    def encode(obj):
+        return json.dumps(obj).encode()
+
+    @staticmethod
+    def loads(data):
+        return json.loads(data)
+
+
+class orjsonCodec:
+    """
+    The orjsonCodec class encodes and decodes JSON with orjson, which is several times faster than the standard library
+    on large VPG settings and event payloads. Unlike json.dumps, orjson only accepts str dictionary keys.
+    """
+
+    name = 'orjson'
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjsonCodec requires the orjson package (pip install zertoapl[fast])")
+
+    @staticmethod
+    def dumps(obj):
+        return orjson.dumps(obj).decode()
+
+    @staticmethod
+    def encode(obj):
+        return orjson.dumps(obj)
+
+    @staticmethod
+    def loads(data):
+        return orjson.loads(data)
+
+
+def defaultCodec():
+    """
+    Returns an orjsonCodec when orjson is installed, a stdlibCodec otherwise.
+    """
+
+    return orjsonCodec() if orjson is not None else stdlibCodec()
+
+
+class codecResponse(requests.Response):
+    """
+    A requests.Response whose json() uses the codec of the session that received it. Keyword arguments to json() are
+    only understood by the standard library, so passing any falls back to it. Invalid bodies raise the same
+    requests.exceptions.JSONDecodeError as requests does, whichever codec decoded them.
+    """
+
+    codec = None
+
+    def json(self, **kwargs):
+        if kwargs or self.codec is None:
+            return super().json(**kwargs)
+        try:
+            return self.codec.loads(self.content)
+        except ValueError as error:
+            # orjson.JSONDecodeError derives from json.JSONDecodeError, so both codecs provide msg, doc and pos.
+            if isinstance(error, json.JSONDecodeError):
+                raise JSONDecodeError(error.msg, error.doc, error.pos) from error
+            raise JSONDecodeError(str(error), '', 0) from error
+
+
+def attachCodec(response, codec):
+    """
+    Makes response.json() decode with codec. Returns response.
+    """
+
+    if codec is not None and type(response) in (requests.Response, codecResponse):
+        response.__class__ = codecResponse
+        response.codec = codec
+    return response
@@ -0,0 +1,153 @@
+"""
+The zerto_events.py module contains the eventTail class, which follows the event log of a ZVM incrementally. Each poll
+asks the ZVM only for events at or after the newest one already seen (using the server-side filters of
+zvm.filteredEvents), drops the ones already delivered, and remembers where it stopped, optionally in a file so that a
+restarted forwarder picks up where the previous run left off.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+_ISO = re.compile(r'^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.(\d+))?(Z|[+-]\d{2}:?\d{2})?$')
+
+
+def eventTime(value):
+    """
+    Converts an OccurredOn value returned by the ZVM to an aware datetime (UTC when no offset is given). The number of
+    fractional digits the ZVM returns varies, so the strings themselves do not sort reliably.
+    """
+
+    match = _ISO.match(value)
+    if match is None:
+        raise ValueError(f"Unexpected event time: {value}")
+    seconds, fraction, offset = match.groups()
+    stamp = datetime.strptime(seconds, '%Y-%m-%dT%H:%M:%S').replace(
+        microsecond=int((fraction or '0')[:6].ljust(6, '0')))
+    if offset in (None, 'Z'):
+        return stamp.replace(tzinfo=timezone.utc)
+    digits = offset[1:].replace(':', '')
+    shift = timedelta(hours=int(digits[:2]), minutes=int(digits[2:]))
+    return stamp.replace(tzinfo=timezone(-shift if offset[0] == '-' else shift))
+
+
+class eventTail:
+    """
+    The eventTail class returns each event of a ZVM once, in the order the events occurred.
+
+    The cursor is the OccurredOn value of the newest event delivered, plus the identifiers of the events delivered
+    with that exact time, so that events sharing a timestamp are neither lost nor repeated.
+
+    ...
+
+    Attributes
+    ----------
+    cursor : dict
+        {'occurredOn': str or None, 'seen': [event identifier, ...]}
+
+    Methods
+    -------
+    poll()
+        Returns the events that occurred since the previous poll.
+    follow(interval=60, stop=None)
+        Generator yielding new events as they occur.
+    save()
+        Writes the cursor to path, if one was given.
+    """
+
+    def __init__(self, zvmobj, path=None, **filters):
+        """
+        Parameters
+        ----------
+        zvmobj : zvm, required
+            zvm instance used to fetch the events
+        path : str, optional
+            JSON file the cursor is loaded from and saved to after every poll that delivered events. "~" is expanded.
+            Use one file per set of filters.
+        **filters
+            Passed to zvm.filteredEvents, for example category='Events', vpgidentifier=..., or startdate=... to set
+            where the first run starts (by default it starts with the oldest event the ZVM still holds).
+        """
+
+        self.zvm = zvmobj
+        self.path = os.path.expanduser(path) if path else None
+        self.filters = filters
+        self.cursor = {'occurredOn': None, 'seen': []}
+        self._lock = threading.Lock()
+        if self.path:
+            self._load()
+
+    def poll(self):
+        """
+        Returns
+        -------
+        type list of event dicts, oldest first
+        """
+
+        with self._lock:
+            filters = dict(self.filters)
+            if self.cursor['occurredOn'] is not None:
+                filters['startdate'] = self.cursor['occurredOn']
+            response = self.zvm.filteredEvents(**filters)
+            if not response.ok:
+                raise Exception(f"HTTP: {response.status_code} - {response.reason}, Message: {response.text}")
+
+            last = eventTime(self.cursor['occurredOn']) if self.cursor['occurredOn'] is not None else None
+            seen = set(self.cursor['seen'])
+            fresh = []
+            for event in response.json():
+                occurred = eventTime(event['OccurredOn'])
+                if last is not None and (occurred < last or (occurred == last and event['EventIdentifier'] in seen)):
+                    continue
+                fresh.append((occurred, event))
+            if not fresh:
+                return []
+            fresh.sort(key=lambda pair: pair[0])
+
+            newest = fresh[-1][0]
+            newestIds = [event['EventIdentifier'] for occurred, event in fresh if occurred == newest]
+            if newest == last:
+                newestIds = self.cursor['seen'] + newestIds
+            self.cursor = {'occurredOn': fresh[-1][1]['OccurredOn'], 'seen': newestIds}
+            self.save()
+            return [event for occurred, event in fresh]
+
+    def follow(self, interval=60, stop=None):
+        """
+        Yields new events as they occur, polling the ZVM every interval seconds.
+
+        Parameters
+        ----------
+        interval : float, optional
+            Seconds between two polls (default: 60)
+        stop : threading.Event, optional
+            The generator returns once this event is set
+        """
+
+        while stop is None or not stop.is_set():
+            for event in self.poll():
+                yield event
+            if stop is not None:
+                stop.wait(interval)
+            else:
+                time.sleep(interval)
+
+    def save(self):
+        if not self.path:
+            return
+        temp = self.path + '.' + str(os.getpid()) + '.tmp'
+        fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as fh:
+            json.dump(self.cursor, fh)
+        os.replace(temp, self.path)
+
+    def _load(self):
+        try:
+            with open(self.path) as fh:
+                cursor = json.load(fh)
+        except (OSError, ValueError):
+            return
+        self.cursor = {'occurredOn': cursor.get('occurredOn'), 'seen': list(cursor.get('seen', []))}
@@ -0,0 +1,317 @@
+"""
+The zerto_failover.py module contains the failoverOrchestrator class, which fails over many VPGs in waves. VPGs are
+grouped by priority (High, then Medium, then Low) or by an explicit wave plan. The failovers of a wave are started with
+bounded concurrency and followed by a taskWaiter, and the next wave starts as soon as enough of the current one has
+succeeded while its stragglers keep running.
+"""
+
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .zerto_codec import defaultCodec
+from .zerto_rollout import bulkOutcome, bulkRollout, describeError, httpError
+from .zerto_tasks import taskError, taskWaiter
+
+# Priority of a VPG as returned by vpgs.getInfoAllVpgs, in the order the waves are run
+PRIORITIES = ((2, 'High'), (1, 'Medium'), (0, 'Low'))
+
+
+def priorityRank(priority):
+    """
+    Returns the numeric priority of a VPG, accepting the numeric values as well as their names. Unknown values rank
+    below Low.
+    """
+
+    for value, name in PRIORITIES:
+        if priority == value or priority == name:
+            return value
+    return -1
+
+
+class failoverOutcome(bulkOutcome):
+    """
+    The failoverOutcome class holds the result of failing over one VPG (see zerto_rollout.bulkOutcome).
+
+    ...
+
+    Attributes
+    ----------
+    vpgid : str
+        identifier of the VPG
+    name : str
+        name of the VPG, when known
+    ok : bool
+        True when the failover task completed successfully
+    done : bool
+        True once the outcome is final
+    taskid : str
+        identifier of the failover task, or None if the failover was never started
+    task : dict
+        the last task information returned by the ZVM
+    error : str
+        why the failover failed, or None
+    elapsed : float
+        seconds from the failover call until the task finished (or the failure was detected)
+    """
+
+    key = 'vpgid'
+    fields = ('name', 'ok', 'taskid', 'elapsed', 'error')
+
+    def __init__(self, vpgid, name=None):
+        super().__init__()
+        self.vpgid = vpgid
+        self.name = name
+        self.done = False
+
+
+class failoverWave(bulkRollout):
+    """
+    The failoverWave class holds the outcomes of one wave (see zerto_rollout.bulkRollout).
+
+    ...
+
+    Attributes
+    ----------
+    label : str
+        name of the wave ('High', 'Medium', 'Low' or the label of the wave plan)
+    outcomes : dict
+        VPG identifier -> failoverOutcome
+    passed : bool
+        True when the wave reached the success threshold
+    gated : float
+        seconds from the start of the wave until the next wave was allowed to start (or the wave was given up)
+    elapsed : float
+        seconds from the start of the wave until its last failover finished
+    """
+
+    def __init__(self, label, vpgids, names):
+        super().__init__()
+        self.label = label
+        self.outcomes = {vpgid: failoverOutcome(vpgid, names.get(vpgid)) for vpgid in vpgids}
+        self.passed = False
+        self.gated = 0.0
+        self.started = time.monotonic()
+        self.finished = self.started
+
+    @property
+    def failed(self):
+        return [outcome for outcome in self.outcomes.values() if outcome.done and not outcome.ok]
+
+    @property
+    def pending(self):
+        return [outcome for outcome in self.outcomes.values() if not outcome.done]
+
+    def __repr__(self):
+        return (f"failoverWave(label={self.label!r}, succeeded={len(self.succeeded)}, failed={len(self.failed)}, "
+                f"pending={len(self.pending)}, gated={self.gated:.1f}s, elapsed={self.elapsed:.1f}s)")
+
+
+class failoverRun:
+    """
+    The failoverRun class holds the waves of an orchestrated failover.
+
+    ...
+
+    Attributes
+    ----------
+    waves : list
+        the failoverWave of every wave that was started, in order
+    skipped : list
+        (label, VPG identifiers) of the waves that were not started because an earlier wave missed the threshold
+    elapsed : float
+        wall-clock seconds the whole failover took
+
+    Methods
+    -------
+    report()
+        Returns one dict per VPG (wave, vpgid, name, ok, taskid, elapsed, error), skipped VPGs included.
+    """
+
+    def __init__(self):
+        self.waves = []
+        self.skipped = []
+        self.elapsed = 0.0
+
+    @property
+    def ok(self):
+        return not self.skipped and all(not wave.failed and not wave.pending for wave in self.waves)
+
+    def report(self):
+        rows = [dict(wave=wave.label, **row) for wave in self.waves for row in wave.report()]
+        rows.extend({'wave': label, 'vpgid': vpgid, 'name': None, 'ok': False, 'taskid': None, 'elapsed': 0.0,
+                     'error': 'not started'} for label, vpgids in self.skipped for vpgid in vpgids)
+        return rows
+
+    def __repr__(self):
+        return f"failoverRun(waves={self.waves!r}, skipped={len(self.skipped)}, elapsed={self.elapsed:.1f}s)"
+
+
+class failoverOrchestrator:
+    """
+    The failoverOrchestrator class fails over many VPGs wave by wave.
+
+    Within a wave, at most max_concurrent failovers are running at any time. The next wave starts once threshold (a
+    fraction) of the current wave has completed successfully. If so many of the wave's failovers fail that the
+    threshold cannot be reached any more, no further wave is started. Either way the failovers already running are
+    followed to the end.
+
+    ...
+
+    Methods
+    -------
+    plan(vpgids=None, waves=None)
+        Returns the waves failover() would run, as (label, VPG identifiers) tuples.
+    failover(vpgids=None, waves=None, all_vpgs=False)
+        Fails the VPGs over wave by wave and returns a failoverRun.
+    """
+
+    def __init__(self, vpgsobj, zvmobj, body=None, max_concurrent=10, threshold=1.0, timeout=3600.0, waiter=None,
+                 codec=None):
+        """
+        Parameters
+        ----------
+        vpgsobj : vpgs, required
+            vpgs instance the failovers are started through
+        zvmobj : zvm, required
+            zvm instance used to follow the failover tasks
+        body : dict or callable, optional
+            failoverVpg body (see vpgs.failoverVpg), or a callable returning the body for a VPG identifier (default:
+            {}, the latest checkpoint and the VPG's own policies)
+        max_concurrent : int, optional
+            Failovers running at the same time (default: 10)
+        threshold : float, optional
+            Fraction of a wave that must have succeeded before the next wave starts (default: 1.0)
+        timeout : float, optional
+            Seconds a failover task may run before the VPG is reported as failed (default: 3600)
+        waiter : taskWaiter, optional
+            Waiter following the failover tasks, shared with other callers (default: a private one on zvmobj)
+        codec : stdlibCodec or orjsonCodec, optional
+            JSON codec used to encode the failover requests (default: zerto_codec.defaultCodec())
+        """
+
+        if not 0 <= threshold <= 1:
+            raise ValueError("threshold must be between 0 and 1")
+        self.vpgs = vpgsobj
+        self.zvm = zvmobj
+        self.body = body if body is not None else {}
+        self.max_concurrent = max_concurrent
+        self.threshold = threshold
+        self.timeout = timeout
+        self.waiter = waiter if waiter is not None else taskWaiter(zvmobj)
+        self.codec = codec if codec is not None else defaultCodec()
+        self._names = {}
+
+    def plan(self, vpgids=None, waves=None):
+        """
+        Parameters
+        ----------
+        vpgids : list, optional
+            VPGs to fail over, grouped into waves by priority (default: every VPG of the ZVM)
+        waves : list or dict, optional
+            Explicit wave plan instead of the priorities: a list of lists of VPG identifiers, or a dict mapping wave
+            labels to such lists, run in order
+
+        Returns
+        -------
+        type list of (label, VPG identifiers) tuples
+        """
+
+        if waves is not None:
+            if isinstance(waves, dict):
+                return [(label, list(members)) for label, members in waves.items()]
+            return [(f"wave-{index}", list(members)) for index, members in enumerate(waves, 1)]
+        response = self.vpgs.getInfoAllVpgs()
+        if not response.ok:
+            raise Exception(httpError(response))
+        info = {vpg['VpgIdentifier']: vpg for vpg in response.json()}
+        self._names.update((vpgid, vpg.get('VpgName')) for vpgid, vpg in info.items())
+        if vpgids is None:
+            vpgids = list(info)
+        unknown = [vpgid for vpgid in vpgids if vpgid not in info]
+        if unknown:
+            raise ValueError(f"Unknown VPG: {', '.join(unknown)}")
+        planned = [(name, [vpgid for vpgid in vpgids if priorityRank(info[vpgid].get('Priority')) == value])
+                   for value, name in PRIORITIES + ((-1, 'Unknown'),)]
+        return [(label, members) for label, members in planned if members]
+
+    def _start(self, wave, outcome, changed, slots):
+        start = time.monotonic()
+
+        def finish(error=None, task=None):
+            outcome.elapsed = time.monotonic() - start
+            wave.finished = max(wave.finished, start + outcome.elapsed)
+            outcome.error = error
+            outcome.task = task if task is not None else outcome.task
+            outcome.ok = error is None
+            with changed:
+                outcome.done = True
+                changed.notify_all()
+            slots.release()
+
+        def finished(future):
+            try:
+                finish(task=future.result())
+            except Exception as error:
+                finish(describeError(error), error.task if isinstance(error, taskError) else None)
+
+        try:
+            body = self.body(outcome.vpgid) if callable(self.body) else self.body
+            response = self.vpgs.failoverVpg(outcome.vpgid, self.codec.encode(body))
+            if not response.ok:
+                finish(httpError(response))
+                return
+            outcome.taskid = response.json()
+            self.waiter.watch(outcome.taskid, callback=finished, timeout=self.timeout)
+        except Exception as error:
+            finish(describeError(error))
+
+    def failover(self, vpgids=None, waves=None, all_vpgs=False):
+        """
+        Fails the VPGs over wave by wave. One of vpgids, waves or all_vpgs=True must be given, so that a call without
+        arguments cannot fail over the whole site.
+
+        Parameters
+        ----------
+        vpgids : list, optional
+            VPGs to fail over, grouped into waves by priority
+        waves : list or dict, optional
+            Explicit wave plan, see plan()
+        all_vpgs : bool, optional
+            Fail over every VPG of the ZVM, grouped into waves by priority (default: False)
+
+        Returns
+        -------
+        type failoverRun
+        """
+
+        if vpgids is None and waves is None and not all_vpgs:
+            raise ValueError("Pass vpgids or waves, or all_vpgs=True to fail over every VPG of the ZVM")
+        run = failoverRun()
+        start = time.monotonic()
+        planned = self.plan(vpgids, waves)
+        changed = threading.Condition()
+        slots = threading.BoundedSemaphore(max(self.max_concurrent, 1))
+        with ThreadPoolExecutor(max_workers=max(self.max_concurrent, 1)) as executor:
+            for index, (label, members) in enumerate(planned):
+                wave = failoverWave(label, members, self._names)
+                run.waves.append(wave)
+                for outcome in wave.outcomes.values():
+                    slots.acquire()
+                    executor.submit(self._start, wave, outcome, changed, slots)
+                needed = math.ceil(self.threshold * len(wave.outcomes))
+                with changed:
+                    changed.wait_for(lambda: len(wave.succeeded) >= needed or
+                                     len(wave.failed) > len(wave.outcomes) - needed)
+                    wave.passed = len(wave.succeeded) >= needed
+                wave.gated = time.monotonic() - wave.started
+                if not wave.passed:
+                    run.skipped = planned[index + 1:]
+                    break
+            with changed:
+                for wave in run.waves:
+                    changed.wait_for(lambda: not wave.pending)
+                    wave.elapsed = wave.finished - wave.started
+        run.elapsed = time.monotonic() - start
+        return run
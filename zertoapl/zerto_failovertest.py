@@ -0,0 +1,239 @@
+"""
+The zerto_failovertest.py module contains the failoverTestRunner class, which runs failover tests for many VPGs in a
+fixed number of parallel slots. Each test is started, waited for until the test VMs are up, held for a set time,
+stopped with its result recorded, and the freed slot immediately takes the next VPG. Tests are always stopped, also
+when a step fails or the run is cancelled.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from .zerto_codec import defaultCodec
+from .zerto_rollout import bulkOutcome, bulkRollout, describeError, httpError
+from .zerto_tasks import taskWaiter
+
+
+class failoverTestOutcome(bulkOutcome):
+    """
+    The failoverTestOutcome class holds the result and timings of testing one VPG (see zerto_rollout.bulkOutcome).
+
+    ...
+
+    Attributes
+    ----------
+    vpgid : str
+        identifier of the VPG
+    ok : bool
+        True when the test was started, held and stopped without errors and the check reported success
+    stage : str
+        the last step reached: 'pending', 'start', 'ready', 'hold', 'stop' or 'done'
+    success : bool
+        the FailoverTestSuccess value sent when stopping the test
+    summary : str
+        the FailoverTestSummary value sent when stopping the test
+    started : str
+        UTC time (ISO 8601) the test was started, or None
+    ready : float
+        seconds from starting the test until the test VMs were up
+    held : float
+        seconds the test was held
+    stopping : float
+        seconds the stop took
+    elapsed : float
+        seconds from starting the test until it was stopped
+    taskid : str
+        identifier of the failover test task
+    stoptaskid : str
+        identifier of the stop task
+    error : str
+        why the test failed, or None
+    """
+
+    key = 'vpgid'
+    fields = ('ok', 'stage', 'success', 'summary', 'started', 'ready', 'held', 'stopping', 'elapsed', 'error')
+
+    def __init__(self, vpgid):
+        super().__init__()
+        self.vpgid = vpgid
+        self.stage = 'pending'
+        self.success = None
+        self.summary = None
+        self.started = None
+        self.ready = 0.0
+        self.held = 0.0
+        self.stopping = 0.0
+        self.stoptaskid = None
+
+
+class failoverTestRun(bulkRollout):
+    """
+    The failoverTestRun class holds the outcomes of a test run (see zerto_rollout.bulkRollout).
+
+    ...
+
+    Attributes
+    ----------
+    outcomes : dict
+        VPG identifier -> failoverTestOutcome, in the order the VPGs were given
+    elapsed : float
+        wall-clock seconds the whole run took
+
+    Methods
+    -------
+    report()
+        Returns one dict per VPG with its outcome and timings.
+    """
+
+    def __init__(self, vpgids):
+        super().__init__()
+        self.outcomes = {vpgid: failoverTestOutcome(vpgid) for vpgid in vpgids}
+
+
+class failoverTestRunner:
+    """
+    The failoverTestRunner class runs failover tests for many VPGs in parallel slots.
+
+    ...
+
+    Methods
+    -------
+    run(vpgids, not_after=None)
+        Tests every VPG and returns a failoverTestRun.
+    cancel()
+        Ends the holds of the running tests early (they are stopped as usual) and starts no further tests.
+    """
+
+    def __init__(self, vpgsobj, zvmobj, slots=4, hold=300.0, check=None, body=None, timeout=3600.0, waiter=None,
+                 codec=None):
+        """
+        Parameters
+        ----------
+        vpgsobj : vpgs, required
+            vpgs instance the tests are started and stopped through
+        zvmobj : zvm, required
+            zvm instance used to follow the test tasks
+        slots : int, optional
+            Tests running at the same time (default: 4)
+        hold : float, optional
+            Seconds a test is kept running once its VMs are up (default: 300)
+        check : callable, optional
+            Called with the VPG identifier at the end of the hold; returns (success, summary) for the stop request.
+            An exception counts as a failed test. (default: success with a summary giving the hold time)
+        body : dict or callable, optional
+            failoverTest body (see vpgs.failoverTest), or a callable returning the body for a VPG identifier
+            (default: {}, the latest checkpoint and every VM of the VPG)
+        timeout : float, optional
+            Seconds the start or the stop of a test may take before the VPG is reported as failed (default: 3600)
+        waiter : taskWaiter, optional
+            Waiter following the test tasks, shared with other callers (default: a private one on zvmobj)
+        codec : stdlibCodec or orjsonCodec, optional
+            JSON codec used to encode the requests (default: zerto_codec.defaultCodec())
+        """
+
+        self.vpgs = vpgsobj
+        self.zvm = zvmobj
+        self.slots = slots
+        self.hold = hold
+        self.check = check
+        self.body = body if body is not None else {}
+        self.timeout = timeout
+        self.waiter = waiter if waiter is not None else taskWaiter(zvmobj)
+        self.codec = codec if codec is not None else defaultCodec()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _task(self, response):
+        if not response.ok:
+            raise Exception(httpError(response))
+        return response.json()
+
+    def _verdict(self, vpgid):
+        if self._cancelled.is_set():
+            return False, "Failover test cancelled"
+        if self.check is None:
+            return True, f"Failover test held for {self.hold:g} seconds"
+        try:
+            return self.check(vpgid)
+        except Exception as error:
+            return False, f"Check failed: {describeError(error)}"
+
+    def _stop(self, outcome):
+        start = time.monotonic()
+        outcome.stage = 'stop'
+        body = {"FailoverTestSuccess": bool(outcome.success), "FailoverTestSummary": outcome.summary}
+        outcome.stoptaskid = self._task(self.vpgs.stopFailoverTest(outcome.vpgid, self.codec.encode(body)))
+        self.waiter.watch(outcome.stoptaskid, timeout=self.timeout).result()
+        outcome.stopping = time.monotonic() - start
+
+    def _testOne(self, outcome, not_after):
+        if self._cancelled.is_set() or (not_after is not None and time.time() > not_after):
+            outcome.error = "Not started"
+            return
+        start = time.monotonic()
+        outcome.started = datetime.now(timezone.utc).isoformat()
+        try:
+            outcome.stage = 'start'
+            body = self.body(outcome.vpgid) if callable(self.body) else self.body
+            outcome.taskid = self._task(self.vpgs.failoverTest(outcome.vpgid, self.codec.encode(body)))
+            outcome.stage = 'ready'
+            self.waiter.watch(outcome.taskid, timeout=self.timeout).result()
+            outcome.ready = time.monotonic() - start
+            outcome.stage = 'hold'
+            self._cancelled.wait(self.hold)
+            outcome.held = time.monotonic() - start - outcome.ready
+            outcome.success, outcome.summary = self._verdict(outcome.vpgid)
+            self._stop(outcome)
+            outcome.stage = 'done'
+            outcome.ok = bool(outcome.success)
+            if not outcome.ok:
+                outcome.error = outcome.summary
+        except Exception as error:
+            outcome.fail(error)
+            if outcome.taskid is not None and outcome.stage != 'stop':
+                stage = outcome.stage
+                outcome.success, outcome.summary = False, f"Failover test failed: {outcome.error}"
+                try:
+                    self._stop(outcome)
+                except Exception as stoperror:
+                    outcome.error += f"; stop failed: {stoperror}"
+                outcome.stage = stage
+        finally:
+            outcome.elapsed = time.monotonic() - start
+
+    def run(self, vpgids, not_after=None):
+        """
+        Tests every VPG, keeping all slots busy until every VPG has been tested.
+
+        Parameters
+        ----------
+        vpgids : list, required
+            VPGs to test, in the order they are started
+        not_after : float or datetime, optional
+            Latest time (a timestamp or an aware datetime) a test may be started, to keep the run inside a
+            maintenance window. VPGs not started by then are reported with the error 'Not started'.
+
+        Returns
+        -------
+        type failoverTestRun
+        """
+
+        if isinstance(not_after, datetime):
+            not_after = not_after.timestamp()
+        self._cancelled.clear()
+        run = failoverTestRun(vpgids)
+        start = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=max(self.slots, 1))
+        try:
+            for outcome in run.outcomes.values():
+                executor.submit(self._testOne, outcome, not_after)
+            executor.shutdown(wait=True)
+        except BaseException:
+            self.cancel()
+            executor.shutdown(wait=True)
+            raise
+        run.elapsed = time.monotonic() - start
+        return run
@@ -0,0 +1,171 @@
+"""
+The zerto_fleet.py module contains the zertoFleet class, which drives many ZVMs/ZCAs at once. It logs in to every site
+in parallel and runs any zvm, vpgs, vpgSettings or vra method (or any function of a zertoapl client) on all sites
+concurrently, so a fleet-wide sweep takes as long as the slowest site rather than the sum of all sites.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from .zertoapl import zertoapl
+
+
+class fleetResult:
+    """
+    The fleetResult class holds the outcome of one fleet-wide call.
+
+    ...
+
+    Attributes
+    ----------
+    results : dict
+        site name -> value returned for that site
+
+    errors : dict
+        site name -> exception raised for that site (a TimeoutError when the site missed the deadline)
+
+    elapsed : float
+        wall-clock seconds the whole call took
+    """
+
+    def __init__(self):
+        self.results = {}
+        self.errors = {}
+        self.elapsed = 0.0
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def __repr__(self):
+        return f"fleetResult(results={len(self.results)}, errors={len(self.errors)}, elapsed={self.elapsed:.2f}s)"
+
+
+class zertoFleet:
+    """
+    The zertoFleet class holds one logged-in zertoapl client per site.
+
+    ...
+
+    Attributes
+    ----------
+    clients : dict
+        site name -> zertoapl client, for every site that logged in successfully
+
+    loginErrors : dict
+        site name -> exception raised while logging in
+
+    Methods
+    -------
+    map(function, deadline=None)
+        Calls function(client) for every site concurrently.
+    run(component, method, *args, deadline=None, **kwargs)
+        Calls client.<component>().<method>(*args, **kwargs) for every site concurrently.
+    close()
+        Kept for compatibility; every call starts and releases its own worker threads.
+    """
+
+    def __init__(self, sites, max_workers=None, deadline=None, **clientkwargs):
+        """
+        Parameters
+        ----------
+        sites : list, required
+            One dict per site with the keys zvm_ip, zvm_user and zvm_password, and optionally name (defaults to
+            zvm_ip).
+        max_workers : int, optional
+            Number of worker threads of each call (default: one per site)
+        deadline : float, optional
+            Seconds allowed for all logins; sites that have not logged in by then are reported in loginErrors.
+        **clientkwargs
+            Passed to every zertoapl client, for example pool_size, tokenstore, retry or max_in_flight.
+        """
+
+        self.max_workers = max_workers or max(len(sites), 1)
+        self.clients = {}
+        self.loginErrors = {}
+        names = [site.get('name', site['zvm_ip']) for site in sites]
+        logins = self._gather({
+            name: (lambda site=site: zertoapl(site['zvm_ip'], site['zvm_user'], site['zvm_password'], **clientkwargs))
+            for name, site in zip(names, sites)
+        }, deadline)
+        self.clients = logins.results
+        self.loginErrors = logins.errors
+
+    def _gather(self, calls, deadline):
+        """
+        Runs every call (site name -> callable) on worker threads of its own and collects the outcomes. A site that
+        misses the deadline is reported at once, but its call cannot be interrupted: it keeps running in the background
+        until it returns, without holding up later calls.
+        """
+
+        result = fleetResult()
+        start = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = {name: executor.submit(call) for name, call in calls.items()}
+            done, pending = wait(futures.values(), timeout=deadline)
+        finally:
+            executor.shutdown(wait=False)
+        for name, future in futures.items():
+            if future in pending:
+                future.cancel()
+                result.errors[name] = TimeoutError(f"{name} did not answer within {deadline} seconds")
+            elif future.exception() is not None:
+                result.errors[name] = future.exception()
+            else:
+                result.results[name] = future.result()
+        result.elapsed = time.monotonic() - start
+        return result
+
+    def map(self, function, deadline=None):
+        """
+        Calls function(client) for every logged-in site concurrently.
+
+        Parameters
+        ----------
+        function : callable, required
+            Receives the site's zertoapl client
+        deadline : float, optional
+            Seconds allowed for the whole fleet; sites still running then are reported as TimeoutError in errors.
+            Their calls keep running in the background until the site answers.
+
+        Returns
+        -------
+        type fleetResult
+        """
+
+        return self._gather({name: (lambda client=client: function(client)) for name, client in self.clients.items()},
+                            deadline)
+
+    def run(self, component, method, *args, deadline=None, **kwargs):
+        """
+        Calls the same method on every logged-in site concurrently, for example
+        fleet.run('vpgs', 'getInfoAllVpgs') or fleet.run('zvm', 'getSingleTask', taskid).
+
+        Parameters
+        ----------
+        component : str, required
+            One of 'zvm', 'vpgs', 'vpgsettings' or 'vra' (the zertoapl factory methods)
+        method : str, required
+            Name of the method to call on that component
+        deadline : float, optional
+            Seconds allowed for the whole fleet; sites still running then are reported as TimeoutError in errors.
+
+        Returns
+        -------
+        type fleetResult
+        """
+
+        def call(client):
+            return getattr(getattr(client, component)(), method)(*args, **kwargs)
+
+        return self.map(call, deadline)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
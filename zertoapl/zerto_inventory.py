@@ -0,0 +1,154 @@
+"""
+The zerto_inventory.py module contains the inventoryIndex class, which fetches the datastores, hosts and networks
+visible to a ZVM once and resolves names to identifiers with dictionary lookups. Unlike zvm.getDatastoreGuid,
+getHostGuid and getNetworkGuid, which download and scan the full list on every call, resolving any number of names
+costs one request per collection.
+"""
+
+import threading
+
+# collection -> (name field, identifier field) in the ZVM payloads
+FIELDS = {
+    'datastores': ('DatastoreName', 'DatastoreIdentifier'),
+    'hosts': ('VirtualizationHostName', 'HostIdentifier'),
+    'networks': ('VirtualizationNetworkName', 'NetworkIdentifier'),
+}
+
+
+class inventoryIndex:
+    """
+    The inventoryIndex class indexes the datastores, hosts and networks of the local site by name.
+
+    Each collection is fetched the first time it is needed and kept until refresh() is called.
+
+    ...
+
+    Attributes
+    ----------
+    requests : int
+        number of API calls made to build the index, for diagnostics
+
+    Methods
+    -------
+    lookup(collection, name, ignore_case=False)
+        Returns the identifier of the item called name, or None.
+    resolve(datastores=(), hosts=(), networks=(), ignore_case=False)
+        Resolves many names at once.
+    duplicates(collection)
+        Returns the names that more than one item shares.
+    datastoreGuid(name) / hostGuid(name) / networkGuid(name)
+        Shortcuts for lookup().
+    refresh(collection=None)
+        Forgets one or all collections so that they are fetched again.
+    """
+
+    def __init__(self, zvmobj, siteidentifier=None):
+        """
+        Parameters
+        ----------
+        zvmobj : zvm, required
+            zvm instance used to fetch the inventory
+        siteidentifier : str, optional
+            Site whose hosts and networks are indexed (default: the local site)
+        """
+
+        self.zvm = zvmobj
+        self.siteidentifier = siteidentifier
+        self.requests = 0
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def _site(self):
+        if self.siteidentifier is None:
+            self.siteidentifier = self.zvm.getLocalSiteGuid()
+            self.requests += 1
+        return self.siteidentifier
+
+    def _fetch(self, collection):
+        if collection == 'datastores':
+            response = self.zvm.datastoreInfo()
+        elif collection == 'hosts':
+            response = self.zvm.getHostsAtSite(self._site())
+        elif collection == 'networks':
+            response = self.zvm.getNetworksAtSite(self._site())
+        else:
+            raise ValueError(f"Unknown inventory collection: {collection}")
+        self.requests += 1
+        if not response.ok:
+            raise Exception(f"HTTP: {response.status_code} - {response.reason}, Message: {response.text}")
+        return response.json()
+
+    def _index(self, collection):
+        with self._lock:
+            index = self._indexes.get(collection)
+            if index is None:
+                nameField, idField = FIELDS[collection]
+                byName, byFoldedName = {}, {}
+                for item in self._fetch(collection):
+                    byName.setdefault(item[nameField], []).append(item[idField])
+                    byFoldedName.setdefault(item[nameField].casefold(), []).append(item[idField])
+                index = self._indexes[collection] = (byName, byFoldedName)
+            return index
+
+    def lookup(self, collection, name, ignore_case=False):
+        """
+        Parameters
+        ----------
+        collection : str, required
+            'datastores', 'hosts' or 'networks'
+        name : str, required
+            Name of the item as shown in the hypervisor manager
+        ignore_case : bool, optional
+            Fall back to a case-insensitive match when there is no exact one (default: False)
+
+        Returns
+        -------
+        type str, or None when no item has that name. When several items share the name, the first one returned by
+        the ZVM is used, as zvm.getDatastoreGuid does; see duplicates().
+        """
+
+        byName, byFoldedName = self._index(collection)
+        identifiers = byName.get(name)
+        if identifiers is None and ignore_case:
+            identifiers = byFoldedName.get(name.casefold())
+        return identifiers[0] if identifiers else None
+
+    def resolve(self, datastores=(), hosts=(), networks=(), ignore_case=False):
+        """
+        Resolves many names with one request per collection.
+
+        Returns
+        -------
+        type dict: {'datastores': {name: identifier}, 'hosts': {...}, 'networks': {...}}, with None for unknown names
+        """
+
+        wanted = {'datastores': datastores, 'hosts': hosts, 'networks': networks}
+        return {collection: {name: self.lookup(collection, name, ignore_case) for name in names}
+                for collection, names in wanted.items()}
+
+    def duplicates(self, collection, ignore_case=False):
+        """
+        Returns
+        -------
+        type dict: {name: [identifier, ...]} for every name shared by more than one item
+        """
+
+        byName, byFoldedName = self._index(collection)
+        source = byFoldedName if ignore_case else byName
+        return {name: identifiers for name, identifiers in source.items() if len(identifiers) > 1}
+
+    def datastoreGuid(self, name, ignore_case=False):
+        return self.lookup('datastores', name, ignore_case)
+
+    def hostGuid(self, name, ignore_case=False):
+        return self.lookup('hosts', name, ignore_case)
+
+    def networkGuid(self, name, ignore_case=False):
+        return self.lookup('networks', name, ignore_case)
+
+    def refresh(self, collection=None):
+        with self._lock:
+            if collection is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(collection, None)
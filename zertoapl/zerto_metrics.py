@@ -0,0 +1,322 @@
+"""
+The zerto_metrics.py module contains the rpoCollector class, which samples vpgs.getInfoAllVpgs periodically and keeps
+the RPO, throughput, IOPS and journal figures of every VPG in fixed-size ring buffers. The buffers are preallocated
+array.array columns (4 bytes per value), so memory is fixed by the number of VPGs, metrics and samples kept, however
+long the collector runs. Minimum, maximum, mean and percentiles over a time window are computed on the slices of a
+column that fall in the window, with numpy when it is installed (pip install zertoapl[metrics]).
+"""
+
+import math
+import threading
+import time
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Values sampled for every VPG; nested values are given as dotted paths
+METRICS = ('ActualRPO', 'ThroughputInMB', 'IOPs', 'UsedStorageInMB', 'HistoryStatusApi.ActualHistoryInMinutes')
+
+# One sample a minute for 30 days
+DEFAULT_CAPACITY = 30 * 24 * 60
+
+_NAN = float('nan')
+
+
+def metricValue(vpg, metric):
+    """
+    Returns the value of metric (a dotted path such as 'HistoryStatusApi.ActualHistoryInMinutes') in a VPG as returned
+    by vpgs.getInfoAllVpgs, or NaN when it is missing.
+    """
+
+    value = vpg
+    for key in metric.split('.'):
+        if not isinstance(value, dict):
+            return _NAN
+        value = value.get(key)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return _NAN
+
+
+def percentile(ordered, p):
+    """
+    Returns the p-th percentile (0-100) of an ascending list, interpolating linearly between the closest ranks as
+    numpy.percentile does.
+    """
+
+    rank = p / 100 * (len(ordered) - 1)
+    low = math.floor(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def aggregate(values, percentiles=(50, 95, 99)):
+    """
+    Returns count, min, max, mean and the given percentiles (as p<N>) of a float32 array.array, ignoring NaN. All but
+    count are None when there is no value.
+    """
+
+    if numpy is not None:
+        data = numpy.frombuffer(values, dtype=numpy.float32) if len(values) else numpy.empty(0, numpy.float32)
+        data = data[~numpy.isnan(data)].astype(numpy.float64)
+        result = {'count': int(data.size)}
+        if not data.size:
+            return dict(result, min=None, max=None, mean=None, **{f"p{p:g}": None for p in percentiles})
+        result.update(min=float(data.min()), max=float(data.max()), mean=float(data.mean()))
+        ranks = numpy.percentile(data, percentiles)
+        result.update((f"p{p:g}", float(value)) for p, value in zip(percentiles, ranks))
+        return result
+    data = sorted(value for value in values if value == value)
+    result = {'count': len(data)}
+    if not data:
+        return dict(result, min=None, max=None, mean=None, **{f"p{p:g}": None for p in percentiles})
+    result.update(min=data[0], max=data[-1], mean=math.fsum(data) / len(data))
+    result.update((f"p{p:g}", percentile(data, p)) for p in percentiles)
+    return result
+
+
+class rpoCollector:
+    """
+    The rpoCollector class keeps a fixed-size time series of metrics for every VPG.
+
+    All VPGs share one ring of sample times; every VPG has one float32 column per metric, aligned with it. A VPG
+    missing from a sample gets NaN for that sample, and a VPG missing for a whole ring is forgotten. Memory is about
+    capacity * len(metrics) * 4 bytes per VPG: 864 KB for the default 30 days of one-minute samples of 5 metrics, or
+    0.84 GB for 1,000 VPGs.
+
+    ...
+
+    Attributes
+    ----------
+    capacity : int
+        number of samples kept per VPG
+    metrics : tuple
+        names of the metrics kept
+    names : dict
+        VPG identifier -> VPG name, as of the latest sample
+
+    Methods
+    -------
+    sample()
+        Calls vpgs.getInfoAllVpgs and records the result.
+    record(vpgs, when=None)
+        Records one sample from a list of VPGs as returned by vpgs.getInfoAllVpgs.
+    collect(interval=60, stop=None)
+        Samples every interval seconds until stop is set.
+    values(vpgid, metric, window=None, end=None)
+        Returns the recorded values of one metric of one VPG, oldest first.
+    stats(vpgid, metric, window=None, end=None, percentiles=(50, 95, 99))
+        Returns count, min, max, mean and percentiles of one metric of one VPG.
+    summary(metric, window=None, end=None, percentiles=(50, 95, 99))
+        Returns stats() for every VPG.
+    """
+
+    def __init__(self, vpgsobj, capacity=DEFAULT_CAPACITY, metrics=METRICS):
+        """
+        Parameters
+        ----------
+        vpgsobj : vpgs, required
+            vpgs instance used to sample the VPGs
+        capacity : int, optional
+            Samples kept per VPG; older samples are overwritten (default: 30 days of one-minute samples)
+        metrics : tuple, optional
+            Metrics to keep, as names or dotted paths into the getInfoAllVpgs items (default: METRICS)
+        """
+
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.vpgs = vpgsobj
+        self.capacity = capacity
+        self.metrics = tuple(metrics)
+        self.names = {}
+        self._column = {metric: index for index, metric in enumerate(self.metrics)}
+        self._times = array('d', bytes(8 * capacity))
+        self._columns = {}
+        self._lastSeen = {}
+        self._samples = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return min(self._samples, self.capacity)
+
+    @property
+    def nbytes(self):
+        """
+        Bytes held by the ring buffers.
+        """
+
+        columns = sum(column.itemsize * len(column) for row in self._columns.values() for column in row)
+        return columns + self._times.itemsize * len(self._times)
+
+    def record(self, vpgs, when=None):
+        """
+        Records one sample.
+
+        Parameters
+        ----------
+        vpgs : list, required
+            VPGs as returned by vpgs.getInfoAllVpgs
+        when : float, optional
+            POSIX time of the sample (default: now). Samples must be recorded in time order.
+        """
+
+        with self._lock:
+            slot = self._samples % self.capacity
+            self._times[slot] = time.time() if when is None else when
+            seen = set()
+            for vpg in vpgs:
+                vpgid = vpg['VpgIdentifier']
+                row = self._columns.get(vpgid)
+                if row is None:
+                    row = self._columns[vpgid] = [array('f', [_NAN]) * self.capacity for _ in self.metrics]
+                for column, metric in zip(row, self.metrics):
+                    column[slot] = metricValue(vpg, metric)
+                self.names[vpgid] = vpg.get('VpgName')
+                self._lastSeen[vpgid] = self._samples
+                seen.add(vpgid)
+            for vpgid, row in list(self._columns.items()):
+                if vpgid in seen:
+                    continue
+                if self._samples - self._lastSeen[vpgid] >= self.capacity:
+                    del self._columns[vpgid], self._lastSeen[vpgid], self.names[vpgid]
+                    continue
+                for column in row:
+                    column[slot] = _NAN
+            self._samples += 1
+
+    def sample(self):
+        response = self.vpgs.getInfoAllVpgs()
+        if not response.ok:
+            raise Exception(f"HTTP: {response.status_code} - {response.reason}, Message: {response.text}")
+        self.record(response.json())
+
+    def collect(self, interval=60, stop=None):
+        """
+        Samples every interval seconds until stop is set. Failed samples are skipped.
+
+        Parameters
+        ----------
+        interval : float, optional
+            Seconds between two samples (default: 60)
+        stop : threading.Event, optional
+            collect returns once this event is set (default: run forever)
+        """
+
+        while stop is None or not stop.is_set():
+            started = time.monotonic()
+            try:
+                self.sample()
+            except Exception:
+                pass
+            delay = max(interval - (time.monotonic() - started), 0)
+            if stop is not None:
+                stop.wait(delay)
+            else:
+                time.sleep(delay)
+
+    def _ranges(self, window, end):
+        """
+        Returns the physical (start, stop) slices of the ring holding the samples taken in (end - window, end], oldest
+        first. Caller holds the lock.
+        """
+
+        count = len(self)
+        first = self._samples - count
+
+        def at(index):
+            return self._times[(first + index) % self.capacity]
+
+        def after(bound, low):
+            # First sample (in logical order, from low on) taken after bound
+            high = count
+            while low < high:
+                middle = (low + high) // 2
+                if at(middle) <= bound:
+                    low = middle + 1
+                else:
+                    high = middle
+            return low
+
+        if not count:
+            return []
+        end = at(count - 1) if end is None else end
+        begin = 0 if window is None else after(end - window, 0)
+        finish = after(end, begin)
+        if begin >= finish:
+            return []
+        begin, finish = (first + begin) % self.capacity, (first + finish - 1) % self.capacity + 1
+        if begin < finish:
+            return [(begin, finish)]
+        return [(begin, self.capacity), (0, finish)]
+
+    def _columns_of(self, vpgid):
+        row = self._columns.get(vpgid)
+        if row is None:
+            raise KeyError(f"Unknown VPG: {vpgid}")
+        return row
+
+    def values(self, vpgid, metric, window=None, end=None):
+        """
+        Returns the recorded values (NaN for samples the VPG was missing from) of metric for vpgid, oldest first.
+
+        Parameters
+        ----------
+        vpgid : str, required
+            Identifier of the VPG
+        metric : str, required
+            One of the collector's metrics
+        window : float, optional
+            Only the samples taken in the window seconds up to end (default: every sample kept)
+        end : float, optional
+            POSIX time the window ends at (default: the newest sample)
+
+        Returns
+        -------
+        type array.array of float32
+        """
+
+        with self._lock:
+            column = self._columns_of(vpgid)[self._column[metric]]
+            values = array('f')
+            for begin, finish in self._ranges(window, end):
+                values.extend(column[begin:finish])
+            return values
+
+    def stats(self, vpgid, metric, window=None, end=None, percentiles=(50, 95, 99)):
+        """
+        Returns the aggregates of metric for vpgid over a window (see values), ignoring the samples the VPG was
+        missing from.
+
+        Returns
+        -------
+        type dict
+            count, min, max, mean and p<N> for each requested percentile; all but count are None when there is no
+            value in the window
+        """
+
+        return aggregate(self.values(vpgid, metric, window, end), percentiles)
+
+    def summary(self, metric, window=None, end=None, percentiles=(50, 95, 99)):
+        """
+        Returns stats() of metric for every VPG. The values of all VPGs are copied from the same samples under one
+        lock, so a concurrent record() neither skews nor breaks the summary.
+
+        Returns
+        -------
+        type dict
+            VPG identifier -> stats dict
+        """
+
+        index = self._column[metric]
+        with self._lock:
+            ranges = self._ranges(window, end)
+            windows = {}
+            for vpgid, row in self._columns.items():
+                values = windows[vpgid] = array('f')
+                for begin, finish in ranges:
+                    values.extend(row[index][begin:finish])
+        return {vpgid: aggregate(values, percentiles) for vpgid, values in windows.items()}
@@ -0,0 +1,284 @@
+"""
+The zerto_models.py module contains compact record classes for the items returned by the large list endpoints:
+vpgRecord (vpgs.getInfoAllVpgs), volumeRecord (zvm.getAllVolumes), datastoreRecord (zvm.datastoreInfo), taskRecord
+(zvm.getAllTasks) and vmRecord (zvm.getUnprotectedVmsAtSite).
+
+Records store their fields in __slots__ under the API's own names, so record.VpgName is item['VpgName']. Nested
+sections (Entities, HistoryStatusApi, Status, Size, ...) are kept as plain tuples of values and only turned into
+records the first time they are accessed. Keys a record does not know about are kept as well, so that
+record.toDict() returns everything the ZVM sent.
+"""
+
+import sys
+
+_UNSET = object()
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def _slots(fields, sections):
+    return tuple(fields) + tuple('_' + name for name in sections)
+
+
+class zertoRecord:
+    """
+    The zertoRecord class is the base of all record classes.
+
+    Subclasses list the API keys stored as attributes in fields and the nested sections in sections (API key -> record
+    class), and declare __slots__ = _slots(fields, sections).
+
+    ...
+
+    Methods
+    -------
+    fromDict(data)
+        Builds a record from one item of an API response.
+    fromList(items)
+        Builds records from a response, a list, or a generator such as the ones returned with stream=True.
+    toDict()
+        Returns the item as the API returned it.
+    """
+
+    __slots__ = ('_extra',)
+    fields = ()
+    sections = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fieldSet = frozenset(cls.fields)
+        cls._order = tuple(cls.fields) + tuple(cls.sections)
+        cls._known = frozenset(cls._order)
+
+    def __init__(self, **values):
+        self._fill(values)
+
+    def _fill(self, data):
+        cls = type(self)
+        extra = None
+        for key, value in data.items():
+            if key in cls._fieldSet:
+                setattr(self, key, value)
+            elif key in cls.sections:
+                setattr(self, '_' + key, cls.sections[key]._pack(value))
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        self._extra = extra
+
+    @classmethod
+    def fromDict(cls, data):
+        record = cls.__new__(cls)
+        record._fill(data)
+        return record
+
+    @classmethod
+    def fromList(cls, items):
+        """
+        Parameters
+        ----------
+        items : requests.models.Response, list or iterable, required
+            The response of a list endpoint, its parsed payload, or a generator of items (see zerto_stream)
+
+        Returns
+        -------
+        type list of records
+        """
+
+        if hasattr(items, 'json'):
+            if not items.ok:
+                raise Exception(f"HTTP: {items.status_code} - {items.reason}, Message: {items.text}")
+            items = items.json()
+        return [cls.fromDict(item) for item in items]
+
+    @classmethod
+    def _pack(cls, value):
+        # Sections with keys this class does not know are kept as they came. Strings in sections (site links, entity
+        # types, datastore and VPG references) repeat across thousands of items, so one copy of each is kept.
+        if not isinstance(value, dict) or not value.keys() <= cls._known:
+            return value
+        return tuple(cls.sections[key]._pack(value[key]) if key in cls.sections and key in value
+                     else _intern(value.get(key, _UNSET)) for key in cls._order)
+
+    @classmethod
+    def _fromPacked(cls, packed):
+        record = cls.__new__(cls)
+        for key, value in zip(cls._order, packed):
+            if value is _UNSET:
+                continue
+            setattr(record, '_' + key if key in cls.sections else key, value)
+        record._extra = None
+        return record
+
+    @classmethod
+    def _unpack(cls, value):
+        if isinstance(value, zertoRecord):
+            return value.toDict()
+        if not isinstance(value, tuple):
+            return value
+        return {key: cls.sections[key]._unpack(item) if key in cls.sections else item
+                for key, item in zip(cls._order, value) if item is not _UNSET}
+
+    def __getattr__(self, name):
+        # Only called for names that are not set: absent fields, sections and unknown keys.
+        cls = type(self)
+        if name in cls.sections:
+            try:
+                value = object.__getattribute__(self, '_' + name)
+            except AttributeError:
+                return None
+            section = cls.sections[name]
+            if isinstance(value, tuple):
+                value = section._fromPacked(value)
+            elif isinstance(value, dict):
+                value = section.fromDict(value)
+            else:
+                return value
+            setattr(self, '_' + name, value)
+            return value
+        if name in cls._fieldSet:
+            return None
+        extra = object.__getattribute__(self, '_extra')
+        if extra and name in extra:
+            return extra[name]
+        raise AttributeError(f"{cls.__name__!r} object has no attribute {name!r}")
+
+    def toDict(self):
+        cls = type(self)
+        data = {}
+        for key in cls.fields:
+            try:
+                data[key] = object.__getattribute__(self, key)
+            except AttributeError:
+                pass
+        for key, section in cls.sections.items():
+            try:
+                data[key] = section._unpack(object.__getattribute__(self, '_' + key))
+            except AttributeError:
+                pass
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    def __getstate__(self):
+        return self.toDict()
+
+    def __setstate__(self, state):
+        self._fill(state)
+
+    def __eq__(self, other):
+        if not isinstance(other, zertoRecord):
+            return NotImplemented
+        return type(self) is type(other) and self.toDict() == other.toDict()
+
+    def __repr__(self):
+        shown = ', '.join(f"{key}={getattr(self, key)!r}" for key in type(self).fields[:2])
+        return f"{type(self).__name__}({shown})"
+
+
+class linkSection(zertoRecord):
+    fields = ('href', 'identifier', 'rel', 'type')
+    __slots__ = _slots(fields, {})
+
+
+class referenceSection(zertoRecord):
+    fields = ('Identifier', 'Name')
+    __slots__ = _slots(fields, {})
+
+
+class checkpointSection(zertoRecord):
+    fields = ('CheckpointIdentifier', 'Tag', 'TimeStamp')
+    __slots__ = _slots(fields, {})
+
+
+class vpgEntitiesSection(zertoRecord):
+    fields = ('Protected', 'Recovery', 'Source', 'Target')
+    __slots__ = _slots(fields, {})
+
+
+class vpgHistorySection(zertoRecord):
+    fields = ('ActualHistoryInMinutes', 'ConfiguredHistoryInMinutes')
+    sections = {'EarliestCheckpoint': checkpointSection}
+    __slots__ = _slots(fields, sections)
+
+
+class vpgFailSafeSection(zertoRecord):
+    fields = ('ActualFailSafeHistory', 'ConfiguredFailSafeHistory', 'FailSafeDescription')
+    __slots__ = _slots(fields, {})
+
+
+class vpgRecord(zertoRecord):
+    """
+    One item of vpgs.getInfoAllVpgs().
+    """
+
+    fields = ('VpgName', 'VpgIdentifier', 'Status', 'SubStatus', 'Priority', 'ActualRPO', 'ConfiguredRpoSeconds',
+              'VmsCount', 'ProgressPercentage', 'IOPs', 'ThroughputInMB', 'UsedStorageInMB', 'ProvisionedStorageInMB',
+              'OrganizationName', 'ServiceProfileName', 'ServiceProfileIdentifier', 'ZorgIdentifier', 'LastTest',
+              'BackupEnabled')
+    sections = {'Entities': vpgEntitiesSection, 'HistoryStatusApi': vpgHistorySection,
+                'FailSafeHistory': vpgFailSafeSection, 'ProtectedSite': linkSection, 'RecoverySite': linkSection,
+                'SourceSite': linkSection, 'TargetSite': linkSection, 'Link': linkSection}
+    __slots__ = _slots(fields, sections)
+
+
+class volumePathSection(zertoRecord):
+    fields = ('Full',)
+    __slots__ = _slots(fields, {})
+
+
+class volumeSizeSection(zertoRecord):
+    fields = ('ProvisionedInBytes', 'UsedInBytes')
+    __slots__ = _slots(fields, {})
+
+
+class volumeRecord(zertoRecord):
+    """
+    One item of zvm.getAllVolumes().
+    """
+
+    fields = ('VolumeIdentifier', 'VolumeType')
+    sections = {'Path': volumePathSection, 'Size': volumeSizeSection, 'Datastore': referenceSection,
+                'Vpg': referenceSection, 'Vm': referenceSection, 'OwningVm': referenceSection}
+    __slots__ = _slots(fields, sections)
+
+
+class datastoreHealthSection(zertoRecord):
+    fields = ('Status', 'Type', 'Description')
+    __slots__ = _slots(fields, {})
+
+
+class datastoreRecord(zertoRecord):
+    """
+    One item of zvm.datastoreInfo().
+    """
+
+    fields = ('DatastoreName', 'DatastoreIdentifier', 'DatastoreClusterIdentifier', 'DatastoreClusterName')
+    sections = {'Health': datastoreHealthSection, 'Link': linkSection}
+    __slots__ = _slots(fields, sections)
+
+
+class taskStatusSection(zertoRecord):
+    fields = ('Progress', 'State')
+    __slots__ = _slots(fields, {})
+
+
+class taskRecord(zertoRecord):
+    """
+    One item of zvm.getAllTasks().
+    """
+
+    fields = ('TaskIdentifier', 'Type', 'Initiator', 'Started', 'Completed', 'IsCancellable', 'CompleteReason')
+    sections = {'Status': taskStatusSection, 'Link': linkSection}
+    __slots__ = _slots(fields, sections)
+
+
+class vmRecord(zertoRecord):
+    """
+    One item of zvm.getUnprotectedVmsAtSite().
+    """
+
+    fields = ('VmName', 'VmIdentifier')
+    __slots__ = _slots(fields, {})
@@ -0,0 +1,148 @@
+"""
+The zerto_retry.py module contains the retry policy applied by zertoSession (and asyncZertoSession) when a ZVM or ZCA
+is temporarily unable to answer: 429/502/503/504 responses, reset connections and timeouts. Retries use capped
+exponential backoff with full jitter and honor the Retry-After header sent by the ZVM.
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+
+class retryPolicy:
+    """
+    The retryPolicy class decides whether a failed call is retried and how long to wait before the next attempt.
+
+    Only idempotent verbs (GET, HEAD, OPTIONS) are retried by default. POSTs create tasks on the ZVM (failovers, VRA
+    installs, ...) and are only retried when retry_post=True.
+
+    ...
+
+    Attributes
+    ----------
+    stats : dict
+        counters for 'attempts' (calls sent), 'retries' (calls repeated), 'exhausted' (calls that still failed after
+        the last retry) and 'retryAfter' (waits dictated by a Retry-After header)
+
+    Methods
+    -------
+    allows(method)
+        Returns True if calls made with this HTTP verb may be retried.
+    shouldRetry(method, attempt, status=None)
+        Returns True if the call should be attempted again.
+    delay(attempt, headers=None)
+        Returns the number of seconds to wait before the next attempt.
+    resetStats()
+        Sets all counters back to zero.
+    """
+
+    idempotentMethods = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, max_retries=4, backoff_base=0.5, backoff_cap=30.0, retry_statuses=(429, 502, 503, 504),
+                 retry_post=False, jitter=True, max_retry_after=120.0):
+        """
+        Parameters
+        ----------
+        max_retries : int, optional
+            How many times a call is repeated before the last response (or error) is returned to the caller
+            (default: 4).
+        backoff_base : float, optional
+            Upper bound in seconds of the first backoff; it doubles on every attempt (default: 0.5).
+        backoff_cap : float, optional
+            Maximum backoff in seconds between two attempts (default: 30).
+        retry_statuses : tuple, optional
+            HTTP statuses considered transient (default: 429, 502, 503, 504).
+        retry_post : bool, optional
+            Also retry POST, PUT and DELETE calls (default: False).
+        jitter : bool, optional
+            Wait a random time between 0 and the backoff instead of the full backoff, so that many clients do not
+            retry in lockstep (default: True).
+        max_retry_after : float, optional
+            Longest Retry-After, in seconds, that is honored as is; longer values are capped (default: 120).
+        """
+
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_post = retry_post
+        self.jitter = jitter
+        self.max_retry_after = max_retry_after
+        self._lock = threading.Lock()
+        self.resetStats()
+
+    def resetStats(self):
+        with self._lock:
+            self.stats = {'attempts': 0, 'retries': 0, 'exhausted': 0, 'retryAfter': 0}
+
+    def count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def allows(self, method):
+        return self.retry_post or method.upper() in self.idempotentMethods
+
+    def shouldRetry(self, method, attempt, status=None):
+        """
+        Parameters
+        ----------
+        method : str, required
+            HTTP verb of the call
+        attempt : int, required
+            Number of retries already made for this call
+        status : int, optional
+            HTTP status received; None when the call failed with a connection error or timeout
+
+        Returns
+        -------
+        type bool
+        """
+
+        if status is not None and status not in self.retry_statuses:
+            return False
+        if not self.allows(method):
+            return False
+        if attempt >= self.max_retries:
+            self.count('exhausted')
+            return False
+        self.count('retries')
+        return True
+
+    def retryAfter(self, headers):
+        """
+        Returns the wait in seconds requested by the Retry-After header found in headers, or None.
+        """
+
+        value = headers.get('Retry-After') if headers is not None else None
+        if not value:
+            return None
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                seconds = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return min(max(seconds, 0.0), self.max_retry_after)
+
+    def delay(self, attempt, headers=None):
+        """
+        Parameters
+        ----------
+        attempt : int, required
+            Number of retries already made for this call
+        headers : dict, optional
+            Headers of the response that is being retried, if any
+
+        Returns
+        -------
+        type float
+        """
+
+        requested = self.retryAfter(headers)
+        if requested is not None:
+            self.count('retryAfter')
+            return requested
+        backoff = min(self.backoff_cap, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, backoff) if self.jitter else backoff
@@ -0,0 +1,142 @@
+"""
+The zerto_rollout.py module contains the outcome and rollout base classes shared by the bulk operations (VRA
+installation, VPG creation, failover and failover tests): every item of a bulk operation gets an outcome with its
+result, task and timing, and the outcomes are gathered in a rollout that reports them and merges retries.
+"""
+
+import copy
+
+from .zerto_tasks import taskError
+
+
+def describeError(error):
+    """
+    Returns the text an outcome reports for an exception. The HTTP errors raised by this package (plain Exception) and
+    task failures (taskError) are reported by their message alone, other exceptions are prefixed with their type.
+    """
+
+    if type(error) is Exception or isinstance(error, taskError):
+        return str(error)
+    return f"{type(error).__name__}: {error}"
+
+
+def httpError(response):
+    """
+    Returns the text reported for a rejected request, in the format of the exceptions raised by the API classes.
+    """
+
+    return f"HTTP: {response.status_code} - {response.reason}, Message: {response.text}"
+
+
+class bulkOutcome:
+    """
+    The bulkOutcome class is the base of the classes holding the result of one item of a bulk operation.
+
+    Subclasses set key to the name of the attribute identifying the item, and fields to the attributes report()
+    returns after it.
+
+    ...
+
+    Attributes
+    ----------
+    ok : bool
+        True when the item completed successfully
+    taskid : str
+        identifier of the ZVM task, or None if none was started
+    task : dict
+        the last task information returned by the ZVM
+    error : str
+        why the item failed, or None
+    elapsed : float
+        seconds the item took
+
+    Methods
+    -------
+    fail(error)
+        Records an exception as the reason the item failed.
+    report()
+        Returns the key and fields of the outcome as a dict, with seconds rounded to a tenth.
+    """
+
+    key = None
+    fields = ('ok', 'taskid', 'elapsed', 'error')
+
+    def __init__(self):
+        self.ok = False
+        self.taskid = None
+        self.task = None
+        self.error = None
+        self.elapsed = 0.0
+
+    @property
+    def identity(self):
+        return getattr(self, self.key)
+
+    def fail(self, error):
+        if isinstance(error, taskError):
+            self.task = error.task
+        self.error = describeError(error)
+
+    def report(self):
+        row = {self.key: self.identity}
+        for field in self.fields:
+            value = getattr(self, field)
+            row[field] = round(value, 1) if isinstance(value, float) else value
+        return row
+
+    def __repr__(self):
+        stage = f", stage={self.stage!r}" if hasattr(self, 'stage') else ""
+        return (f"{type(self).__name__}({self.key}={self.identity!r}, ok={self.ok}{stage}, "
+                f"elapsed={self.elapsed:.1f}s, error={self.error!r})")
+
+
+class bulkRollout:
+    """
+    The bulkRollout class is the base of the classes holding the outcomes of a bulk operation.
+
+    ...
+
+    Attributes
+    ----------
+    outcomes : dict
+        key of the item -> outcome, in the order the items were given
+    elapsed : float
+        wall-clock seconds the whole operation took
+
+    Methods
+    -------
+    report()
+        Returns the report() of every outcome.
+    merge(retried)
+        Returns a rollout of the same class holding these outcomes updated with those of retried.
+    """
+
+    def __init__(self):
+        self.outcomes = {}
+        self.elapsed = 0.0
+
+    @property
+    def succeeded(self):
+        return [outcome for outcome in self.outcomes.values() if outcome.ok]
+
+    @property
+    def failed(self):
+        return [outcome for outcome in self.outcomes.values() if not outcome.ok]
+
+    @property
+    def ok(self):
+        return all(outcome.ok for outcome in self.outcomes.values())
+
+    def report(self):
+        return [outcome.report() for outcome in self.outcomes.values()]
+
+    def merge(self, retried):
+        merged = copy.copy(self)
+        merged.outcomes = dict(self.outcomes)
+        merged.outcomes.update(retried.outcomes)
+        merged.elapsed = self.elapsed + retried.elapsed
+        return merged
+
+    def __repr__(self):
+        return (f"{type(self).__name__}(succeeded={len(self.succeeded)}, failed={len(self.failed)}, "
+                f"elapsed={self.elapsed:.1f}s)")
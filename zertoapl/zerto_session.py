@@ -0,0 +1,209 @@
+"""
+The zerto_session.py module contains the pooled HTTP session that is shared by the zvm, vra, vpgs and vpgSettings
+classes. Reusing a single session keeps TCP/TLS connections to the ZVM or ZCA alive between API calls instead of
+performing a new handshake against port 9669 for every request.
+"""
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .zerto_cache import queryKey
+from .zerto_coalesce import singleFlight
+from .zerto_codec import attachCodec
+from .zerto_throttle import governorFor
+
+
+class zertoSession(requests.Session):
+    """
+    The zertoSession class is a connection-pooled requests.Session tuned for talking to a ZVM or ZCA.
+
+    ...
+
+    Attributes
+    ----------
+    pool_size : int
+        the maximum number of connections kept open per ZVM/ZCA host
+
+    keep_alive : bool
+        whether connections are kept open between requests
+
+    renewer : callable
+        called with the rejected token when the ZVM answers a request with a 401; must return fresh login headers (see
+        zerto_auth.login). None disables automatic renewal.
+
+    retry : retryPolicy
+        the policy applied to transient failures (see zerto_retry). None disables retries.
+
+    singleflight : singleFlight
+        coalesces concurrent identical GETs (see zerto_coalesce). None sends every GET.
+
+    cache : responseCache
+        serves GETs of rarely-changing endpoints from memory or disk (see zerto_cache). None disables caching.
+
+    codec : stdlibCodec or orjsonCodec
+        decodes response.json() and encodes json= request bodies (see zerto_codec). None leaves both to requests.
+    """
+
+    def __init__(self, pool_size=10, keep_alive=True, renewer=None, retry=None, coalesce=True, cache=None,
+                 codec=None):
+        """
+        Parameters
+        ----------
+        pool_size : int, optional
+            The maximum number of connections kept open per ZVM/ZCA host (default: 10). Set this to at least the
+            number of threads that will share the session.
+        keep_alive : bool, optional
+            Keep connections open between requests (default: True). When False, every request asks the ZVM to close
+            the connection once the response has been read.
+        renewer : callable, optional
+            Returns fresh login headers when the current token has expired.
+        retry : retryPolicy, optional
+            Retries transient failures (503s, connection resets, timeouts) with backoff. Calls are not retried when
+            omitted.
+        coalesce : bool, optional
+            Let concurrent identical GETs (same URL, query and token) share a single outstanding request and its
+            response (default: True).
+        cache : responseCache, optional
+            Caches responses of the endpoints listed in its TTL table. Nothing is cached when omitted.
+        codec : stdlibCodec or orjsonCodec, optional
+            JSON codec for response and request bodies, for example zerto_codec.defaultCodec(). requests' own
+            decoder is used when omitted.
+        """
+
+        super().__init__()
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.renewer = renewer
+        self.retry = retry
+        self.singleflight = singleFlight() if coalesce else None
+        self.cache = cache
+        self.codec = codec
+        self._renewLock = threading.Lock()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+        if not keep_alive:
+            self.headers['Connection'] = 'close'
+
+    def request(self, method, url, *args, **kwargs):
+        if self.codec is not None and kwargs.get('json') is not None:
+            kwargs = self.encodeBody(kwargs)
+        return attachCodec(self.dispatch(method, url, *args, **kwargs), self.codec)
+
+    def encodeBody(self, kwargs):
+        """
+        Replaces the json= keyword argument of a request with a body encoded by the codec.
+        """
+
+        kwargs = dict(kwargs)
+        kwargs['data'] = self.codec.encode(kwargs.pop('json'))
+        headers = kwargs.get('headers')
+        if headers is None or 'Content-Type' not in headers:
+            # The login headers are shared and updated in place on renewal, so they are only copied when needed.
+            kwargs['headers'] = dict(headers or {}, **{'Content-Type': 'application/json'})
+        return kwargs
+
+    def dispatch(self, method, url, *args, **kwargs):
+        """
+        Sends a request through the cache and the coalescing of identical GETs, when enabled. Any other verb sent to a
+        cached endpoint drops the cached responses of that endpoint.
+        """
+
+        if method.upper() != 'GET':
+            try:
+                return self.sendWithRetry(method, url, *args, **kwargs)
+            finally:
+                # A PUT, POST or DELETE on a cached endpoint (such as /license) makes its cached GET stale.
+                if self.cache is not None and self.cache.ttlFor(url):
+                    self.cache.invalidate(self.cache.endpoint(url), urlsplit(url).hostname)
+        if args or kwargs.get('stream'):
+            return self.sendWithRetry(method, url, *args, **kwargs)
+        cacheable = self.cache is not None and self.cache.ttlFor(url)
+        if cacheable:
+            response = self.cache.get(url, kwargs.get('params'))
+            if response is not None:
+                return response
+        if self.singleflight is not None:
+            response = self.singleflight.do(self.coalesceKey(url, kwargs),
+                                            lambda: self.sendWithRetry(method, url, **kwargs))
+        else:
+            response = self.sendWithRetry(method, url, **kwargs)
+        if cacheable:
+            self.cache.put(url, kwargs.get('params'), response)
+        return response
+
+    @staticmethod
+    def coalesceKey(url, kwargs):
+        headers = kwargs.get('headers') or {}
+        return url, queryKey(kwargs.get('params')), headers.get('x-zerto-session')
+
+    def sendWithRetry(self, method, url, *args, **kwargs):
+        """
+        Sends a request, repeating it according to the retry policy when the ZVM fails transiently.
+        """
+
+        attempt = 0
+        while True:
+            if self.retry is not None:
+                self.retry.count('attempts')
+            try:
+                response = self.sendAuthenticated(method, url, *args, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if self.retry is None or not self.retry.shouldRetry(method, attempt):
+                    raise
+                time.sleep(self.retry.delay(attempt))
+            else:
+                if self.retry is None or not self.retry.shouldRetry(method, attempt, response.status_code):
+                    return response
+                time.sleep(self.retry.delay(attempt, response.headers))
+                response.close()
+            attempt += 1
+
+    def sendAuthenticated(self, method, url, *args, **kwargs):
+        """
+        Sends a single request, renewing the token and replaying the request once if the ZVM answers with a 401.
+        """
+
+        headers = kwargs.get('headers')
+        sent = headers.get('x-zerto-session') if headers is not None else None
+        response = self.sendGoverned(method, url, *args, **kwargs)
+        if response.status_code == 401 and self.renewer is not None and sent is not None:
+            # Release the connection of the rejected response before the login and the replay take one from the pool.
+            response.close()
+            self.renewToken(headers, sent)
+            response = self.sendGoverned(method, url, *args, **kwargs)
+        return response
+
+    def sendGoverned(self, method, url, *args, **kwargs):
+        """
+        Sends a single request within the limits of the zvmGovernor registered for the target host, if any (see
+        zerto_throttle.configureGovernor).
+        """
+
+        governor = governorFor(url)
+        if governor is None:
+            return super().request(method, url, *args, **kwargs)
+        with governor.slot():
+            return super().request(method, url, *args, **kwargs)
+
+    def renewToken(self, headers, stale):
+        """
+        Replaces the x-zerto-session token in headers (in place) with a freshly issued one. The headers dict is the one
+        returned by zerto_auth.login and shared by every class built from it, so all of them pick up the new token.
+        Concurrent callers that hit a 401 with the same stale token trigger a single login.
+
+        Parameters
+        ----------
+        headers : dict, required
+            The login headers the rejected request was sent with
+        stale : str, required
+            The token the ZVM rejected
+        """
+
+        with self._renewLock:
+            if headers.get('x-zerto-session') == stale:
+                headers['x-zerto-session'] = self.renewer(stale)['x-zerto-session']
@@ -0,0 +1,93 @@
+"""
+The zerto_stream.py module decodes the large JSON lists returned by some endpoints (all VPG settings, events, volumes,
+checkpoints) one element at a time while the response is still being downloaded. Only the element being decoded and
+the undecoded part of the current chunk are held in memory, instead of the whole body and the whole object tree.
+"""
+
+import codecs
+import json
+
+_WHITESPACE = ' \t\n\r'
+# Characters that may follow a prefix of a number that raw_decode already accepts as a whole number
+_NUMBER = '0123456789.eE+-'
+
+
+def iterJsonArray(response, chunk_size=65536):
+    """
+    Yields the elements of the JSON array in the body of a response requested with stream=True.
+
+    Parameters
+    ----------
+    response : requests.models.Response, required
+        A response whose body has not been read yet
+    chunk_size : int, optional
+        Bytes read from the connection at a time (default: 65536)
+
+    Returns
+    -------
+    type generator of the decoded elements (dict, list, str, ...). The connection is released once the generator
+    is exhausted or closed.
+    """
+
+    if not response.ok:
+        raise Exception(f"HTTP: {response.status_code} - {response.reason}, Message: {response.text}")
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder(response.encoding or 'utf-8')()
+    chunks = response.iter_content(chunk_size)
+    buffer = ''
+    position = 0
+    started = False
+    # Length the buffer must reach before an element that failed to decode is tried again. Waiting for it to double
+    # keeps the cost linear when one element spans many chunks.
+    retryAt = 0
+    finished = False
+    try:
+        while True:
+            if not finished and (position >= len(buffer) or len(buffer) < retryAt):
+                chunk = next(chunks, None)
+                if chunk is None:
+                    finished = True
+                    buffer += text.decode(b'', final=True)
+                else:
+                    buffer = buffer[position:] + text.decode(chunk)
+                    retryAt -= position
+                    position = 0
+                    continue
+
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position >= len(buffer):
+                if finished:
+                    raise ValueError("Response body ended before the JSON array was closed")
+                continue
+
+            if not started:
+                if buffer[position] != '[':
+                    raise ValueError(f"Expected a JSON array, got {buffer[position:position + 20]!r}")
+                started = True
+                position += 1
+                continue
+            if buffer[position] == ']':
+                return
+            if buffer[position] == ',':
+                position += 1
+                continue
+
+            try:
+                element, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if finished:
+                    raise
+                retryAt = position + 2 * (len(buffer) - position)
+                continue
+            if not finished and (end >= len(buffer) or buffer[end] in _NUMBER):
+                # A number or literal ending at the end of the buffer may continue in the next chunk, and so may a
+                # number followed by its fraction or exponent ('1.' or '1e'), of which raw_decode only takes the
+                # integer part.
+                retryAt = len(buffer) + 1
+                continue
+            position = end
+            retryAt = 0
+            yield element
+    finally:
+        response.close()
@@ -0,0 +1,257 @@
+"""
+The zerto_tasks.py module contains the taskWaiter class, which waits for many ZVM tasks (failover, move, clone, VRA
+installation, ...) at once. A single background thread asks the ZVM for all tasks with one getAllTasks call per tick,
+instead of every caller polling getSingleTask for its own task, and resolves a future for each task as it finishes.
+"""
+
+import threading
+import time
+from concurrent import futures
+from concurrent.futures import Future
+
+# Values of a task's Status.State reported by the ZVM once it has finished
+TASK_COMPLETED_STATES = (6,)
+TASK_FAILED_STATES = (4, 5)
+
+
+def taskState(task):
+    """
+    Returns the Status.State of a task as returned by zvm.getSingleTask or zvm.getAllTasks.
+    """
+
+    return (task.get('Status') or {}).get('State')
+
+
+def taskProgress(task):
+    """
+    Returns the Status.Progress (percent) of a task as returned by zvm.getSingleTask or zvm.getAllTasks.
+    """
+
+    return (task.get('Status') or {}).get('Progress')
+
+
+class taskError(Exception):
+    """
+    Raised by the future of a task that ended in a failed state. The task information is kept in the task attribute.
+    """
+
+    def __init__(self, taskid, task):
+        super().__init__(f"Task {taskid} ended in state {taskState(task)}")
+        self.taskid = taskid
+        self.task = task
+
+
+class _watch:
+    __slots__ = ('future', 'deadline', 'misses', 'last')
+
+    def __init__(self, deadline):
+        self.future = Future()
+        self.deadline = deadline
+        self.misses = 0
+        self.last = None
+
+
+class taskWaiter:
+    """
+    The taskWaiter class follows any number of ZVM tasks with one getAllTasks call per tick.
+
+    The interval between ticks starts at min_interval and grows by half after every tick in which no watched task
+    made progress, up to max_interval; it drops back to min_interval as soon as a task progresses or a new task is
+    watched.
+
+    ...
+
+    Attributes
+    ----------
+    stats : dict
+        counters for 'ticks' (getAllTasks calls), 'singleLookups' (getSingleTask calls made for tasks missing from
+        the getAllTasks list), 'completed', 'failed' and 'timedOut'
+
+    Methods
+    -------
+    watch(taskid, callback=None, timeout=None)
+        Returns a concurrent.futures.Future resolved with the final task information.
+    wait(taskids, timeout=None)
+        Blocks until the given tasks have finished and returns their final task information.
+    close()
+        Stops the background thread; tasks still watched are cancelled.
+    """
+
+    def __init__(self, zvmobj, min_interval=1.0, max_interval=15.0, timeout=None,
+                 completed_states=TASK_COMPLETED_STATES, failed_states=TASK_FAILED_STATES):
+        """
+        Parameters
+        ----------
+        zvmobj : zvm, required
+            zvm instance used to query the tasks
+        min_interval : float, optional
+            Shortest time in seconds between two getAllTasks calls (default: 1)
+        max_interval : float, optional
+            Longest time in seconds between two getAllTasks calls (default: 15)
+        timeout : float, optional
+            Seconds a task may run before its future fails with TimeoutError (default: no limit)
+        completed_states : tuple, optional
+            Status.State values meaning the task succeeded (default: TASK_COMPLETED_STATES)
+        failed_states : tuple, optional
+            Status.State values meaning the task failed or was cancelled (default: TASK_FAILED_STATES)
+        """
+
+        self.zvm = zvmobj
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.timeout = timeout
+        self.completed_states = tuple(completed_states)
+        self.failed_states = tuple(failed_states)
+        self.stats = {'ticks': 0, 'singleLookups': 0, 'completed': 0, 'failed': 0, 'timedOut': 0}
+        self._watches = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._closed = False
+
+    def watch(self, taskid, callback=None, timeout=None):
+        """
+        Parameters
+        ----------
+        taskid : str, required
+            The task identifier returned by the API call that started the task
+        callback : callable, optional
+            Called with the future once the task has finished
+        timeout : float, optional
+            Seconds the task may run before its future fails with TimeoutError (default: the waiter's timeout)
+
+        Returns
+        -------
+        type concurrent.futures.Future. Its result is the final task information; it raises taskError when the task
+        failed and TimeoutError when it did not finish in time. Watching a task twice returns the same future.
+        """
+
+        timeout = timeout if timeout is not None else self.timeout
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("taskWaiter is closed")
+            watch = self._watches.get(taskid)
+            if watch is None:
+                watch = self._watches[taskid] = _watch(time.monotonic() + timeout if timeout else None)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='zerto-task-waiter', daemon=True)
+                self._thread.start()
+        if callback is not None:
+            watch.future.add_done_callback(callback)
+        self._wakeup.set()
+        return watch.future
+
+    def wait(self, taskids, timeout=None):
+        """
+        Parameters
+        ----------
+        taskids : list, required
+            The task identifiers to wait for
+        timeout : float, optional
+            Seconds to wait in total (default: until every task has finished)
+
+        Returns
+        -------
+        type dict: task identifier -> final task information, for every task that finished (successfully or not)
+        within timeout
+        """
+
+        watched = {taskid: self.watch(taskid) for taskid in taskids}
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        finished = {}
+        for taskid, future in watched.items():
+            remaining = max(deadline - time.monotonic(), 0) if deadline is not None else None
+            try:
+                finished[taskid] = future.result(remaining)
+            except taskError as error:
+                finished[taskid] = error.task
+            except (TimeoutError, futures.TimeoutError):
+                continue
+        return finished
+
+    def _resolve(self, taskid, watch, task):
+        state = taskState(task)
+        if state in self.completed_states:
+            self.stats['completed'] += 1
+            watch.future.set_result(task)
+        elif state in self.failed_states:
+            self.stats['failed'] += 1
+            watch.future.set_exception(taskError(taskid, task))
+        else:
+            return False
+        return True
+
+    def _tick(self):
+        response = self.zvm.getAllTasks()
+        self.stats['ticks'] += 1
+        if not response.ok:
+            return False
+        tasks = {task.get('TaskIdentifier'): task for task in response.json()}
+        progressed = False
+        with self._lock:
+            watches = list(self._watches.items())
+        for taskid, watch in watches:
+            task = tasks.get(taskid)
+            if task is None:
+                # Tasks age out of the getAllTasks list; after two misses ask for this one directly.
+                watch.misses += 1
+                if watch.misses < 2:
+                    continue
+                single = self.zvm.getSingleTask(taskid)
+                self.stats['singleLookups'] += 1
+                if not single.ok:
+                    continue
+                task = single.json()
+            if self._resolve(taskid, watch, task):
+                progressed = True
+            elif taskProgress(task) != watch.last:
+                watch.last = taskProgress(task)
+                progressed = True
+        return progressed
+
+    def _expire(self):
+        now = time.monotonic()
+        with self._lock:
+            for taskid, watch in list(self._watches.items()):
+                if watch.future.done():
+                    del self._watches[taskid]
+                elif watch.deadline is not None and now >= watch.deadline:
+                    del self._watches[taskid]
+                    self.stats['timedOut'] += 1
+                    watch.future.set_exception(TimeoutError(f"Task {taskid} did not finish in time"))
+            return bool(self._watches)
+
+    def _run(self):
+        interval = self.min_interval
+        while True:
+            with self._lock:
+                if self._closed:
+                    return
+            if self._wakeup.is_set():
+                self._wakeup.clear()
+                interval = self.min_interval
+            try:
+                progressed = self._tick()
+            except Exception:
+                progressed = False
+            interval = self.min_interval if progressed else min(interval * 1.5, self.max_interval)
+            if not self._expire():
+                # Nothing left to follow; sleep until a task is watched again.
+                self._wakeup.wait()
+                continue
+            self._wakeup.wait(interval)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            watches = list(self._watches.values())
+            self._watches.clear()
+        for watch in watches:
+            watch.future.cancel()
+        self._wakeup.set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
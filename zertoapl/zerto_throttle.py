@@ -0,0 +1,194 @@
+"""
+The zerto_throttle.py module contains the client-side rate limiter and concurrency governor that protect a ZVM or ZCA
+from being overwhelmed by parallel callers. Governors are registered per ZVM/ZCA host, so every zvm, vpgs, vpgSettings
+and vra call made through a zertoSession or asyncZertoSession to that host shares the same limits, no matter how many
+sessions, threads or tasks issue them.
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from urllib.parse import urlsplit
+
+
+class tokenBucket:
+    """
+    The tokenBucket class admits calls at a steady rate while allowing short bursts.
+
+    Methods
+    -------
+    reserve()
+        Takes one token and returns how many seconds the caller must wait before using it.
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        Parameters
+        ----------
+        rate : float, required
+            Calls per second admitted on average
+        burst : int, optional
+            Calls that may be made back to back after an idle period (default: rate, at least 1)
+        """
+
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(rate, 1))
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class zvmGovernor:
+    """
+    The zvmGovernor class bounds the calls made to a single ZVM/ZCA host: at most max_in_flight at a time and, when a
+    rate is set, no more than rate per second on average.
+
+    A caller waits for the rate limiter before it takes an in-flight slot, so callers that are only waiting for their
+    turn do not keep others from sending. The rate is shared by all threads and event loops. The in-flight cap is
+    shared by all threads, while asyncio callers are capped per event loop: each loop may have max_in_flight calls
+    outstanding in addition to those of the threads and of the other loops.
+
+    ...
+
+    Attributes
+    ----------
+    host : str
+        the ZVM/ZCA host the limits apply to
+
+    stats : dict
+        counters for 'calls' (calls admitted) and 'throttledSeconds' (total time callers waited for the rate limiter)
+
+    Methods
+    -------
+    slot()
+        Context manager that waits for the rate limiter, then holds one in-flight slot for the duration of a call.
+    asyncSlot()
+        Asynchronous counterpart of slot(), with an in-flight cap per event loop.
+    """
+
+    def __init__(self, host, rate=None, burst=None, max_in_flight=None):
+        """
+        Parameters
+        ----------
+        host : str, required
+            The ZVM/ZCA host (IP address or name, as used in the API URLs)
+        rate : float, optional
+            Calls per second admitted on average (default: unlimited)
+        burst : int, optional
+            Calls that may be made back to back after an idle period (default: rate)
+        max_in_flight : int, optional
+            Calls allowed to be outstanding at once (default: unlimited)
+        """
+
+        self.host = host
+        self.rate = rate
+        self.max_in_flight = max_in_flight
+        self.bucket = tokenBucket(rate, burst) if rate else None
+        self._semaphore = threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+        self._asyncSemaphores = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.stats = {'calls': 0, 'throttledSeconds': 0.0}
+
+    def _admit(self):
+        wait = self.bucket.reserve() if self.bucket is not None else 0.0
+        with self._lock:
+            self.stats['calls'] += 1
+            self.stats['throttledSeconds'] += wait
+        return wait
+
+    @contextmanager
+    def slot(self):
+        wait = self._admit()
+        if wait:
+            time.sleep(wait)
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+        try:
+            yield
+        finally:
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    def _asyncSemaphore(self):
+        # asyncio primitives belong to one event loop; keep one semaphore per loop, for as long as the loop exists.
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._asyncSemaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._asyncSemaphores[loop] = asyncio.Semaphore(self.max_in_flight)
+            return semaphore
+
+    @asynccontextmanager
+    async def asyncSlot(self):
+        wait = self._admit()
+        if wait:
+            await asyncio.sleep(wait)
+        semaphore = self._asyncSemaphore() if self.max_in_flight else None
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            yield
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+
+governors = {}
+_registryLock = threading.Lock()
+
+
+def configureGovernor(host, rate=None, burst=None, max_in_flight=None):
+    """
+    Installs (or replaces) the limits applied to every call made to host and returns the new zvmGovernor.
+
+    Parameters
+    ----------
+    host : str, required
+        The ZVM/ZCA host (IP address or name, as used in the API URLs)
+    rate : float, optional
+        Calls per second admitted on average (default: unlimited)
+    burst : int, optional
+        Calls that may be made back to back after an idle period (default: rate)
+    max_in_flight : int, optional
+        Calls allowed to be outstanding at once; asyncio callers are counted per event loop (default: unlimited)
+
+    Returns
+    -------
+    type zvmGovernor
+    """
+
+    governor = zvmGovernor(host, rate, burst, max_in_flight)
+    with _registryLock:
+        governors[host] = governor
+    return governor
+
+
+def removeGovernor(host):
+    """
+    Lifts the limits applied to host.
+    """
+
+    with _registryLock:
+        governors.pop(host, None)
+
+
+def governorFor(url):
+    """
+    Returns the zvmGovernor registered for the host of url, or None when calls to that host are not limited.
+    """
+
+    if not governors:
+        return None
+    return governors.get(urlsplit(url).hostname)
@@ -0,0 +1,302 @@
+"""
+The zerto_vpgbulk.py module contains the bulkVpgCreator class, which protects long lists of VMs. The VMs are split into
+VPGs that stay under a VM count and a size limit, the VPG settings objects are created and committed with bounded
+concurrency, and the commit tasks are followed by a taskWaiter so that every VPG gets an outcome and a timing.
+"""
+
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .zerto_codec import defaultCodec
+from .zerto_rollout import bulkOutcome, bulkRollout, httpError
+from .zerto_tasks import taskWaiter
+
+# keys of a VM dict that are only used for planning and are not sent to the ZVM
+LOCAL_KEYS = ('SizeInMb', 'VmName')
+
+
+def vmIdentifier(vm):
+    return vm if isinstance(vm, str) else vm['VmIdentifier']
+
+
+def vmSize(vm):
+    return 0 if isinstance(vm, str) else vm.get('SizeInMb') or 0
+
+
+def vmSettings(vm):
+    if isinstance(vm, str):
+        return {'VmIdentifier': vm}
+    return {key: value for key, value in vm.items() if key not in LOCAL_KEYS}
+
+
+def chunkVms(vms, max_vms=50, max_size_mb=None):
+    """
+    Splits vms into lists of at most max_vms VMs whose SizeInMb add up to at most max_size_mb.
+
+    VMs keep the order they are given in, so VMs listed next to each other (the tiers of one application, say) share a
+    VPG when the limits allow it. A VM larger than max_size_mb gets a VPG of its own.
+
+    Parameters
+    ----------
+    vms : list, required
+        VM identifiers, or dicts with a VmIdentifier key and optionally SizeInMb, VmName and per-VM VPG settings
+    max_vms : int, optional
+        Most VMs in one VPG (default: 50)
+    max_size_mb : int, optional
+        Most provisioned MB in one VPG (default: no limit)
+
+    Returns
+    -------
+    type list of lists
+    """
+
+    if max_vms < 1:
+        raise ValueError("max_vms must be at least 1")
+    chunks, current, size = [], [], 0
+    for vm in vms:
+        vmsize = vmSize(vm)
+        if current and (len(current) >= max_vms or (max_size_mb is not None and size + vmsize > max_size_mb)):
+            chunks.append(current)
+            current, size = [], 0
+        current.append(vm)
+        size += vmsize
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class vpgOutcome(bulkOutcome):
+    """
+    The vpgOutcome class holds the result of creating one VPG (see zerto_rollout.bulkOutcome).
+
+    ...
+
+    Attributes
+    ----------
+    name : str
+        name of the VPG
+    vms : list
+        the VMs the VPG protects, as given to the creator
+    ok : bool
+        True when the commit task completed successfully
+    stage : str
+        the last step reached: 'create', 'commit', 'commit-unknown' (the commit request failed without an answer, so
+        the VPG may or may not have been created), 'task' or 'done'
+    settingsid : str
+        identifier of the VPG settings object, or None if it was never created
+    taskid : str
+        identifier of the commit task, or None if the settings object was never committed
+    task : dict
+        the last task information returned by the ZVM
+    error : str
+        why the VPG was not created, or None
+    elapsed : float
+        seconds from the creation of the settings object until the task finished (or the failure was detected)
+    """
+
+    key = 'name'
+    fields = ('vms', 'sizeInMb', 'ok', 'stage', 'taskid', 'elapsed', 'error')
+
+    def __init__(self, name, vms):
+        super().__init__()
+        self.name = name
+        self.vms = vms
+        self.stage = 'create'
+        self.settingsid = None
+
+    @property
+    def sizeInMb(self):
+        return sum(vmSize(vm) for vm in self.vms)
+
+    def report(self):
+        return dict(super().report(), vms=len(self.vms))
+
+
+class vpgRollout(bulkRollout):
+    """
+    The vpgRollout class holds the outcomes of a bulk protection (see zerto_rollout.bulkRollout).
+
+    ...
+
+    Attributes
+    ----------
+    outcomes : dict
+        VPG name -> vpgOutcome, in creation order
+    elapsed : float
+        wall-clock seconds the whole rollout took
+
+    Methods
+    -------
+    report()
+        Returns one dict per VPG (name, vms, sizeInMb, ok, stage, taskid, elapsed, error).
+    """
+
+
+class bulkVpgCreator:
+    """
+    The bulkVpgCreator class protects many VMs by creating and committing VPGs with bounded concurrency.
+
+    Every VPG is built from template, a VPG settings body as in examples/vpgObject.json (Basic, Journal, Recovery,
+    Networks, ...). Basic.Name is set to the VPG's name and Vms to the VMs of its chunk. A settings object whose commit
+    is rejected is deleted so that it does not stay open on the ZVM.
+
+    ...
+
+    Methods
+    -------
+    plan(vms, prefix)
+        Returns the VPG names and VM chunks that protect(vms, prefix) would create.
+    payload(name, vms)
+        Builds the settings body of one VPG.
+    protect(vms, prefix)
+        Creates the VPGs protecting vms and returns a vpgRollout.
+    retryFailed(rollout)
+        Creates the VPGs of rollout that were not committed again and returns the merged vpgRollout.
+    """
+
+    def __init__(self, settingsobj, zvmobj, template, max_vms=50, max_size_mb=None, max_concurrent=4,
+                 timeout=3600.0, name_format='{prefix}-{index:03d}', waiter=None, codec=None):
+        """
+        Parameters
+        ----------
+        settingsobj : vpgSettings, required
+            vpgSettings instance the settings objects are created and committed through
+        zvmobj : zvm, required
+            zvm instance used to follow the commit tasks
+        template : dict, required
+            VPG settings body every VPG is built from
+        max_vms : int, optional
+            Most VMs in one VPG (default: 50)
+        max_size_mb : int, optional
+            Most provisioned MB in one VPG, summed from the SizeInMb of the VMs (default: no limit)
+        max_concurrent : int, optional
+            VPGs being created at the same time (default: 4)
+        timeout : float, optional
+            Seconds a commit task may run before the VPG is reported as failed (default: 3600)
+        name_format : str, optional
+            Format of the VPG names, given prefix and the 1-based index (default: '{prefix}-{index:03d}')
+        waiter : taskWaiter, optional
+            Waiter following the commit tasks, shared with other callers (default: a private one on zvmobj)
+        codec : stdlibCodec or orjsonCodec, optional
+            JSON codec used to encode the settings bodies (default: zerto_codec.defaultCodec())
+        """
+
+        self.settings = settingsobj
+        self.zvm = zvmobj
+        self.template = template
+        self.max_vms = max_vms
+        self.max_size_mb = max_size_mb
+        self.max_concurrent = max_concurrent
+        self.timeout = timeout
+        self.name_format = name_format
+        self.waiter = waiter if waiter is not None else taskWaiter(zvmobj)
+        self.codec = codec if codec is not None else defaultCodec()
+
+    def plan(self, vms, prefix):
+        """
+        Splits vms into VPGs without contacting the ZVM.
+
+        Returns
+        -------
+        type list of (name, vms) tuples
+        """
+
+        return [(self.name_format.format(prefix=prefix, index=index), chunk)
+                for index, chunk in enumerate(chunkVms(vms, self.max_vms, self.max_size_mb), 1)]
+
+    def payload(self, name, vms):
+        body = copy.deepcopy(self.template)
+        body.setdefault('Basic', {})['Name'] = name
+        body['Vms'] = [vmSettings(vm) for vm in vms]
+        return body
+
+    def _createOne(self, name, vms):
+        outcome = vpgOutcome(name, vms)
+        start = time.monotonic()
+        try:
+            response = self.settings.createNewVpgSettingsObject(self.codec.encode(self.payload(name, vms)))
+            if not response.ok:
+                outcome.error = httpError(response)
+                return outcome
+            outcome.settingsid = response.json()
+            outcome.stage = 'commit'
+            try:
+                response = self.settings.commitSettingsObject(outcome.settingsid)
+                if response.ok:
+                    outcome.taskid = response.json()
+            except Exception:
+                # The ZVM may have accepted the commit before the connection failed or the answer proved unreadable.
+                outcome.stage = 'commit-unknown'
+                raise
+            if not response.ok:
+                outcome.error = httpError(response)
+                self.settings.deleteSettingsObject(outcome.settingsid)
+                return outcome
+            outcome.stage = 'task'
+            outcome.task = self.waiter.watch(outcome.taskid, timeout=self.timeout).result()
+            outcome.stage = 'done'
+            outcome.ok = True
+        except Exception as error:
+            outcome.fail(error)
+            if outcome.stage == 'commit-unknown':
+                self._discard(outcome.settingsid)
+        finally:
+            outcome.elapsed = time.monotonic() - start
+        return outcome
+
+    def _discard(self, settingsid):
+        """
+        Deletes a settings object whose commit may not have been accepted. The ZVM rejects the deletion of a settings
+        object it has already committed, so this is harmless when the commit went through.
+        """
+
+        try:
+            self.settings.deleteSettingsObject(settingsid)
+        except Exception:
+            pass
+
+    def _run(self, planned):
+        rollout = vpgRollout()
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max(self.max_concurrent, 1)) as executor:
+            for outcome in executor.map(lambda item: self._createOne(*item), planned):
+                rollout.outcomes[outcome.name] = outcome
+        rollout.elapsed = time.monotonic() - start
+        return rollout
+
+    def protect(self, vms, prefix):
+        """
+        Creates the VPGs protecting vms.
+
+        Parameters
+        ----------
+        vms : list, required
+            VM identifiers, or dicts as described in chunkVms
+        prefix : str, required
+            Prefix of the VPG names
+
+        Returns
+        -------
+        type vpgRollout
+        """
+
+        return self._run(self.plan(vms, prefix))
+
+    def retryFailed(self, rollout):
+        """
+        Creates the VPGs that failed in rollout again, with the same names and VMs, keeping the outcomes of the VPGs
+        that succeeded.
+
+        Only VPGs whose settings object could not be created or whose commit was rejected are retried. A VPG that
+        failed at the 'task' stage was accepted by the ZVM; its commit task timed out or failed after the VPG was
+        created, so creating it again would duplicate it. A VPG at the 'commit-unknown' stage may have been accepted
+        before its commit request failed. Such outcomes are kept as they are for the caller to check.
+
+        Returns
+        -------
+        type vpgRollout
+        """
+
+        return rollout.merge(self._run([(outcome.name, outcome.vms) for outcome in rollout.failed
+                                        if outcome.stage not in ('task', 'commit-unknown')]))
@@ -0,0 +1,195 @@
+"""
+The zerto_vrainstall.py module contains the bulkVraInstaller class, which installs VRAs on many hosts at once. Host,
+datastore and network names are resolved through a shared inventoryIndex, installations are submitted with bounded
+concurrency, and the resulting ZVM tasks are followed to completion by a taskWaiter so that every host gets an outcome
+and a timing. Hosts that failed can be installed again without touching the ones that succeeded.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .zerto_codec import defaultCodec
+from .zerto_rollout import bulkOutcome, bulkRollout, httpError
+from .zerto_tasks import taskWaiter
+
+
+class vraOutcome(bulkOutcome):
+    """
+    The vraOutcome class holds the result of installing a VRA on one host (see zerto_rollout.bulkOutcome).
+
+    ...
+
+    Attributes
+    ----------
+    spec : dict
+        the spec the installation was made from
+    ok : bool
+        True when the installation task completed successfully
+    taskid : str
+        identifier of the ZVM task, or None if the installation was never submitted
+    task : dict
+        the last task information returned by the ZVM
+    error : str
+        why the installation failed, or None
+    elapsed : float
+        seconds from submission until the task finished (or the failure was detected)
+    """
+
+    key = 'host'
+
+    def __init__(self, spec):
+        super().__init__()
+        self.spec = spec
+
+    @property
+    def host(self):
+        return self.spec['host']
+
+
+class vraRollout(bulkRollout):
+    """
+    The vraRollout class holds the outcomes of a bulk installation (see zerto_rollout.bulkRollout). succeeded and
+    failed list the specs of the hosts, so that failed can be passed to install() again.
+
+    ...
+
+    Attributes
+    ----------
+    outcomes : dict
+        host name -> vraOutcome
+    elapsed : float
+        wall-clock seconds the whole rollout took
+    """
+
+    @property
+    def succeeded(self):
+        return [outcome.spec for outcome in self.outcomes.values() if outcome.ok]
+
+    @property
+    def failed(self):
+        return [outcome.spec for outcome in self.outcomes.values() if not outcome.ok]
+
+
+class bulkVraInstaller:
+    """
+    The bulkVraInstaller class installs VRAs on many hosts with bounded concurrency.
+
+    Each spec is a dict with the keys host, datastore, network, ip, subnet and gateway (names as shown in the
+    hypervisor manager), and optionally ram (GB, default 3), hostpass, key (use the public key instead of the host root
+    password, default True) and group (VRA group name).
+
+    ...
+
+    Methods
+    -------
+    payload(spec, resolved)
+        Builds the installVRA body for one spec.
+    install(specs)
+        Installs a VRA for every spec and returns a vraRollout.
+    retryFailed(rollout)
+        Installs the failed hosts of rollout again and returns the merged vraRollout.
+    """
+
+    def __init__(self, vraobj, zvmobj, inventory, max_concurrent=5, timeout=3600.0, waiter=None, codec=None):
+        """
+        Parameters
+        ----------
+        vraobj : vra, required
+            vra instance the installations are submitted through
+        zvmobj : zvm, required
+            zvm instance used to follow the installation tasks
+        inventory : inventoryIndex, required
+            index used to resolve host, datastore and network names
+        max_concurrent : int, optional
+            Installations running at the same time (default: 5)
+        timeout : float, optional
+            Seconds an installation task may run before the host is reported as failed (default: 3600)
+        waiter : taskWaiter, optional
+            Waiter following the installation tasks, shared with other callers (default: a private one on zvmobj)
+        codec : stdlibCodec or orjsonCodec, optional
+            JSON codec used to encode the installation requests (default: zerto_codec.defaultCodec())
+        """
+
+        self.vra = vraobj
+        self.zvm = zvmobj
+        self.inventory = inventory
+        self.max_concurrent = max_concurrent
+        self.timeout = timeout
+        self.waiter = waiter if waiter is not None else taskWaiter(zvmobj)
+        self.codec = codec if codec is not None else defaultCodec()
+
+    def payload(self, spec, resolved):
+        return {
+            "DatastoreIdentifier": resolved['datastores'][spec['datastore']],
+            "GroupName": spec.get('group'),
+            "HostIdentifier": resolved['hosts'][spec['host']],
+            "HostRootPassword": spec.get('hostpass'),
+            "MemoryInGb": spec.get('ram', 3),
+            "NetworkIdentifier": resolved['networks'][spec['network']],
+            "UsePublicKeyInsteadOfCredentials": spec.get('key', True),
+            "VraNetworkDataApi": {
+                "DefaultGateway": spec['gateway'],
+                "SubnetMask": spec['subnet'],
+                "VraIPAddress": spec['ip'],
+                "VraIPConfigurationTypeApi": "Static"
+            }
+        }
+
+    def _installOne(self, spec, resolved):
+        outcome = vraOutcome(spec)
+        start = time.monotonic()
+        try:
+            missing = [f"{collection[:-1]} {spec[field]!r}" for collection, field in
+                       (('datastores', 'datastore'), ('hosts', 'host'), ('networks', 'network'))
+                       if resolved[collection][spec[field]] is None]
+            if missing:
+                outcome.error = "Unknown " + ", ".join(missing)
+                return outcome
+            response = self.vra.installVRA(self.codec.encode(self.payload(spec, resolved)))
+            if not response.ok:
+                outcome.error = httpError(response)
+                return outcome
+            outcome.taskid = response.json()
+            outcome.task = self.waiter.watch(outcome.taskid, timeout=self.timeout).result()
+            outcome.ok = True
+        except Exception as error:
+            outcome.fail(error)
+        finally:
+            outcome.elapsed = time.monotonic() - start
+        return outcome
+
+    def install(self, specs):
+        """
+        Installs a VRA for every spec.
+
+        Parameters
+        ----------
+        specs : list, required
+            One dict per host, as described in the class documentation
+
+        Returns
+        -------
+        type vraRollout
+        """
+
+        rollout = vraRollout()
+        start = time.monotonic()
+        resolved = self.inventory.resolve(datastores={spec['datastore'] for spec in specs},
+                                          hosts={spec['host'] for spec in specs},
+                                          networks={spec['network'] for spec in specs})
+        with ThreadPoolExecutor(max_workers=max(self.max_concurrent, 1)) as executor:
+            for outcome in executor.map(lambda spec: self._installOne(spec, resolved), specs):
+                rollout.outcomes[outcome.host] = outcome
+        rollout.elapsed = time.monotonic() - start
+        return rollout
+
+    def retryFailed(self, rollout):
+        """
+        Installs the hosts that failed in rollout again, keeping the outcomes of the hosts that succeeded.
+
+        Returns
+        -------
+        type vraRollout
+        """
+
+        return rollout.merge(self.install(rollout.failed))
@@ -1,14 +1,17 @@
-import zerto_auth
-from zvm import zvm
-from vra import vra, vraObject
-from vpg import vpgs, vpgSettings
+from . import zerto_auth
+from .zerto_session import zertoSession
+from .zerto_throttle import configureGovernor
+from .zerto_codec import defaultCodec
 import sys
-import json
+
+# The component classes (zvm, vra, vpgs, ...) are imported by the methods that build them, so that importing the
+# client does not load vpg.py and the helper modules until they are used.
 
 
 class zertoapl:
-    def __init__(self, zvm_ip, zvm_user, zvm_password, vpgid=None, vmid=None, nicid=None, volumeid=None):
-        self.session = zerto_auth.login(zvm_ip, zvm_user, zvm_password)
+    def __init__(self, zvm_ip, zvm_user, zvm_password, vpgid=None, vmid=None, nicid=None, volumeid=None,
+                 pool_size=10, keep_alive=True, tokenstore=None, retry=None, rate_limit=None, max_in_flight=None,
+                 cache=None, codec=None):
         self.zvm_ip = zvm_ip
         self.zvm_user = zvm_user
         self.zvm_password = zvm_password
@@ -16,15 +19,93 @@ class zertoapl:
         self.vmid = vmid
         self.nicid = nicid
         self.volumeid = volumeid
+        if rate_limit or max_in_flight:
+            configureGovernor(zvm_ip, rate=rate_limit, max_in_flight=max_in_flight)
+        self.tokenstore = tokenstore
+        self.retry = retry
+        self.cache = cache
+        self.codec = codec if codec is not None else defaultCodec()
+        self.httpsession = zertoSession(pool_size=pool_size, keep_alive=keep_alive, renewer=self.renewSession,
+                                        retry=self.retry, cache=self.cache, codec=self.codec)
+        self.session = zerto_auth.login(zvm_ip, zvm_user, zvm_password, httpsession=self.httpsession,
+                                        tokenstore=self.tokenstore)
+        self._inventory = None
+        self._taskWaiter = None
+
+    def renewSession(self, rejected_token=None):
+        return zerto_auth.login(self.zvm_ip, self.zvm_user, self.zvm_password, httpsession=self.httpsession,
+                                tokenstore=self.tokenstore, rejected_token=rejected_token)
 
     def zvm(self):
-        return zvm(self.zvm_ip, self.session)
+        from .zvm import zvm
+        return zvm(self.zvm_ip, self.session, httpsession=self.httpsession)
+
+    def inventory(self, refresh=False):
+        if self._inventory is None:
+            from .zerto_inventory import inventoryIndex
+            self._inventory = inventoryIndex(self.zvm())
+        elif refresh:
+            self._inventory.refresh()
+        return self._inventory
 
     def vra(self):
-        return vra(self.zvm_ip, self.session)
+        from .vra import vra
+        return vra(self.zvm_ip, self.session, httpsession=self.httpsession)
     
+    def taskWaiter(self):
+        if self._taskWaiter is None:
+            from .zerto_tasks import taskWaiter
+            self._taskWaiter = taskWaiter(self.zvm())
+        return self._taskWaiter
+
+    def checkpointIndex(self, vpgid, since=None):
+        from .zerto_checkpoints import checkpointIndex
+        return checkpointIndex(self.vpgs(), vpgid, since)
+
+    def checkpointTagger(self, **kwargs):
+        from .zerto_checkpoints import checkpointTagger
+        kwargs.setdefault('codec', self.codec)
+        return checkpointTagger(self.vpgs(), **kwargs)
+
+    def rpoCollector(self, **kwargs):
+        from .zerto_metrics import rpoCollector
+        return rpoCollector(self.vpgs(), **kwargs)
+
+    def eventTail(self, path=None, **filters):
+        from .zerto_events import eventTail
+        return eventTail(self.zvm(), path, **filters)
+
+    def alertWatcher(self, **kwargs):
+        from .zerto_alerts import alertWatcher
+        return alertWatcher(self.zvm(), **kwargs)
+
+    def bulkVraInstaller(self, **kwargs):
+        from .zerto_vrainstall import bulkVraInstaller
+        kwargs.setdefault('waiter', self.taskWaiter())
+        kwargs.setdefault('codec', self.codec)
+        return bulkVraInstaller(self.vra(), self.zvm(), self.inventory(), **kwargs)
+
+    def bulkVpgCreator(self, template, **kwargs):
+        from .zerto_vpgbulk import bulkVpgCreator
+        kwargs.setdefault('waiter', self.taskWaiter())
+        kwargs.setdefault('codec', self.codec)
+        return bulkVpgCreator(self.vpgsettings(), self.zvm(), template, **kwargs)
+
+    def failoverOrchestrator(self, **kwargs):
+        from .zerto_failover import failoverOrchestrator
+        kwargs.setdefault('waiter', self.taskWaiter())
+        kwargs.setdefault('codec', self.codec)
+        return failoverOrchestrator(self.vpgs(), self.zvm(), **kwargs)
+
+    def failoverTestRunner(self, **kwargs):
+        from .zerto_failovertest import failoverTestRunner
+        kwargs.setdefault('waiter', self.taskWaiter())
+        kwargs.setdefault('codec', self.codec)
+        return failoverTestRunner(self.vpgs(), self.zvm(), **kwargs)
+
     def vraObject(self):
-        return vraObject(self.zvm_ip, self.session, self.datastore, self.host, self.network, self.ram, self.ip, self.subnet, self.gateway,self.hostpass, self.key )
+        from .vra import vraObject
+        return vraObject(self.zvm_ip, self.session, self.datastore, self.host, self.network, self.ram, self.ip, self.subnet, self.gateway,self.hostpass, self.key, httpsession=self.httpsession)
     
     def createNewVraObject(self, datastore, host, network, 
     ram, ip, subnet, gateway, hostpass=None, key=True, VERBOSE=True):
@@ -45,17 +126,20 @@ class zertoapl:
                 "VraIPConfigurationTypeApi":"Static"
                 }
         }
-        returnObject["DatastoreIdentifier"] = zvm(self.zvm_ip, self.session).getDatastoreGuid(datastore_name)
-        returnObject["HostIdentifier"] = zvm(self.zvm_ip, self.session).getHostGuid(host_name)
-        returnObject["NetworkIdentifier"] = zvm(self.zvm_ip, self.session).getNetworkGuid(network_name)
+        inventory = self.inventory()
+        returnObject["DatastoreIdentifier"] = inventory.datastoreGuid(datastore_name)
+        returnObject["HostIdentifier"] = inventory.hostGuid(host_name)
+        returnObject["NetworkIdentifier"] = inventory.networkGuid(network_name)
 
-        return json.dumps(returnObject)
+        return self.codec.dumps(returnObject)
 
     def vpgs(self):
-        return vpgs(self.zvm_ip, self.session, self.vpgid)
+        from .vpg import vpgs
+        return vpgs(self.zvm_ip, self.session, self.vpgid, httpsession=self.httpsession)
 
     def vpgsettings(self):
+        from .vpg import vpgSettings
         return vpgSettings(self.zvm_ip, self.session, self.vpgid, self.vmid, 
-        self.nicid, self.volumeid)
+        self.nicid, self.volumeid, httpsession=self.httpsession)
 
 
@@ -4,7 +4,8 @@ The zvm.py module contains properly-formatted API calls for various Zerto Virtua
 """
 
 import json
-import requests
+
+from .zerto_stream import iterJsonArray
 
 
 class zvm:
@@ -26,6 +27,9 @@ class zvm:
             'x-zerto-session': str-type containing valid session key generated with zerto_auth.py
         }
 
+    httpsession : requests.Session
+        the session (and connection pool) used for every API call
+
     Methods
     -------
     infoAllAlerts(alertid=None)
@@ -55,11 +59,11 @@ class zvm:
     datastoreSingleInfo(datastoreid)
         Returns information on a specific datastore locally available for use as a replication target.
 
-    allEvents()
+    allEvents(stream=False)
         Returns information on all (recent) events stored by the ZVM.
 
-    filteredEvents()
-        UNDER CONSTRUCTION. Function not yet usable.
+    filteredEvents(startdate=None, enddate=None, vpg=None, ...)
+        Returns information on the events matching the given filters.
 
     getSingleEvent(eventid)
         Returns information on a single event currently stored by the ZVM.
@@ -181,11 +185,11 @@ class zvm:
     getSecurityGroups(siteidentifier)
         Returns information about available security groups at the specified site.
 
-    getAllVolumes()
+    getAllVolumes(stream=False)
         Returns information about available volumes visible to the ZVM/ZCA.
     """
 
-    def __init__(self, zvmip, headerwithkey):
+    def __init__(self, zvmip, headerwithkey, httpsession=None):
         """
         Parameters
         ----------
@@ -198,10 +202,17 @@ class zvm:
                     'Content-Type': 'application/json'
                     'x-zerto-session': str-type containing valid session key generated with zerto_auth.py
                 }
+        httpsession : requests.Session, optional
+            A (pooled) session shared with other classes, such as the zertoSession created by the zertoapl class. A
+            private session is created when none is given.
         """
 
         self.zvmurl = 'https://' + zvmip + ':9669/v1'
         self.headerwithkey = headerwithkey
+        if httpsession is None:
+            import requests
+            httpsession = requests.Session()
+        self.httpsession = httpsession
         
 
     def infoAllAlerts(self):
@@ -213,7 +224,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/alerts', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/alerts', headers=self.headerwithkey, verify=False)
 
     def infoSingleAlert(self, alertid):
         """
@@ -229,7 +240,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/alerts/' + str(alertid), headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/alerts/' + str(alertid), headers=self.headerwithkey, verify=False)
 
     def validAlertEntitiesValues(self):
         """
@@ -240,7 +251,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/alerts/entities', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/alerts/entities', headers=self.headerwithkey, verify=False)
 
     def validAlertHelpIdentifiersValues(self):
         """
@@ -252,7 +263,7 @@ class zvm:
 
         """
 
-        return requests.get(self.zvmurl + '/alerts/helpidentifiers', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/alerts/helpidentifiers', headers=self.headerwithkey, verify=False)
 
     def validAlertLevelValues(self):
         """
@@ -263,7 +274,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/alerts/levels', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/alerts/levels', headers=self.headerwithkey, verify=False)
 
     def dismissAlert(self, alertid):
         """
@@ -279,8 +290,8 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.post(self.zvmurl + '/alerts/levels' + str(alertid) + '/dismiss', headers=self.headerwithkey,
-                             verify=False)
+        return self.httpsession.post(self.zvmurl + '/alerts/' + str(alertid) + '/dismiss', headers=self.headerwithkey,
+                                     verify=False)
 
     def undismissAlert(self, alertid):
         """
@@ -296,8 +307,8 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.post(self.zvmurl + '/alerts/levels' + str(alertid) + '/undismiss', headers=self.headerwithkey,
-                             verify=False)
+        return self.httpsession.post(self.zvmurl + '/alerts/' + str(alertid) + '/undismiss', headers=self.headerwithkey,
+                                     verify=False)
 
     def datastoreInfo(self):
         """
@@ -308,7 +319,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/datastores', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/datastores', headers=self.headerwithkey, verify=False)
 
     def datastoreSingleInfo(self, datastoreid):
         """
@@ -324,7 +335,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/datastores/' + str(datastoreid), headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/datastores/' + str(datastoreid), headers=self.headerwithkey, verify=False)
 
     def getDatastoreNames(self):
         """
@@ -335,7 +346,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/datastores', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/datastores', headers=self.headerwithkey, verify=False)
  
 
     def getDatastoreGuid(self, datastorename): 
@@ -351,7 +362,7 @@ class zvm:
         -------
         type requests.models.Response object
         """
-        output = requests.get(self.zvmurl + '/datastores', headers=self.headerwithkey, verify=False).json()
+        output = self.httpsession.get(self.zvmurl + '/datastores', headers=self.headerwithkey, verify=False).json()
         for datastore in output: 
             if datastore['DatastoreName'] == datastorename:
                 return datastore['DatastoreIdentifier']
@@ -359,20 +370,70 @@ class zvm:
         else: 
             pass
 
-    def allEvents(self):
+    def allEvents(self, stream=False):
         """
         Returns information on all (recent) events stored by the ZVM.
 
+        Parameters
+        ----------
+        stream : bool, optional
+            Return a generator yielding one event at a time, decoded while the response is being downloaded, instead
+            of the response (default: False). See zerto_stream.iterJsonArray.
+
         Returns
         -------
-        type requests.models.Response object
+        type requests.models.Response object, or a generator of event dicts when stream is True
+        """
+
+        response = self.httpsession.get(self.zvmurl + '/events', headers=self.headerwithkey, verify=False,
+                                        stream=stream)
+        return iterJsonArray(response) if stream else response
+
+    def filteredEvents(self, startdate=None, enddate=None, vpg=None, vpgidentifier=None, sitename=None,
+                       siteidentifier=None, zorgidentifier=None, eventtype=None, entitytype=None, category=None,
+                       username=None, alertidentifier=None):
         """
+        Returns information on the events stored by the ZVM that match all of the given filters. Filtering is done
+        by the ZVM, so only matching events are transferred.
 
-        return requests.get(self.zvmurl + '/events', headers=self.headerwithkey, verify=False)
+        Parameters
+        ----------
+        startdate : str, optional
+            Only events that occurred at or after this time, for example '2021-03-01T00:00:00.000'
+        enddate : str, optional
+            Only events that occurred at or before this time
+        vpg : str, optional
+            Name of the VPG the events relate to
+        vpgidentifier : str, optional
+            Identifier of the VPG the events relate to
+        sitename : str, optional
+            Name of the site the events relate to
+        siteidentifier : str, optional
+            Identifier of the site the events relate to
+        zorgidentifier : str, optional
+            Identifier of the ZORG the events relate to
+        eventtype : str, optional
+            One of the values returned by getValidEventTypes()
+        entitytype : str, optional
+            One of the values returned by getValidEventEntities()
+        category : str, optional
+            One of the values returned by getValidEventCategories()
+        username : str, optional
+            User who initiated the events
+        alertidentifier : str, optional
+            Identifier of the alert the events relate to
 
-    # def filteredEvents(self):
+        Returns
+        -------
+        type requests.models.Response object
+        """
 
-        # TODO: Create filteredEvents function
+        filters = {'startDate': startdate, 'endDate': enddate, 'vpg': vpg, 'vpgIdentifier': vpgidentifier,
+                   'siteName': sitename, 'siteIdentifier': siteidentifier, 'zorgIdentifier': zorgidentifier,
+                   'eventType': eventtype, 'entityType': entitytype, 'category': category, 'userName': username,
+                   'alertIdentifier': alertidentifier}
+        return self.httpsession.get(self.zvmurl + '/events', headers=self.headerwithkey, verify=False,
+                                    params={key: value for key, value in filters.items() if value is not None})
 
     def getSingleEvent(self, eventid):
         """
@@ -387,7 +448,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/events/' + str(eventid), headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/events/' + str(eventid), headers=self.headerwithkey, verify=False)
 
     def getValidEventCategories(self):
         """
@@ -398,7 +459,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/events/categories', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/events/categories', headers=self.headerwithkey, verify=False)
 
     def getValidEventEntities(self):
         """
@@ -409,7 +470,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/events/entities', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/events/entities', headers=self.headerwithkey, verify=False)
 
     def getValidEventTypes(self):
         """
@@ -420,7 +481,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/events/types', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/events/types', headers=self.headerwithkey, verify=False)
 
     def addLicense(self, licensekey):
         """
@@ -436,8 +497,8 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.put(self.zvmurl + '/license', data=json.dumps({"LicenseKey": licensekey}),
-                            headers=self.headerwithkey, verify=False)
+        return self.httpsession.put(self.zvmurl + '/license', data=json.dumps({"LicenseKey": licensekey}),
+                                    headers=self.headerwithkey, verify=False)
 
     def delLicense(self):
         """
@@ -448,7 +509,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.delete(self.zvmurl + '/license', headers=self.headerwithkey, verify=False)
+        return self.httpsession.delete(self.zvmurl + '/license', headers=self.headerwithkey, verify=False)
 
     def getLicense(self):
         """
@@ -459,7 +520,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/license', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/license', headers=self.headerwithkey, verify=False)
 
     def getLocalSiteInfo(self):
         """
@@ -470,7 +531,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/localsite', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/localsite', headers=self.headerwithkey, verify=False)
     
     def getLocalSiteGuid(self):
         """
@@ -481,7 +542,7 @@ class zvm:
         type str
         """ 
 
-        output = requests.get(self.zvmurl + '/localsite', headers=self.headerwithkey, verify=False)
+        output = self.httpsession.get(self.zvmurl + '/localsite', headers=self.headerwithkey, verify=False)
         return output.json()['SiteIdentifier']
     def getValidPairingStatus(self):
         """
@@ -492,7 +553,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/localsite/pairingstatuses', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/localsite/pairingstatuses', headers=self.headerwithkey, verify=False)
 
     def sendBillingData(self):
         """
@@ -503,7 +564,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.post(self.zvmurl + '/localsite/billing/sendUsage', headers=self.headerwithkey, verify=False)
+        return self.httpsession.post(self.zvmurl + '/localsite/billing/sendUsage', headers=self.headerwithkey, verify=False)
 
     def getListOfPeerSites(self):
         """
@@ -514,7 +575,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/peersites', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/peersites', headers=self.headerwithkey, verify=False)
 
     def getSinglePeerSites(self, siteidentifier):
         """
@@ -530,7 +591,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/peersites/' + siteidentifier, headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/peersites/' + siteidentifier, headers=self.headerwithkey, verify=False)
 
     def getStatusOfPeerSites(self):
         """
@@ -541,7 +602,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/peersites/pairingstatuses', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/peersites/pairingstatuses', headers=self.headerwithkey, verify=False)
 
     def generatePeeringToken(self):
         """
@@ -552,7 +613,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.post(self.zvmurl + '/peersites/generatetoken', headers=self.headerwithkey, verify=False)
+        return self.httpsession.post(self.zvmurl + '/peersites/generatetoken', headers=self.headerwithkey, verify=False)
 
     def pairToSite(self, peerip, pairingtoken):
         """
@@ -570,7 +631,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.post(self.zvmurl + '/peersites', headers=self.headerwithkey, data=json.dumps(
+        return self.httpsession.post(self.zvmurl + '/peersites', headers=self.headerwithkey, data=json.dumps(
             {"HostName": peerip, "Port": "9071", "Token": pairingtoken}), verify=False)
 
     def getRecoveryReport(self):
@@ -582,7 +643,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/reports/recovery', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/reports/recovery', headers=self.headerwithkey, verify=False)
 
     def getResourcesReport(self):
         """
@@ -593,7 +654,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/reports/resources', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/reports/resources', headers=self.headerwithkey, verify=False)
 
     def getAllTasks(self):
         """
@@ -604,7 +665,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/tasks', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/tasks', headers=self.headerwithkey, verify=False)
 
     def getSingleTask(self, taskidentifier):
         """
@@ -620,7 +681,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/tasks/' + taskidentifier, headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/tasks/' + taskidentifier, headers=self.headerwithkey, verify=False)
 
     def getValidTaskTypes(self):
         """
@@ -631,7 +692,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/tasks/types', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/tasks/types', headers=self.headerwithkey, verify=False)
 
     def getAllVirtualizationSites(self):
         """
@@ -642,7 +703,7 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/virtualizationsites', headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/virtualizationsites', headers=self.headerwithkey, verify=False)
 
     def getSingleVirtualizationSite(self, siteidentifier):
         """
@@ -658,8 +719,8 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/virtualizationsites/' + siteidentifier, headers=self.headerwithkey,
-                            verify=False)
+        return self.httpsession.get(self.zvmurl + '/virtualizationsites/' + siteidentifier, headers=self.headerwithkey,
+                                    verify=False)
 
     def getStorageClustersAtSite(self, siteidentifier):
         """
@@ -675,8 +736,8 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/datastoreclusters',
-                            headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/datastoreclusters',
+                                    headers=self.headerwithkey, verify=False)
 
     def getStorageAtSite(self, siteidentifier):
         """
@@ -692,8 +753,8 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/datastores',
-                            headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/datastores',
+                                    headers=self.headerwithkey, verify=False)
 
     def getDevicesAtAllHosts(self, siteidentifier):
         """
@@ -709,8 +770,8 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/devices',
-                            headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/devices',
+                                    headers=self.headerwithkey, verify=False)
 
     def getDevicesAtSingleHost(self, siteidentifier, hostidentifier):
         """
@@ -729,8 +790,8 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/devices?hostIdentifier=' +
-                            hostidentifier, headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/devices?hostIdentifier=' +
+                                    hostidentifier, headers=self.headerwithkey, verify=False)
 
         # TODO: Verify this actually works, because the documentation contains what looks like a typo...
         #  -- Update -- It works. Doc bug...
@@ -749,8 +810,8 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/folders',
-                            headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/folders',
+                                    headers=self.headerwithkey, verify=False)
 
     def getHostClustersAtSite(self, siteidentifier):
         """
@@ -766,8 +827,8 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/hostclusters',
-                            headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/hostclusters',
+                                    headers=self.headerwithkey, verify=False)
 
     def getHostsAtSite(self, siteidentifier):
         """
@@ -783,8 +844,8 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/hosts',
-                            headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/hosts',
+                                    headers=self.headerwithkey, verify=False)
 
     def getHostGuid(self, hostname): 
         """
@@ -825,8 +886,8 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/hosts/' + hostidentifier,
-                            headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/hosts/' + hostidentifier,
+                                    headers=self.headerwithkey, verify=False)
 
     def getNetworksAtSite(self, siteidentifier):
         """
@@ -842,8 +903,8 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/networks',
-                            headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/networks',
+                                    headers=self.headerwithkey, verify=False)
 
     def getNetworkGuid(self, networkname):
         """
@@ -882,8 +943,8 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/repositories',
-                            headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/repositories',
+                                    headers=self.headerwithkey, verify=False)
 
     def getResourcePoolsAtSite(self, siteidentifier):
         """
@@ -899,8 +960,8 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/resourcepools',
-                            headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/resourcepools',
+                                    headers=self.headerwithkey, verify=False)
 
     def getUnprotectedVmsAtSite(self, siteidentifier):
         """
@@ -916,8 +977,8 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/vms', headers=self.headerwithkey,
-                            verify=False)
+        return self.httpsession.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/vms', headers=self.headerwithkey,
+                                    verify=False)
 
     def getVmInstanceTypes(self, siteidentifier):
         """
@@ -933,8 +994,8 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/publicCloud/vmInstanceTypes',
-                            headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/publicCloud/vmInstanceTypes',
+                                    headers=self.headerwithkey, verify=False)
 
     def getAvailablevNets(self, siteidentifier):
         """
@@ -950,8 +1011,8 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/publicCloud/virtualNetworks',
-                            headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/publicCloud/virtualNetworks',
+                                    headers=self.headerwithkey, verify=False)
 
     def getAvailableSubnets(self, siteidentifier):
         """
@@ -967,8 +1028,8 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/publicCloud/subnets',
-                            headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/publicCloud/subnets',
+                                    headers=self.headerwithkey, verify=False)
 
     def getSecurityGroups(self, siteidentifier):
         """
@@ -984,16 +1045,24 @@ class zvm:
         type requests.models.Response object
         """
 
-        return requests.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/publicCloud/securityGroups',
-                            headers=self.headerwithkey, verify=False)
+        return self.httpsession.get(self.zvmurl + '/virtualizationsites/' + siteidentifier + '/publicCloud/securityGroups',
+                                    headers=self.headerwithkey, verify=False)
 
-    def getAllVolumes(self):
+    def getAllVolumes(self, stream=False):
         """
         Returns information about available volumes visible to the ZVM/ZCA.
 
+        Parameters
+        ----------
+        stream : bool, optional
+            Return a generator yielding one volume at a time, decoded while the response is being downloaded, instead
+            of the response (default: False). See zerto_stream.iterJsonArray.
+
         Returns
         -------
-        type requests.models.Response object
+        type requests.models.Response object, or a generator of volume dicts when stream is True
         """
 
-        return requests.get(self.zvmurl + '/volumes', headers=self.headerwithkey, verify=False)
+        response = self.httpsession.get(self.zvmurl + '/volumes', headers=self.headerwithkey, verify=False,
+                                        stream=stream)
+        return iterJsonArray(response) if stream else response